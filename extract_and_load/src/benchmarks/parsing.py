@@ -0,0 +1,152 @@
+"""Micro-benchmark for the DraftKings player prop parsers in scrapers.draftkings.parsing.
+
+Times each parser per page against a saved response (scripts/dk_response.txt by
+default). The saved page is the raw server response, so its Player Stats card
+is empty; --players fills the card with that many rendered player rows, marked
+up like the live page, so the rendered-page parsers have work to do. The
+previous approach (html.parser over the whole document, then select per cell)
+is included as a reference.
+
+Run from extract_and_load/src:
+    python -m benchmarks.parsing --players 60 --repeat 20 --output parse.csv
+    python -m benchmarks.parsing --players 60 --baseline parse.csv --tolerance 0.25
+"""
+# Standard
+import os
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, List
+# External
+import pandas as pd
+from bs4 import BeautifulSoup
+# Internal
+from utils.logger import get_logger
+from scrapers.draftkings.parsing import (
+    CARD_MARKER, HAS_LXML, build_props_frame, get_stat_name, parse_player_props
+)
+
+logger = get_logger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_FIXTURE = os.path.join(SRC_DIR, '..', '..', 'scripts', 'dk_response.txt')
+DEFAULT_URL = 'https://sportsbook.draftkings.com/leagues/football/nfl?category=player-stats&subcategory=pass-yards'
+
+def render_fixture(html: str, players: int, seed: int = 0) -> str:
+    """Inserts players rendered player rows (a title plus Over and Under cells
+    each) at the top of the page's Player Stats card."""
+    if players <= 0:
+        return html
+    rng = random.Random(seed)
+
+    def cell(side: str, line: float, odds: int) -> str:
+        sign = '+' if odds > 0 else '−'
+        return (
+            '<li class="game-props-card17__cell double"><div role="button" class="sportsbook-outcome-cell__body">'
+            f'<div class="sportsbook-outcome-body-wrapper"><span class="sportsbook-outcome-cell__label">{side} {line}</span>'
+            f'<div class="sportsbook-outcome-cell__elements"><span class="sportsbook-odds american default-color">{sign}{abs(odds)}</span>'
+            '</div></div></div></li>')
+
+    rows = []
+    for i in range(players):
+        line = rng.randrange(10, 400) + 0.5
+        rows.append(
+            '<div class="sportsbook-event-accordion__wrapper expanded"><div class="sportsbook-event-accordion__accordion">'
+            f'<a class="sportsbook-event-accordion__title" href="/event/{i}">Player {i}</a></div>'
+            '<div class="sportsbook-event-accordion__children-wrapper"><ul class="game-props-card17__list">'
+            + cell('Over', line, rng.choice([-130, -115, -110, 100, 105]))
+            + cell('Under', line, rng.choice([-125, -110, -105, 110]))
+            + '</ul></div></div>')
+    tag_end = html.index('>', html.index(CARD_MARKER)) + 1
+    return html[:tag_end] + ''.join(rows) + html[tag_end:]
+
+def parse_full_document(html: str, url: str, scraped_at: datetime) -> pd.DataFrame:
+    """The previous parser: html.parser over the whole page and select_one per cell."""
+    soup = BeautifulSoup(html, 'html.parser')
+    main_div = soup.select_one('div[aria-labelledby="game_category_Player Stats"].sportsbook-responsive-card-container__card.selected')
+    names = [element.text for element in main_div.select("a.sportsbook-event-accordion__title")]
+    cells = main_div.select("li.game-props-card17__cell.double")
+    columns = {'over_lines': [], 'over_odds': [], 'under_lines': [], 'under_odds': []}
+    for i in range(len(names)):
+        for side, cell in (('over', cells[2*i]), ('under', cells[2*i+1])):
+            line = cell.select_one("span.sportsbook-outcome-cell__label")
+            odds = cell.select_one("span.sportsbook-odds.american.default-color")
+            columns[f'{side}_lines'].append(line.text if line else None)
+            columns[f'{side}_odds'].append(odds.text if odds else None)
+    return build_props_frame(
+        get_stat_name(url), names, columns['over_lines'], columns['over_odds'], 
+        columns['under_lines'], columns['under_odds'], scraped_at)
+
+def get_parsers() -> Dict[str, Callable]:
+    parsers = {
+        'full_document_html_parser': parse_full_document,
+        'card_html_parser': partial(parse_player_props, use_lxml=False),
+    }
+    if HAS_LXML:
+        parsers['card_lxml'] = partial(parse_player_props, use_lxml=True)
+    else:
+        logger.info("lxml is not installed; skipping the card_lxml parser.")
+    return parsers
+
+def time_parser(parse: Callable, html: str, url: str, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = parse(html, url, datetime.now())
+        timings.append(time.perf_counter() - start)
+    return {
+        'rows': len(df),
+        'ms_per_page': round(min(timings) * 1000, 2),
+        'median_ms': round(statistics.median(timings) * 1000, 2),
+    }
+
+def compare_to_baseline(report: pd.DataFrame, baseline: pd.DataFrame, tolerance: float) -> List[str]:
+    """Returns the parsers whose ms/page rose more than tolerance above the baseline."""
+    baseline_ms = baseline.set_index('parser')['ms_per_page'].to_dict()
+    regressions = []
+    for record in report.to_dict('records'):
+        expected = baseline_ms.get(record['parser'])
+        if expected and record['ms_per_page'] > expected * (1 + tolerance):
+            regressions.append(f"{record['parser']}: {record['ms_per_page']} ms/page vs baseline {expected} ms/page")
+    return regressions
+
+def main(args) -> int:
+    with open(args.fixture, encoding='utf-8') as fixture:
+        html = render_fixture(fixture.read(), args.players, args.seed)
+    logger.info(f"Page is {len(html) / 1024:.0f} KB with {args.players} rendered players.")
+
+    records = []
+    for name, parse in get_parsers().items():
+        record = {'parser': name, **time_parser(parse, html, args.url, args.repeat)}
+        logger.info(f"{name}: {record['ms_per_page']} ms/page, {record['rows']} rows")
+        records.append(record)
+    report = pd.DataFrame(records)
+    print(report.to_string(index=False))
+    if args.output:
+        report.to_csv(args.output, index=False)
+        logger.info(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(report, pd.read_csv(args.baseline), args.tolerance)
+        if regressions:
+            logger.info("Parse time regressions:\n" + '\n'.join(regressions))
+            return 1
+        logger.info(f"No parser more than {args.tolerance:.0%} slower than {args.baseline}.")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-page parse time of the DraftKings prop parsers.")
+    parser.add_argument('--fixture', default=DEFAULT_FIXTURE, help='Saved page to parse')
+    parser.add_argument('--url', default=DEFAULT_URL, help='Market url the page is parsed as')
+    parser.add_argument('--players', type=int, default=60, help='Rendered player rows to add to the Player Stats card')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed parses per parser; the fastest is reported')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Also write the results table to this csv path')
+    parser.add_argument('--baseline', help='Results csv from an earlier run to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed ms/page increase against the baseline')
+    args = parser.parse_args()
+
+    raise SystemExit(main(args))
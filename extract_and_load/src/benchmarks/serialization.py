@@ -0,0 +1,235 @@
+"""Benchmarks the bronze serializers in utils.s3_utils across formats and parquet codecs.
+
+Frames are synthesized from data/*_sample.csv: each column is resampled to the
+requested row count, keeping its dtype, value range and null rate, so the
+results reflect realistic column types rather than repeated sample rows.
+Every case runs in a fresh interpreter so peak memory is not polluted by the
+cases before it.
+
+Run from extract_and_load/src:
+    python -m benchmarks.serialization --rows 200000 --datasets pbp rosters --output results.csv
+"""
+# Standard
+import os
+import io
+import sys
+import json
+import time
+import glob
+import argparse
+import resource
+import itertools
+import subprocess
+from typing import Dict, List, Optional
+# External
+import numpy as np
+import pandas as pd
+# Internal
+from utils.logger import get_logger
+from utils.s3_utils import write_df_to_stream
+from utils.data_utils import cast_to_schema, normalize_mixed_columns
+from utils.schemas import SCHEMAS
+
+logger = get_logger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATA_DIR = os.path.join(SRC_DIR, '..', '..', 'data')
+
+PARQUET_CODECS = ['snappy', 'zstd', 'gzip', 'none']
+TEXT_FORMATS = ['csv', 'json', 'zip']
+
+def load_samples(data_dir: str) -> Dict[str, pd.DataFrame]:
+    """Reads every data/<name>_sample.csv that has rows, keyed by <name>."""
+    samples = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, '*_sample.csv'))):
+        name = os.path.basename(path)[:-len('_sample.csv')]
+        df = pd.read_csv(path, index_col=0, low_memory=False)
+        if len(df) >= 2:
+            samples[name] = df
+    return samples
+
+def scale_frame(df: pd.DataFrame, rows: int, seed: int = 0) -> pd.DataFrame:
+    """Builds a rows-long frame with the same columns as df. Numeric columns are
+    drawn from each column's range (integers stay integral), repeated string
+    values are resampled, and columns whose sample values are all distinct
+    (ids, names, play descriptions) get a unique suffix per row."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for col in df.columns:
+        values = df[col].dropna()
+        null_rate = df[col].isna().mean()
+        if values.empty:
+            series = pd.Series(np.nan, index=range(rows))
+        elif pd.api.types.is_bool_dtype(values):
+            series = pd.Series(rng.choice(values.to_numpy(), rows))
+        elif pd.api.types.is_numeric_dtype(values):
+            low, high = values.min(), values.max()
+            if (values % 1 == 0).all():
+                series = pd.Series(rng.integers(int(low), int(high) + 1, rows))
+            else:
+                series = pd.Series(rng.uniform(low, high, rows))
+        elif values.nunique() == len(values):
+            suffixes = pd.Series(np.arange(rows)).astype(str)
+            series = pd.Series(rng.choice(values.astype(str).to_numpy(), rows)).str.cat(suffixes, sep='-')
+        else:
+            series = pd.Series(rng.choice(values.to_numpy(), rows))
+        if null_rate > 0:
+            series = series.mask(rng.random(rows) < null_rate)
+        columns[col] = series
+    return pd.DataFrame(columns)
+
+def build_frame(name: str, data_dir: str, rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthesizes a benchmark frame and casts it the way the bronze jobs would."""
+    df = scale_frame(load_samples(data_dir)[name], rows, seed)
+    if name in SCHEMAS:
+        try:
+            return cast_to_schema(df, SCHEMAS[name], name)
+        except Exception as e:
+            logger.info(f"Could not cast synthetic {name} to its schema ({e}); using inferred dtypes.")
+    return normalize_mixed_columns(df)
+
+def read_status_kb(field: str) -> Optional[int]:
+    """Reads a memory field (VmRSS, VmHWM) from /proc/self/status, in KB."""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def reset_peak_rss() -> int:
+    """Resets the process's peak RSS where the kernel allows it (Linux) and
+    returns the current RSS in KB to measure the next peak against. Elsewhere the
+    peak cannot be reset, so the baseline is the peak so far."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+        return read_status_kb('VmRSS')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def peak_rss_kb() -> int:
+    peak = read_status_kb('VmHWM')
+    return peak if peak is not None else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def read_back(body: bytes, file_format: str) -> pd.DataFrame:
+    buffer = io.BytesIO(body)
+    if file_format == 'csv':
+        return pd.read_csv(buffer, index_col=0, low_memory=False)
+    if file_format == 'json':
+        return pd.read_json(buffer, orient='records')
+    if file_format == 'zip':
+        return pd.read_csv(buffer, compression='zip', low_memory=False)
+    return pd.read_parquet(buffer)
+
+def run_case(case: dict) -> dict:
+    """Serializes and reads back one frame for one format/codec. Peak memory is
+    how far this process's RSS rose above its level before serializing, so it
+    includes Arrow's allocations that tracemalloc cannot see."""
+    df = build_frame(case['dataset'], case['data_dir'], case['rows'], case['seed'])
+    parquet_options = None
+    if case['format'] == 'parquet':
+        parquet_options = {'compression': case['codec'], 'use_dictionary': case['dictionary']}
+
+    baseline_kb = reset_peak_rss()
+    serialize_secs = []
+    for _ in range(case['repeat']):
+        sink = io.BytesIO()
+        start = time.perf_counter()
+        write_df_to_stream(df, case['format'], sink, case['dataset'], parquet_options=parquet_options)
+        serialize_secs.append(time.perf_counter() - start)
+    peak_kb = peak_rss_kb()
+    body = sink.getvalue()
+    del sink
+
+    read_secs = []
+    for _ in range(case['repeat']):
+        start = time.perf_counter()
+        read_back(body, case['format'])
+        read_secs.append(time.perf_counter() - start)
+
+    return {
+        'dataset': case['dataset'],
+        'format': case['format'],
+        'codec': case.get('codec'),
+        'dictionary': case.get('dictionary'),
+        'rows': len(df),
+        'columns': len(df.columns),
+        'frame_mb': round(df.memory_usage(deep=True).sum() / (1024 * 1024), 1),
+        'serialize_secs': round(min(serialize_secs), 3),
+        'read_secs': round(min(read_secs), 3),
+        'output_mb': round(len(body) / (1024 * 1024), 2),
+        'bytes_per_row': round(len(body) / max(len(df), 1), 1),
+        'peak_serialize_mb': round(max(0, peak_kb - baseline_kb) / 1024, 1),
+    }
+
+def build_cases(datasets: List[str], formats: List[str], codecs: List[str], data_dir: str, rows: int, repeat: int, seed: int) -> List[dict]:
+    cases = []
+    for dataset in datasets:
+        base = {'dataset': dataset, 'data_dir': data_dir, 'rows': rows, 'repeat': repeat, 'seed': seed}
+        for file_format in formats:
+            if file_format == 'parquet':
+                for codec, dictionary in itertools.product(codecs, [True, False]):
+                    cases.append({**base, 'format': 'parquet', 'codec': codec, 'dictionary': dictionary})
+            else:
+                cases.append({**base, 'format': file_format})
+    return cases
+
+def run_isolated(case: dict) -> Optional[dict]:
+    """Runs a case in a fresh interpreter and returns its result record."""
+    completed = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.serialization', '--case', json.dumps(case)],
+        cwd=SRC_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        logger.info(f"Case {case['dataset']} {case['format']} {case.get('codec', '')} failed:\n{completed.stderr[-2000:]}")
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def main(args) -> pd.DataFrame:
+    # Cases run with src as their working directory
+    args.data_dir = os.path.abspath(args.data_dir)
+    samples = load_samples(args.data_dir)
+    datasets = args.datasets or sorted(samples)
+    unknown = [dataset for dataset in datasets if dataset not in samples]
+    if unknown:
+        raise SystemExit(f"No usable sample for {unknown}; available: {sorted(samples)}")
+
+    cases = build_cases(datasets, args.formats, args.codecs, args.data_dir, args.rows, args.repeat, args.seed)
+    results = []
+    for i, case in enumerate(cases, start=1):
+        logger.info(f"[{i}/{len(cases)}] {case['dataset']} {case['format']} {case.get('codec', '')} {'dict' if case.get('dictionary') else ''}")
+        result = run_isolated(case)
+        if result is not None:
+            results.append(result)
+
+    report = pd.DataFrame(results)
+    if not report.empty:
+        # Size relative to csv of the same dataset, the format most jobs were first written in
+        csv_mb = report[report['format'] == 'csv'].set_index('dataset')['output_mb']
+        report['vs_csv'] = (report['output_mb'] / report['dataset'].map(csv_mb)).round(3)
+        report = report.sort_values(['dataset', 'output_mb'])
+    print(report.to_string(index=False))
+    if args.output:
+        report.to_csv(args.output, index=False)
+        logger.info(f"Results written to {args.output}")
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bronze serialization formats and parquet codecs.")
+    parser.add_argument('--datasets', nargs='+', help='Sample names to benchmark (default: every data/*_sample.csv with rows)')
+    parser.add_argument('--formats', nargs='+', default=TEXT_FORMATS + ['parquet'], choices=TEXT_FORMATS + ['parquet'])
+    parser.add_argument('--codecs', nargs='+', default=PARQUET_CODECS, choices=PARQUET_CODECS, help='Parquet compression codecs')
+    parser.add_argument('--rows', type=int, default=200000, help='Rows per synthetic frame')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions per case; the fastest is reported')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data_dir', default=DEFAULT_DATA_DIR, help='Directory holding the *_sample.csv files')
+    parser.add_argument('--output', help='Also write the results table to this csv path')
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(json.loads(args.case))))
+    else:
+        main(args)
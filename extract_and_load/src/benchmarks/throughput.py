@@ -0,0 +1,200 @@
+"""End-to-end extract throughput harness: runs the real run_*_job entry points
+against a stubbed nfl_data_py and a local or in-memory object store, so extract
+throughput can be measured and regression-checked without network or cloud access.
+
+The stub serves frames synthesized from data/*_sample.csv (see
+benchmarks.serialization.scale_frame), rows_per_season rows per requested season.
+Only datasets with a usable sample can be run.
+
+Run from extract_and_load/src:
+    python -m benchmarks.throughput --jobs pbp rosters player_weekly --years 2020 2021 --output baseline.csv
+    python -m benchmarks.throughput --baseline baseline.csv --tolerance 0.25
+"""
+# Standard
+import os
+import sys
+import time
+import types
+import argparse
+import threading
+from typing import Dict, List, Optional
+# External
+import pandas as pd
+import yaml
+# Internal
+from utils.logger import get_logger
+from benchmarks.serialization import DEFAULT_DATA_DIR, load_samples, scale_frame
+
+logger = get_logger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# nfl_data_py function -> (sample name, whether it takes years)
+STUB_FUNCTIONS = {
+    'import_pbp_data': ('pbp', True),
+    'import_weekly_data': ('player_weekly', True),
+    'import_seasonal_data': ('seasonal', True),
+    'import_rosters': ('rosters', True),
+    'import_draft_picks': ('draft_picks', True),
+    'import_draft_values': ('draft_values', False),
+    'import_ids': ('player_ids', False),
+    'import_team_desc': ('team_desc', False),
+}
+
+# Jobs the stub can feed -> the nfl_data_py function their fetcher calls
+STUBBED_JOBS = {
+    'pbp': 'import_pbp_data',
+    'player_weekly': 'import_weekly_data',
+    'player_seasonal': 'import_seasonal_data',
+    'rosters': 'import_rosters',
+    'draft_picks': 'import_draft_picks',
+    'draft_values': 'import_draft_values',
+    'player_ids': 'import_ids',
+    'team_desc': 'import_team_desc',
+}
+
+def build_stub_nfl(data_dir: str, rows_per_season: int, fetch_latency_secs: float = 0.0) -> types.ModuleType:
+    """Builds a module exposing the nfl_data_py functions in STUB_FUNCTIONS.
+    Frames are generated once per (dataset, season) and copied on every call,
+    so repeated runs measure the jobs rather than the generator."""
+    samples = load_samples(data_dir)
+    frames = {}
+    lock = threading.Lock()
+
+    def season_frame(sample: str, season: Optional[int]) -> pd.DataFrame:
+        with lock:
+            if (sample, season) not in frames:
+                df = scale_frame(samples[sample], rows_per_season, seed=season or 0)
+                if season is not None:
+                    df['season'] = season
+                frames[(sample, season)] = df
+            return frames[(sample, season)].copy()
+
+    def make_function(sample: str, uses_years: bool):
+        def fetch(years=None, columns=None, *args, **kwargs) -> pd.DataFrame:
+            if fetch_latency_secs:
+                time.sleep(fetch_latency_secs)
+            if uses_years:
+                df = pd.concat([season_frame(sample, int(year)) for year in years], ignore_index=True)
+            else:
+                df = season_frame(sample, None)
+            if columns:
+                df = df[[col for col in columns if col in df.columns]]
+            return df
+        return fetch
+
+    module = types.ModuleType('nfl_data_py')
+    module.__doc__ = "Stub nfl_data_py serving synthetic frames for benchmarks.throughput."
+    for name, (sample, uses_years) in STUB_FUNCTIONS.items():
+        if sample in samples:
+            setattr(module, name, make_function(sample, uses_years))
+    return module
+
+def run_harness(
+        jobs: List[str],
+        years: List[int],
+        file_format: str,
+        store,
+        config: dict,
+        repeat: int = 1) -> pd.DataFrame:
+    """Runs each job repeat times against store and returns one row per job with
+    rows/s and MB/s of its fastest run. Each run writes under its own
+    bronze/run-<n> prefix, with no manifest or objects from earlier runs, so
+    content-hash skipping does not hide write cost."""
+    # Imported after the stub is installed so job modules bind to it
+    from main import get_job_config, load_job
+    from utils.profile_utils import JobProfiler
+    from utils.s3_utils import clear_head_cache
+
+    records = []
+    for name in jobs:
+        run_job = load_job(name)
+        job_config = get_job_config(config, name)
+        # The rate limiter is for the real upstream; the stub needs no spacing
+        job_config['min_fetch_interval_secs'] = 0
+        best = None
+        for attempt in range(repeat):
+            prefix = f"bronze/run-{attempt}"
+            clear_head_cache()
+            profiler = JobProfiler(name)
+            bytes_before = store.bytes_written
+            objects_before = store.objects_written
+            start = time.perf_counter()
+            run_job(store, 'bench', prefix, years, 1, file_format, job_config=job_config, profiler=profiler)
+            wall_secs = time.perf_counter() - start
+            phases = profiler.summary()['phases']
+            record = {
+                'job': name,
+                'rows': phases.get('fetch', {}).get('rows', 0),
+                'mb_written': round((store.bytes_written - bytes_before) / (1024 * 1024), 2),
+                'objects': store.objects_written - objects_before,
+                'wall_secs': round(wall_secs, 3),
+                'fetch_secs': phases.get('fetch', {}).get('wall_secs', 0.0),
+                'cast_secs': phases.get('cast', {}).get('wall_secs', 0.0),
+                'upload_secs': phases.get('upload', {}).get('wall_secs', 0.0),
+            }
+            record['rows_per_sec'] = round(record['rows'] / wall_secs, 1) if wall_secs else 0.0
+            record['mb_per_sec'] = round(record['mb_written'] / wall_secs, 2) if wall_secs else 0.0
+            logger.info(f"{name} run {attempt + 1}/{repeat}: {record['rows']} rows in {record['wall_secs']}s.")
+            if best is None or record['wall_secs'] < best['wall_secs']:
+                best = record
+        records.append(best)
+    return pd.DataFrame(records)
+
+def compare_to_baseline(report: pd.DataFrame, baseline: pd.DataFrame, tolerance: float) -> List[str]:
+    """Returns the jobs whose rows/s fell more than tolerance below the baseline."""
+    baseline_rates: Dict[str, float] = baseline.set_index('job')['rows_per_sec'].to_dict()
+    regressions = []
+    for record in report.to_dict('records'):
+        expected = baseline_rates.get(record['job'])
+        if expected and record['rows_per_sec'] < expected * (1 - tolerance):
+            regressions.append(f"{record['job']}: {record['rows_per_sec']} rows/s vs baseline {expected} rows/s")
+    return regressions
+
+def main(args) -> int:
+    data_dir = os.path.abspath(args.data_dir)
+    sys.modules['nfl_data_py'] = build_stub_nfl(data_dir, args.rows_per_season, args.fetch_latency_secs)
+
+    from utils.cache_utils import configure_download_cache
+    from utils.s3_utils import get_storage_client
+    # Every fetch must hit the stub, not a cached upstream frame
+    configure_download_cache({'enabled': False})
+    with open(os.path.join(SRC_DIR, 'config.yml')) as config_stream:
+        config = yaml.safe_load(config_stream)
+    store = get_storage_client({'backend': args.storage, 'root': args.root})
+
+    unknown = [job for job in args.jobs if job not in STUBBED_JOBS or not hasattr(sys.modules['nfl_data_py'], STUBBED_JOBS[job])]
+    if unknown:
+        raise SystemExit(f"No stub data for {unknown}; available: {sorted(STUBBED_JOBS)}")
+
+    report = run_harness(args.jobs, [int(year) for year in args.years], args.file_format, store, config, args.repeat)
+    print(report.to_string(index=False))
+    if args.output:
+        report.to_csv(args.output, index=False)
+        logger.info(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(report, pd.read_csv(args.baseline), args.tolerance)
+        if regressions:
+            logger.info("Throughput regressions:\n" + '\n'.join(regressions))
+            return 1
+        logger.info(f"No job more than {args.tolerance:.0%} slower than {args.baseline}.")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure end-to-end extract throughput against a stubbed nfl_data_py.")
+    parser.add_argument('--jobs', nargs='+', default=['pbp', 'player_weekly', 'rosters'], help=f"Jobs to run; any of {sorted(STUBBED_JOBS)}")
+    parser.add_argument('--years', nargs='+', default=['2020', '2021'])
+    parser.add_argument('--rows_per_season', type=int, default=50000, help='Rows the stub returns per season')
+    parser.add_argument('--fetch_latency_secs', type=float, default=0.0, help='Simulated upstream latency per fetch')
+    parser.add_argument('-f', '--file_format', default='parquet')
+    parser.add_argument('--storage', choices=['memory', 'local'], default='memory')
+    parser.add_argument('--root', default='/tmp/nfl_bronze_bench', help='Directory for --storage local')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per job; the fastest is reported')
+    parser.add_argument('--data_dir', default=DEFAULT_DATA_DIR, help='Directory holding the *_sample.csv files')
+    parser.add_argument('--output', help='Also write the results table to this csv path')
+    parser.add_argument('--baseline', help='Results csv from an earlier run to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed rows/s drop against the baseline')
+    args = parser.parse_args()
+
+    raise SystemExit(main(args))
@@ -0,0 +1,20 @@
+# Standard
+from typing import List
+# External
+import nfl_data_py as nfl
+import pandas as pd
+# Internal
+from jobs.engine import DatasetSpec, make_job
+
+def fetch_combine_data(years: List[int]) -> pd.DataFrame:
+    """Gets NFL combine results from nfl_data_py."""
+    return nfl.import_combine_data(years=years)
+
+SPEC = DatasetSpec(
+    name='combine_data',
+    description='combine data',
+    fetcher=fetch_combine_data,
+    partition_cols=['season'],
+)
+
+run_combine_data_job = make_job(SPEC)
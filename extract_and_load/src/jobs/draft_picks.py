@@ -0,0 +1,20 @@
+# Standard
+from typing import List
+# External
+import nfl_data_py as nfl
+import pandas as pd
+# Internal
+from jobs.engine import DatasetSpec, make_job
+
+def fetch_draft_picks(years: List[int]) -> pd.DataFrame:
+    """Gets draft picks from nfl_data_py."""
+    return nfl.import_draft_picks(years=years)
+
+SPEC = DatasetSpec(
+    name='draft_picks',
+    description='draft pick data',
+    fetcher=fetch_draft_picks,
+    partition_cols=['season'],
+)
+
+run_draft_picks_job = make_job(SPEC)
@@ -0,0 +1,20 @@
+# Standard
+from typing import List
+# External
+import nfl_data_py as nfl
+import pandas as pd
+# Internal
+from jobs.engine import DatasetSpec, make_job
+
+def fetch_draft_values(years: List[int]) -> pd.DataFrame:
+    """Gets draft pick value charts from nfl_data_py."""
+    return nfl.import_draft_values()
+
+SPEC = DatasetSpec(
+    name='draft_values',
+    description='draft value data',
+    fetcher=fetch_draft_values,
+    uses_years=False,
+)
+
+run_draft_values_job = make_job(SPEC)
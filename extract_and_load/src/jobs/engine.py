@@ -0,0 +1,357 @@
+# Standard
+import tempfile
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+# External
+import pandas as pd
+# Internal
+from utils.logger import get_logger
+from utils.cache_utils import get_download_cache
+from utils.retry_utils import get_retry_policy
+from utils.s3_utils import (
+    write_df_to_s3, write_partitioned_df_to_s3, fetch_content_hash, upload_file_to_s3, DataFrameStreamWriter)
+from utils.data_utils import cast_to_schema, normalize_mixed_columns, hash_df, hash_schema, FrameHasher
+from utils.schemas import get_schema
+from utils.manifest_utils import Manifest
+from utils.profile_utils import JobProfiler, get_profiler
+
+logger = get_logger(__name__)
+
+# Peak memory of a chunk as a multiple of its pandas size: the fetched frame,
+# the cast copy and the Arrow table being serialized
+CHUNK_MEMORY_OVERHEAD = 3
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Declarative description of a bronze dataset.
+
+    fetcher takes the list of seasons and returns the raw frame; datasets that
+    are not split by season set uses_years=False and get an empty list.
+    schema names an entry in utils.schemas; without one, mixed-type object
+    columns are stored as strings. partition_cols is the default Hive layout
+    for parquet output and can be overridden by jobs.<name>.partition_cols.
+    refresh is 'full_replace' (rewrite whenever the content hash changes) or
+    'if_missing' (write only when the manifest has nothing for the dataset yet)."""
+    name: str
+    description: str
+    fetcher: Callable[[List[int]], pd.DataFrame]
+    schema: Optional[str] = None
+    partition_cols: Optional[List[str]] = None
+    uses_years: bool = True
+    refresh: str = 'full_replace'
+
+def fetch_with_retries(spec: DatasetSpec, years: List[int], retries: int) -> pd.DataFrame:
+    """Fetches a dataset through the local download cache under the shared retry policy."""
+    return get_retry_policy().call(
+        lambda: get_download_cache().fetch(spec.name, years, lambda: spec.fetcher(years)),
+        f"{spec.name} {years or 'all'}",
+        max_attempts=retries)
+
+def previous_content_hash(manifest: Manifest, s3, s3_bucket: str, s3_key_full: str) -> Optional[str]:
+    """The content hash of the object last written to s3_key_full, from its
+    manifest entry or, for entries bootstrapped from a listing, its metadata."""
+    entry = manifest.get(s3_key_full)
+    if not entry:
+        return None
+    return entry.get('content_hash') or fetch_content_hash(s3, s3_bucket, s3_key_full)
+
+def record_unchanged(manifest: Manifest, s3_key_full: str, rows: int, schema_hash: str, content_hash: str) -> None:
+    """Saves the hash of an unchanged object whose manifest entry was
+    bootstrapped without one, so later runs need not read its metadata."""
+    entry = manifest.get(s3_key_full)
+    if not entry.get('content_hash'):
+        manifest.record(s3_key_full, entry['size'], rows, schema_hash, content_hash)
+        manifest.save()
+
+def run_spec(
+        spec: DatasetSpec,
+        s3,
+        s3_bucket: str,
+        s3_key: str,
+        years: List[int],
+        retries: int,
+        file_format: str,
+        dry_run=False,
+        job_config: Optional[dict] = None,
+        profiler: Optional[JobProfiler] = None) -> dict:
+    """Fetch, cast and write one dataset, recording its objects in the dataset manifest.
+    Returns a result record with status, rows and bytes written."""
+    job_config = job_config or {}
+    profiler = get_profiler(profiler, spec.name)
+    partition_cols = job_config.get('partition_cols', spec.partition_cols) if file_format == 'parquet' else None
+    years = [int(year) for year in years or []] if spec.uses_years else []
+    result = {'dataset': spec.name, 'status': None, 'rows': 0, 'bytes': 0}
+
+    dataset_prefix = s3_key + f'/{spec.name}'
+    manifest = Manifest.load(s3, s3_bucket, dataset_prefix) if not dry_run else None
+    if spec.refresh == 'if_missing' and manifest is not None and manifest.has_prefix(dataset_prefix):
+        logger.info(f"{spec.name} already loaded; skipping.")
+        result['status'] = 'exists'
+        return result
+
+    # Multi-season runs under a memory budget go one batch of seasons at a time
+    budget_mb = job_config.get('memory_budget_mb')
+    if budget_mb and spec.schema and len(years) > 1 and (not partition_cols or 'season' in partition_cols):
+        return run_spec_chunked(
+            spec, s3, s3_bucket, s3_key, years, retries, file_format, dry_run, job_config,
+            profiler, manifest, partition_cols, int(budget_mb) * 1024 * 1024)
+
+    logger.info(f"Fetching {spec.description} for {years or 'all available data'}.")
+    with profiler.phase('fetch') as counts:
+        df = fetch_with_retries(spec, years, retries)
+        counts['rows'] = len(df)
+
+    if df.empty:
+        logger.info(f"No {spec.description} found.")
+        result['status'] = 'empty'
+        return result
+    result['rows'] = len(df)
+
+    # Single dtype per column, or to_parquet() will error
+    with profiler.phase('cast'):
+        schema = get_schema(spec.schema) if spec.schema else None
+        df = cast_to_schema(df, schema, spec.name) if schema else normalize_mixed_columns(df)
+
+    logger.info(f"********************shape********************\n{df.shape}")
+    if profiler.detailed:
+        # describe() scans every column; only worth paying for under --profile
+        logger.info(f"\n********************dtypes********************\n{df.dtypes}")
+        logger.info(f"\n********************describe********************\n{df.describe().transpose()}")
+
+    if dry_run:
+        logger.info("dry_run set to True; skipping S3 upload.")
+        result['status'] = 'dry_run'
+        return result
+
+    # Full-replace datasets skip objects whose content hash is unchanged since the last write
+    s3_key_full = s3_key + f'/{spec.name}.{file_format}'
+    schema_hash = hash_schema(df)
+    with profiler.phase('upload') as counts:
+        if partition_cols:
+            partitions = write_partitioned_df_to_s3(
+                s3, df, s3_bucket, dataset_prefix, partition_cols, job_config.get('parquet'),
+                previous_hashes=manifest.content_hashes(dataset_prefix + '/'))
+            manifest.record_partitions(partitions, schema_hash)
+            written = sum(partition['written'] for partition in partitions.values())
+            counts['bytes'] = sum(partition['bytes'] for partition in partitions.values())
+        else:
+            content_hash = hash_df(df)
+            if previous_content_hash(manifest, s3, s3_bucket, s3_key_full) == content_hash:
+                record_unchanged(manifest, s3_key_full, len(df), schema_hash, content_hash)
+                logger.info(f"S3://{s3_bucket}/{s3_key_full} unchanged; skipping.")
+                written = 0
+            else:
+                counts['bytes'] = write_df_to_s3(
+                    s3, df, file_format, s3_bucket, s3_key_full,
+                    parquet_options=job_config.get('parquet'), content_hash=content_hash)
+                manifest.record(s3_key_full, counts['bytes'], len(df), schema_hash, content_hash)
+                written = 1
+                logger.info(f"File uploaded to S3://{s3_bucket}/{s3_key_full}")
+        counts['rows'] = len(df)
+    result['bytes'] = counts['bytes']
+    if not written:
+        result['status'] = 'unchanged'
+        logger.info(f"{spec.description.capitalize()} unchanged; nothing uploaded.")
+        return result
+    manifest.save()
+    result['status'] = 'uploaded'
+    logger.info(f"{spec.description.capitalize()} upload complete.")
+    return result
+
+def iter_season_chunks(
+        spec: DatasetSpec,
+        years: List[int],
+        retries: int,
+        budget_bytes: int,
+        profiler: JobProfiler) -> Iterator[Tuple[List[int], pd.DataFrame]]:
+    """Fetches and casts seasons in batches that fit in budget_bytes, yielding
+    (seasons, frame). The first season is fetched on its own to size the rest."""
+    schema = get_schema(spec.schema)
+    remaining = list(years)
+    seasons_per_chunk = 1
+    while remaining:
+        chunk_years, remaining = remaining[:seasons_per_chunk], remaining[seasons_per_chunk:]
+        logger.info(f"Fetching {spec.description} for {chunk_years}.")
+        with profiler.phase('fetch') as counts:
+            df = fetch_with_retries(spec, chunk_years, retries)
+            counts['rows'] = len(df)
+        if df.empty:
+            continue
+        with profiler.phase('cast'):
+            df = cast_to_schema(df, schema, spec.name)
+        season_bytes = df.memory_usage(deep=True).sum() / len(chunk_years)
+        seasons_per_chunk = max(1, int(budget_bytes // (CHUNK_MEMORY_OVERHEAD * season_bytes)))
+        logger.info(f"{spec.name} {chunk_years}: {df.shape}, ~{season_bytes / (1024 * 1024):.1f} MB per season; next batch {seasons_per_chunk} season(s).")
+        yield chunk_years, df
+
+def align_to_columns(df: pd.DataFrame, columns: List[str], dataset: str) -> pd.DataFrame:
+    """Reindexes a batch to the columns of the first batch of a single-object
+    stream, whose header or parquet schema is already written. Undeclared
+    columns can come and go between seasons: new ones are dropped and missing
+    ones written as null strings, both reported."""
+    added = [col for col in df.columns if col not in columns]
+    dropped = [col for col in columns if col not in df.columns]
+    if added:
+        logger.info(f"{dataset}: dropping columns not in the first batch: {added}")
+    if dropped:
+        logger.info(f"{dataset}: columns of the first batch missing from this batch are written as nulls: {dropped}")
+    if not added and not dropped:
+        return df
+    df = df.reindex(columns=columns)
+    for col in dropped:
+        # Only undeclared (string) columns can be missing after cast_to_schema
+        df[col] = df[col].astype('string')
+    return df
+
+def run_spec_chunked(
+        spec: DatasetSpec,
+        s3,
+        s3_bucket: str,
+        s3_key: str,
+        years: List[int],
+        retries: int,
+        file_format: str,
+        dry_run: bool,
+        job_config: dict,
+        profiler: JobProfiler,
+        manifest: Optional[Manifest],
+        partition_cols: Optional[List[str]],
+        budget_bytes: int) -> dict:
+    """run_spec for multi-season runs under memory_budget_mb. Only one batch of
+    seasons is held at a time: partitioned output writes each batch's season
+    partitions as it goes, single-object output appends each batch to one
+    object, aligned to the first batch's columns. Needs a declared schema so
+    every batch has the same dtypes.
+
+    The content hash of a single object is only known once the last batch is
+    serialized, so the object is spooled to a local temporary file and only
+    uploaded, with the hash in its metadata, if the hash changed; an unchanged
+    object costs no write I/O."""
+    result = {'dataset': spec.name, 'status': None, 'rows': 0, 'bytes': 0}
+    dataset_prefix = s3_key + f'/{spec.name}'
+    s3_key_full = s3_key + f'/{spec.name}.{file_format}'
+    logger.info(f"Processing {spec.description} for {len(years)} seasons within {budget_bytes // (1024 * 1024)} MB.")
+
+    written = 0
+    schema_hash = None
+    columns = None
+    hasher = FrameHasher()
+    spool = None
+    stream = None
+    if not dry_run and not partition_cols:
+        spool = tempfile.TemporaryFile(prefix=f'{spec.name}-')
+        stream = DataFrameStreamWriter(spool, file_format, s3_key_full, parquet_options=job_config.get('parquet'))
+    try:
+        for chunk_years, df in iter_season_chunks(spec, years, retries, budget_bytes, profiler):
+            result['rows'] += len(df)
+            if dry_run:
+                continue
+            schema_hash = schema_hash or hash_schema(df)
+            with profiler.phase('upload') as counts:
+                if partition_cols:
+                    partitions = write_partitioned_df_to_s3(
+                        s3, df, s3_bucket, dataset_prefix, partition_cols, job_config.get('parquet'),
+                        previous_hashes=manifest.content_hashes(dataset_prefix + '/'))
+                    manifest.record_partitions(partitions, schema_hash)
+                    written += sum(partition['written'] for partition in partitions.values())
+                    counts['bytes'] = sum(partition['bytes'] for partition in partitions.values())
+                else:
+                    columns = columns or list(df.columns)
+                    df = align_to_columns(df, columns, spec.name)
+                    # Keep the row numbering continuous across batches
+                    df.index = pd.RangeIndex(stream.rows, stream.rows + len(df))
+                    hasher.update(df)
+                    stream.write(df)
+                counts['rows'] = len(df)
+            result['bytes'] += counts['bytes']
+            del df
+
+        if spool is not None and result['rows'] > 0:
+            stream.close()
+            content_hash = hasher.hexdigest()
+            if previous_content_hash(manifest, s3, s3_bucket, s3_key_full) == content_hash:
+                record_unchanged(manifest, s3_key_full, result['rows'], schema_hash, content_hash)
+                logger.info(f"S3://{s3_bucket}/{s3_key_full} unchanged; skipping.")
+            else:
+                with profiler.phase('upload') as counts:
+                    spool.seek(0)
+                    counts['bytes'] = upload_file_to_s3(s3, spool, s3_bucket, s3_key_full, content_hash=content_hash)
+                result['bytes'] = counts['bytes']
+                manifest.record(s3_key_full, result['bytes'], result['rows'], schema_hash, content_hash)
+                written = 1
+                logger.info(f"File uploaded to S3://{s3_bucket}/{s3_key_full}")
+    finally:
+        if spool is not None:
+            spool.close()
+
+    if result['rows'] == 0:
+        logger.info(f"No {spec.description} found.")
+        result['status'] = 'empty'
+        return result
+    if dry_run:
+        logger.info("dry_run set to True; skipping S3 upload.")
+        result['status'] = 'dry_run'
+        return result
+    if not written:
+        result['status'] = 'unchanged'
+        logger.info(f"{spec.description.capitalize()} unchanged; nothing uploaded.")
+        return result
+    manifest.save()
+    result['status'] = 'uploaded'
+    logger.info(f"{spec.description.capitalize()} upload complete.")
+    return result
+
+def make_job(spec: DatasetSpec) -> Callable:
+    """Wraps a spec in the run_*_job signature used by main's job registry."""
+    def run_job(
+            s3,
+            s3_bucket: str,
+            s3_key: str,
+            years: List[int],
+            retries: int,
+            file_format: str,
+            dry_run=False,
+            job_config: Optional[dict] = None,
+            profiler: Optional[JobProfiler] = None) -> dict:
+        return run_spec(spec, s3, s3_bucket, s3_key, years, retries, file_format, dry_run, job_config, profiler)
+    run_job.__name__ = f"run_{spec.name}_job"
+    run_job.__doc__ = f"Gets {spec.description} and writes it to the bronze layer ({spec.refresh})."
+    return run_job
+
+def run_specs(
+        specs: List[DatasetSpec],
+        s3,
+        s3_bucket: str,
+        s3_key: str,
+        years: List[int],
+        retries: int,
+        file_format: str,
+        dry_run=False,
+        job_configs: Optional[Dict[str, dict]] = None,
+        profilers: Optional[Dict[str, JobProfiler]] = None,
+        max_workers: int = 4) -> List[dict]:
+    """Runs several specs concurrently in one process. They share the S3 client,
+    the download cache and the connection pool; a failure in one dataset does not
+    stop the others. Returns one result record per dataset."""
+    job_configs = job_configs or {}
+    profilers = profilers or {}
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                run_spec, spec, s3, s3_bucket, s3_key, years, retries, file_format, dry_run,
+                job_configs.get(spec.name), profilers.get(spec.name)): spec
+            for spec in specs
+        }
+        for future in as_completed(futures):
+            spec = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.info(f"Job {spec.name} failed.")
+                logger.exception(e)
+                result = {'dataset': spec.name, 'status': 'failed', 'rows': 0, 'bytes': 0, 'error': repr(e)}
+            logger.info(f"{spec.name} {result['status']} ({result['rows']} rows, {result['bytes']} bytes).")
+            results.append(result)
+    return sorted(results, key=lambda r: r['dataset'])
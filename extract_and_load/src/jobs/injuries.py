@@ -0,0 +1,20 @@
+# Standard
+from typing import List
+# External
+import nfl_data_py as nfl
+import pandas as pd
+# Internal
+from jobs.engine import DatasetSpec, make_job
+
+def fetch_injuries(years: List[int]) -> pd.DataFrame:
+    """Gets weekly injury reports from nfl_data_py."""
+    return nfl.import_injuries(years=years)
+
+SPEC = DatasetSpec(
+    name='injuries',
+    description='injury report data',
+    fetcher=fetch_injuries,
+    partition_cols=['season', 'week'],
+)
+
+run_injuries_job = make_job(SPEC)
@@ -1,59 +1,264 @@
 # Standard
-from typing import List
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 import time
 # External
 import nfl_data_py as nfl
 import pandas as pd
 # Internal
 from utils.logger import get_logger
-from utils.s3_utils import write_df_to_s3, check_file_exists
+from utils.cache_utils import get_download_cache
+from utils.retry_utils import get_retry_policy
+from utils.s3_utils import write_df_to_s3, write_partitioned_df_to_s3
+from utils.data_utils import hash_df, hash_schema
+from utils.manifest_utils import Manifest
+from utils.profile_utils import JobProfiler, get_profiler
 from utils.time_utils import get_current_nfl_season
+from utils.concurrency_utils import RateLimiter
 
 logger = get_logger(__name__)
 
-def fetch_pbp(years: List[int], retries: int) -> pd.DataFrame:
-    """Gets play-by-play data from nfl_data_py."""
+# Kept in every column set: partitioning, watermarks and joins rely on them
+REQUIRED_PBP_COLUMNS = ['play_id', 'game_id', 'season', 'season_type', 'week']
 
-    for retry_count in range(retries):
+def fetch_pbp(years: List[int], retries: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Gets play-by-play data from nfl_data_py via the local download cache.
+    columns restricts the read to a subset of the ~370 pbp columns."""
+    if columns is None:
+        fetch_fn = lambda: nfl.import_pbp_data(years=years, downcast=True, cache=False, alt_path=None)
+        variant = None
+    else:
+        # Participation data is merged in as extra columns; a projection never asks for it
+        fetch_fn = lambda: nfl.import_pbp_data(
+            years=years, columns=columns, include_participation=False, downcast=True, cache=False, alt_path=None)
+        variant = 'columns:' + ','.join(sorted(columns))
+    return get_retry_policy().call(
+        lambda: get_download_cache().fetch('pbp', years, fetch_fn, variant=variant),
+        f"pbp {years}",
+        max_attempts=retries)
+
+def get_pbp_products(job_config: dict) -> Dict[str, Optional[List[str]]]:
+    """Maps each bronze product to its columns (None for all of them) from
+    jobs.pbp.column_sets. The full set is written as pbp, any other set as
+    pbp_<name>. Without column_sets only the full pbp product is written."""
+    column_sets = job_config.get('column_sets') or {'full': 'all'}
+    products = {}
+    for name, columns in column_sets.items():
+        product = 'pbp' if name == 'full' else f'pbp_{name}'
+        if columns == 'all':
+            products[product] = None
+        else:
+            products[product] = REQUIRED_PBP_COLUMNS + [col for col in columns if col not in REQUIRED_PBP_COLUMNS]
+    return products
+
+def get_fetch_columns(products: Dict[str, Optional[List[str]]]) -> Optional[List[str]]:
+    """The narrowest read that covers every product: all columns if any product
+    needs them, otherwise the union of the projected sets."""
+    if any(columns is None for columns in products.values()):
+        return None
+    fetch_columns = []
+    for columns in products.values():
+        fetch_columns += [col for col in columns if col not in fetch_columns]
+    return fetch_columns
+
+def build_pbp_watermark(year: int, df: pd.DataFrame) -> dict:
+    """Summarizes what has been loaded for a season: the latest week and game seen."""
+    return {
+        'season': year,
+        'max_week': int(df['week'].max()),
+        'max_game_id': str(df['game_id'].max()),
+        'rows': len(df),
+        'updated_at': datetime.now(timezone.utc).isoformat(),
+    }
+
+def write_pbp_product(
+        s3, 
+        s3_bucket: str, 
+        s3_key: str, 
+        product: str, 
+        year: int, 
+        df: pd.DataFrame, 
+        file_format: str, 
+        manifest: Manifest, 
+        profiler: JobProfiler, 
+        result: dict, 
+        dry_run=False, 
+        job_config: Optional[dict] = None) -> dict:
+    """Uploads one season of one pbp product if the manifest has no file for it,
+    or always for the current season. Fills in and returns result, with status
+    'unchanged' when an incremental rerun had no partition to rewrite."""
+    job_config = job_config or {}
+    partition_cols = job_config.get('partition_cols') if file_format == 'parquet' else None
+    result['rows'] = len(df)
+
+    # Check if data for this year exists in S3 if not current year
+    # If no, write to S3
+    if partition_cols:
+        s3_key_full = s3_key + f'/{product}/season={year}/'
+        file_exists = manifest.has_prefix(s3_key_full)
+    else:
+        s3_key_full = s3_key + f'/{product}/{product}_{str(year)}.{file_format}'
+        file_exists = manifest.exists(s3_key_full)
+
+    # If current season, replace existing file
+    is_current_season = year == get_current_nfl_season()
+    if (not file_exists) or (is_current_season):
+        if not dry_run:
+            if (is_current_season) and (file_exists):
+                logger.info(f"Replacing {product} file for current season {year}...")
+            start = time.perf_counter()
+            schema_hash = hash_schema(df)
+            with profiler.phase('upload') as counts:
+                if partition_cols:
+                    previous_hashes = None
+                    if (is_current_season) and (file_exists) and job_config.get('incremental', False):
+                        previous_hashes = manifest.content_hashes(s3_key_full)
+                        watermark = manifest.get_watermark(str(year))
+                        logger.info(f"Incremental refresh for {product} {year}; last watermark week {watermark.get('max_week')}.")
+                    partitions = write_partitioned_df_to_s3(
+                        s3, df, s3_bucket, s3_key + f'/{product}', partition_cols, job_config.get('parquet'), previous_hashes)
+                    manifest.record_partitions(partitions, schema_hash)
+                    manifest.set_watermark(str(year), build_pbp_watermark(year, df))
+                    result['partitions_written'] = sum(partition['written'] for partition in partitions.values())
+                    counts['bytes'] = sum(partition['bytes'] for partition in partitions.values())
+                else:
+                    content_hash = hash_df(df)
+                    counts['bytes'] = write_df_to_s3(s3, df, file_format, s3_bucket, s3_key_full, content_hash=content_hash)
+                    manifest.record(s3_key_full, counts['bytes'], len(df), schema_hash, content_hash)
+                counts['rows'] = len(df)
+            result['bytes'] = counts['bytes']
+            result['upload_secs'] = round(time.perf_counter() - start, 3)
+            if partition_cols and result['partitions_written'] == 0:
+                # Incremental rerun where no week changed: nothing to save either
+                logger.info(f"S3://{s3_bucket}/{s3_key_full} unchanged; no partitions written.")
+                result['status'] = 'unchanged'
+            else:
+                logger.info(f"File uploaded to S3://{s3_bucket}/{s3_key_full}")
+                result['status'] = 'uploaded'
+        else:
+            logger.info("dry_run set to True; skipping S3 upload.")
+            result['status'] = 'dry_run'
+    else:
+        logger.info(f"S3://{s3_bucket}/{s3_key_full} already exists.")
+        result['status'] = 'exists'
+    return result
+
+def process_pbp_season(
+        s3, 
+        s3_bucket: str, 
+        s3_key: str, 
+        year: int, 
+        retries: int, 
+        file_format: str, 
+        rate_limiter: RateLimiter, 
+        manifests: Dict[str, Manifest], 
+        profiler: JobProfiler, 
+        dry_run=False, 
+        job_config: Optional[dict] = None) -> List[dict]:
+    """Fetches one season once and uploads each pbp product (column set) from it.
+    With partition_cols configured, parquet output is written as a Hive-partitioned
+    dataset under <product>/season=YYYY/ instead of a single file, and a watermark is
+    kept in the product's manifest. With incremental set, the current season only
+    rewrites partitions whose content hash differs from the one recorded by the
+    previous run. Returns a result record per product with status and per-phase timings."""
+    job_config = job_config or {}
+    products = get_pbp_products(job_config)
+    results = {
+        product: {'season': year, 'product': product, 'status': None, 'rows': 0, 'bytes': 0, 'fetch_secs': 0.0, 'upload_secs': 0.0, 'partitions_written': 0, 'error': None}
+        for product in products
+    }
+    try:
+        # Fetch play-by-play data; the rate limiter spaces out hits to the upstream API
+        rate_limiter.wait()
+        logger.info(f"Fetching play-by-play data for {year}.")
+        start = time.perf_counter()
+        with profiler.phase('fetch') as counts:
+            df = fetch_pbp([int(year)], retries, get_fetch_columns(products))
+            counts['rows'] = len(df)
+        fetch_secs = round(time.perf_counter() - start, 3)
+        for result in results.values():
+            result['fetch_secs'] = fetch_secs
+    except Exception as e:
+        logger.info(f"Failed to fetch play-by-play data for {year}.")
+        logger.exception(e)
+        for result in results.values():
+            result['status'] = 'failed'
+            result['error'] = repr(e)
+        return list(results.values())
+
+    if df.empty:
+        logger.info(f"No data for {year}.")
+        for result in results.values():
+            result['status'] = 'empty'
+        return list(results.values())
+
+    for product, columns in products.items():
+        result = results[product]
         try:
-            df = nfl.import_pbp_data(years=years, downcast=True, cache=False, alt_path=None)
+            if columns is None:
+                product_df = df
+            else:
+                # Older seasons lack some columns; write what exists
+                missing = [col for col in columns if col not in df.columns]
+                if missing:
+                    logger.info(f"{product} {year} is missing columns {missing}.")
+                product_df = df[[col for col in columns if col in df.columns]]
+            write_pbp_product(
+                s3, s3_bucket, s3_key, product, year, product_df, file_format, manifests[product], profiler, result, dry_run, job_config)
         except Exception as e:
-            logger.info(f"Exception fetching data. {retries - (retry_count + 1)} retries left.")
+            logger.info(f"Failed to process {product} data for {year}.")
             logger.exception(e)
-            logger.info("Sleeping for 10 seconds...")
-            time.sleep(10)
-    return df
-
-def run_pbp_job(s3, s3_bucket: str, s3_key: str, years: List[int], retries: int, file_format: str, dry_run=False) -> None:
-    """Loops through each week in the list of years and uploads to data lake if file is not present."""
-    for year in years:
-        # Fetch play-by-play data
-        logger.info(f"Fetching play-by-play data for {year}.")
-        df = fetch_pbp([int(year)], retries)
-
-        if df.empty:
-            logger.info(f"No data for {year}.")
-            continue
-        
-        # Check if data for this year exists in S3 if not current year
-        # If no, write to S3
-        s3_key_full = s3_key + f'/pbp/pbp_{str(year)}.{file_format}'
-        file_exists = check_file_exists(s3, s3_bucket, s3_key_full)
-
-        # If current season, replace existing file
-        is_current_season = year == get_current_nfl_season()
-        if (not file_exists) or (is_current_season):
-            if not dry_run:
-                if (is_current_season) and (file_exists):
-                    logger.info(f"Replacing file for current season {year}...")
-                write_df_to_s3(s3, df, file_format, s3_bucket, s3_key_full)
-                logger.info(f"File uploaded to S3://{s3_bucket}/{s3_key_full}")
-            else:
-                logger.info("dry_run set to True; skipping S3 upload.")
-        else:
-            logger.info(f"S3://{s3_bucket}/{s3_key_full} already exists.")
-        
-        # Sleep before hitting API again
-        logger.info(f"{year} uploads complete. Sleeping for 5 seconds...")
-        time.sleep(5)
-        
\ No newline at end of file
+            result['status'] = 'failed'
+            result['error'] = repr(e)
+    return list(results.values())
+
+def run_pbp_job(
+        s3, 
+        s3_bucket: str, 
+        s3_key: str, 
+        years: List[int], 
+        retries: int, 
+        file_format: str, 
+        dry_run=False, 
+        job_config: Optional[dict] = None, 
+        profiler: Optional[JobProfiler] = None) -> List[dict]:
+    """Processes each season in the list of years on a bounded worker pool,
+    so fetching one season overlaps with serializing and uploading another.
+    Returns one result record per season and product. Raises after saving the
+    manifests and reporting every season if any season failed."""
+    job_config = job_config or {}
+    profiler = get_profiler(profiler, 'pbp')
+    max_workers = job_config.get('max_workers', 1)
+    rate_limiter = RateLimiter(job_config.get('min_fetch_interval_secs', 5))
+    products = get_pbp_products(job_config)
+    # One manifest read per product replaces a head_object/list per season
+    manifests = {product: Manifest.load(s3, s3_bucket, s3_key + f'/{product}') for product in products}
+    logger.info(f"Processing {len(years)} season(s) into {', '.join(products)} with {max_workers} worker(s).")
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                process_pbp_season, 
+                s3, s3_bucket, s3_key, int(year), retries, file_format, rate_limiter, manifests, profiler, dry_run, job_config)
+            for year in years
+        ]
+        for future in as_completed(futures):
+            for result in future.result():
+                logger.info(f"{result['product']} {result['season']} {result['status']} (fetch {result['fetch_secs']}s, upload {result['upload_secs']}s).")
+                results.append(result)
+
+    # Only products that wrote something have new manifest entries to save
+    for product, manifest in manifests.items():
+        if any(r['status'] == 'uploaded' for r in results if r['product'] == product):
+            manifest.save()
+
+    # Report per-season outcomes
+    results.sort(key=lambda r: (r['season'], r['product']))
+    failed = sorted({r['season'] for r in results if r['status'] == 'failed'})
+    logger.info(f"\n********************pbp results********************\n{pd.DataFrame(results).to_string(index=False)}")
+    if failed:
+        raise RuntimeError(f"pbp failed for seasons {failed}")
+    logger.info("Play-by-play uploads complete.")
+    return results
@@ -0,0 +1,20 @@
+# Standard
+from typing import List
+# External
+import nfl_data_py as nfl
+import pandas as pd
+# Internal
+from jobs.engine import DatasetSpec, make_job
+
+def fetch_pfr_passing(years: List[int]) -> pd.DataFrame:
+    """Gets Pro Football Reference seasonal passing stats from nfl_data_py."""
+    return nfl.import_seasonal_pfr('pass', years=years)
+
+SPEC = DatasetSpec(
+    name='pfr_passing',
+    description='PFR seasonal passing data',
+    fetcher=fetch_pfr_passing,
+    partition_cols=['season'],
+)
+
+run_pfr_passing_job = make_job(SPEC)
@@ -0,0 +1,20 @@
+# Standard
+from typing import List
+# External
+import nfl_data_py as nfl
+import pandas as pd
+# Internal
+from jobs.engine import DatasetSpec, make_job
+
+def fetch_player_ids(years: List[int]) -> pd.DataFrame:
+    """Gets the cross-site player ID mapping from nfl_data_py."""
+    return nfl.import_ids()
+
+SPEC = DatasetSpec(
+    name='player_ids',
+    description='player ID mapping data',
+    fetcher=fetch_player_ids,
+    uses_years=False,
+)
+
+run_player_ids_job = make_job(SPEC)
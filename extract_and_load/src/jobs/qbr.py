@@ -0,0 +1,20 @@
+# Standard
+from typing import List
+# External
+import nfl_data_py as nfl
+import pandas as pd
+# Internal
+from jobs.engine import DatasetSpec, make_job
+
+def fetch_qbr(years: List[int]) -> pd.DataFrame:
+    """Gets ESPN season-level QBR from nfl_data_py."""
+    return nfl.import_qbr(years=years, level='nfl', frequency='season')
+
+SPEC = DatasetSpec(
+    name='qbr',
+    description='QBR data',
+    fetcher=fetch_qbr,
+    partition_cols=['season'],
+)
+
+run_qbr_job = make_job(SPEC)
@@ -0,0 +1,20 @@
+# Standard
+from typing import List
+# External
+import nfl_data_py as nfl
+import pandas as pd
+# Internal
+from jobs.engine import DatasetSpec, make_job
+
+def fetch_schedules(years: List[int]) -> pd.DataFrame:
+    """Gets game schedules and results from nfl_data_py."""
+    return nfl.import_schedules(years=years)
+
+SPEC = DatasetSpec(
+    name='schedules',
+    description='schedule data',
+    fetcher=fetch_schedules,
+    partition_cols=['season'],
+)
+
+run_schedules_job = make_job(SPEC)
@@ -0,0 +1,20 @@
+# Standard
+from typing import List
+# External
+import nfl_data_py as nfl
+import pandas as pd
+# Internal
+from jobs.engine import DatasetSpec, make_job
+
+def fetch_snap_counts(years: List[int]) -> pd.DataFrame:
+    """Gets per-game snap counts from nfl_data_py."""
+    return nfl.import_snap_counts(years=years)
+
+SPEC = DatasetSpec(
+    name='snap_counts',
+    description='snap count data',
+    fetcher=fetch_snap_counts,
+    partition_cols=['season', 'week'],
+)
+
+run_snap_counts_job = make_job(SPEC)
@@ -0,0 +1,20 @@
+# Standard
+from typing import List
+# External
+import nfl_data_py as nfl
+import pandas as pd
+# Internal
+from jobs.engine import DatasetSpec, make_job
+
+def fetch_team_desc(years: List[int]) -> pd.DataFrame:
+    """Gets team names, colors and logos from nfl_data_py."""
+    return nfl.import_team_desc()
+
+SPEC = DatasetSpec(
+    name='team_desc',
+    description='team description data',
+    fetcher=fetch_team_desc,
+    uses_years=False,
+)
+
+run_team_desc_job = make_job(SPEC)
@@ -1,22 +1,190 @@
 # Standard
 import os
 import argparse
-from typing import List
+import importlib
+from typing import List, Callable
 # External
-import boto3
 import yaml
 # Internal
 from utils.logger import get_logger
-from jobs.pbp import run_pbp_job
-from jobs.player_weekly import run_player_weekly_job
-from jobs.player_seasonal import run_player_seasonal_job
-from jobs.rosters import run_rosters_job
-from jobs.sc_lines import run_sc_lines_job
-from jobs.win_totals import run_win_totals_job
-from scrapers.draftkings.player_props import get_draftkings_player_props
 
 logger = get_logger(__name__)
 
+# Dataset name -> (module, entry point, kind). Modules are imported only when
+# their job runs, so a rosters run never loads selenium or bs4.
+# 'extract' jobs take the S3 arguments; 'scraper' jobs take the config.
+JOB_REGISTRY = {
+    'pbp': ('jobs.pbp', 'run_pbp_job', 'extract'),
+    'player_weekly': ('jobs.player_weekly', 'run_player_weekly_job', 'extract'),
+    'player_seasonal': ('jobs.player_seasonal', 'run_player_seasonal_job', 'extract'),
+    'rosters': ('jobs.rosters', 'run_rosters_job', 'extract'),
+    'sc_lines': ('jobs.sc_lines', 'run_sc_lines_job', 'extract'),
+    'win_totals': ('jobs.win_totals', 'run_win_totals_job', 'extract'),
+    'injuries': ('jobs.injuries', 'run_injuries_job', 'extract'),
+    'snap_counts': ('jobs.snap_counts', 'run_snap_counts_job', 'extract'),
+    'schedules': ('jobs.schedules', 'run_schedules_job', 'extract'),
+    'qbr': ('jobs.qbr', 'run_qbr_job', 'extract'),
+    'draft_picks': ('jobs.draft_picks', 'run_draft_picks_job', 'extract'),
+    'draft_values': ('jobs.draft_values', 'run_draft_values_job', 'extract'),
+    'combine_data': ('jobs.combine_data', 'run_combine_data_job', 'extract'),
+    'player_ids': ('jobs.player_ids', 'run_player_ids_job', 'extract'),
+    'pfr_passing': ('jobs.pfr_passing', 'run_pfr_passing_job', 'extract'),
+    'team_desc': ('jobs.team_desc', 'run_team_desc_job', 'extract'),
+    'dk_player_props': ('scrapers.draftkings.player_props', 'run_dk_player_props_job', 'scraper'),
+    # Long-running: polls prop markets until SIGTERM/SIGINT
+    'dk_prop_poller': ('scrapers.draftkings.poller', 'run_dk_prop_poller_job', 'scraper'),
+    # Add more data type jobs here
+}
+
+def load_job(data: str) -> Callable:
+    """Imports a job's module and returns its entry point."""
+    module_name, entry_point, _ = JOB_REGISTRY[data]
+    return getattr(importlib.import_module(module_name), entry_point)
+
+def load_spec(data: str):
+    """Returns the DatasetSpec of an engine-backed job, or None for custom jobs like pbp."""
+    module_name, _, _ = JOB_REGISTRY[data]
+    return getattr(importlib.import_module(module_name), 'SPEC', None)
+
+def get_job_config(config: dict, data: str) -> dict:
+    """Returns the config section for a job, with the shared parquet
+    writer settings and engine memory budget as defaults for any job-level overrides."""
+    job_config = dict(config['jobs'].get(data) or {})
+    job_config['parquet'] = {**config.get('parquet', {}), **job_config.get('parquet', {})}
+    job_config.setdefault('memory_budget_mb', config['jobs'].get('engine', {}).get('memory_budget_mb'))
+    return job_config
+
+def resolve_years(years):
+    """Expands the -y/schedule years argument: 'all' is every season since 1999,
+    'current' is the season in progress."""
+    if years is None:
+        return None
+    if years[0] == 'all':
+        return [x for x in range(1999,2023)]
+    if years[0] == 'current':
+        from utils.time_utils import get_current_nfl_season
+        return [get_current_nfl_season()]
+    return years
+
+def run_datasets(config: dict, s3, datasets: List[str], years, file_format: str, dry_run: bool = False, profile: bool = False) -> None:
+    """Runs one extract: a single job, a scraper, or several engine-backed
+    datasets concurrently. Emits one JSON metrics line per dataset, with the
+    dataset's result status, and raises if any dataset failed."""
+    from utils.profile_utils import JobProfiler
+
+    retries = config['jobs']['retries']
+    data = datasets[0]
+    if len(datasets) == 1 and JOB_REGISTRY[data][2] == 'scraper':
+        load_job(data)({**config, 'dry_run': dry_run})
+        return
+
+    # S3 data lake variables
+    s3_bucket = os.getenv(key='S3_BUCKET')
+    s3_key = os.getenv(key='S3_BRONZE_KEY')
+    logger.info(f"Job: {', '.join(datasets)}\nYears: {years}\nFile format: {file_format}")
+
+    # Several datasets run concurrently through the job engine in this process
+    if len(datasets) > 1:
+        from jobs.engine import run_specs
+        specs = [load_spec(name) for name in datasets]
+        profilers = {name: JobProfiler(name, detailed=profile) for name in datasets}
+        statuses = {name: 'failed' for name in datasets}
+        try:
+            results = run_specs(
+                specs, s3, s3_bucket, s3_key, years, retries, file_format, dry_run,
+                job_configs={name: get_job_config(config, name) for name in datasets},
+                profilers=profilers,
+                max_workers=config['jobs'].get('engine', {}).get('max_workers', 4))
+            statuses.update({result['dataset']: result['status'] for result in results})
+        finally:
+            for name, profiler in profilers.items():
+                profiler.emit(statuses[name])
+        failed = [name for name, status in statuses.items() if status == 'failed']
+        if failed:
+            raise RuntimeError(f"Datasets failed: {failed}")
+        return
+
+    # Run extract-and-load job; one JSON metrics line is emitted per job
+    run_job = load_job(data)
+    profiler = JobProfiler(data, detailed=profile)
+    status = 'failed'
+    try:
+        result = run_job(s3, s3_bucket, s3_key, years, retries, file_format, dry_run, job_config=get_job_config(config, data), profiler=profiler)
+        # Engine-backed jobs return a result record; the others only raise on failure
+        status = result['status'] if isinstance(result, dict) else 'ok'
+    finally:
+        profiler.emit(status)
+
+def build_game_window_planner(config: dict):
+    """Planner for schedules gated on game windows. Kickoff times come from the
+    current season's schedules dataset, fetched through the download cache."""
+    from jobs.engine import fetch_with_retries
+    from utils.game_window_utils import GameWindowPlanner
+    from utils.time_utils import get_current_nfl_season
+
+    spec = load_spec('schedules')
+    retries = config['jobs']['retries']
+    window_config = (config.get('daemon') or {}).get('game_windows') or {}
+    return GameWindowPlanner(
+        load_schedule=lambda: fetch_with_retries(spec, [get_current_nfl_season()], retries),
+        lead_mins=window_config.get('lead_mins', 15),
+        game_hours=window_config.get('game_hours', 4),
+        settle_hours=window_config.get('settle_hours', 6),
+        schedule_refresh_hours=window_config.get('schedule_refresh_hours', 6),
+    )
+
+def run_daemon(config: dict, s3, dry_run: bool = False, profile: bool = False) -> None:
+    """Keeps one process resident and runs the entries of the schedules section
+    of config.yml on their cron expressions. The S3 client, download cache and
+    imported job modules are shared by every run; the head_object cache is
+    cleared at the start of each. Entries with game_window: true only run while
+    games can be changing their data. Stops cleanly on SIGTERM/SIGINT."""
+    import signal
+    from utils.s3_utils import clear_head_cache
+    from utils.scheduler_utils import Scheduler
+
+    daemon_config = config.get('daemon') or {}
+    scheduler = Scheduler(
+        max_workers=daemon_config.get('max_workers', 4),
+        run_on_start=daemon_config.get('run_on_start', False))
+    planner = None
+    for name, entry in (config.get('schedules') or {}).items():
+        datasets = entry.get('data') or [name]
+        unknown = [dataset for dataset in datasets if dataset not in JOB_REGISTRY]
+        if unknown:
+            raise ValueError(f"Schedule {name} refers to unknown data types {unknown}")
+        if len(datasets) > 1 and any(load_spec(dataset) is None for dataset in datasets):
+            raise ValueError(f"Schedule {name}: only engine-backed datasets can be run together")
+        years = entry.get('years')
+        years = [str(years)] if isinstance(years, (str, int)) else years
+        file_format = entry.get('file_format', 'parquet')
+        game_window = entry.get('game_window', False)
+        if game_window and planner is None:
+            planner = build_game_window_planner(config)
+
+        def run_fn(name=name, datasets=datasets, years=years, file_format=file_format, game_window=game_window):
+            # Outside game windows nothing game-driven can have changed upstream
+            if game_window and not planner.should_run():
+                logger.info(f"No game window open; skipping {name}.")
+                return
+            # Objects change between runs; cached head_object results only hold within one
+            clear_head_cache()
+            # Resolved per run so 'current' follows the season rollover
+            run_datasets(config, s3, datasets, resolve_years(years), file_format, dry_run, profile)
+        scheduler.add(name, entry['cron'], run_fn)
+
+    if not scheduler.jobs:
+        logger.info("No schedules configured; nothing to run.")
+        return
+
+    def handle_signal(signum, frame):
+        logger.info(f"Received signal {signum}; shutting down after running jobs finish.")
+        scheduler.stop()
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    scheduler.run_forever(tick_secs=daemon_config.get('tick_secs', 1.0))
+
 def main(args):
     # Import config
     with open("src/config.yml", "r") as config_stream:
@@ -26,57 +194,63 @@ def main(args):
             logger.info(exception)
     retries = config['jobs']['retries']
 
-    # Create boto3 client
-    s3 = boto3.client('s3')
-    
-    # S3 data lake variables
-    s3_bucket = os.getenv(key='S3_BUCKET')
-    s3_key = os.getenv(key='S3_BRONZE_KEY')
+    # --storage overrides the backend in config; scrapers build their own client from it
+    if args.storage:
+        config['storage'] = {**(config.get('storage') or {}), 'backend': args.storage}
+
+    if not args.daemon and len(args.data) == 1 and JOB_REGISTRY[args.data[0]][2] == 'scraper':
+        load_job(args.data[0])({**config, 'dry_run': args.dry_run})
+        return
+
+    # Imported here rather than at module level so only extract runs pay for boto3
+    from utils.s3_utils import get_storage_client
+    from utils.cache_utils import configure_download_cache
+    from utils.retry_utils import configure_retry_policy
+
+    # Local download cache; --refresh refetches and overwrites cached entries
+    configure_download_cache(config.get('cache'), refresh=args.refresh)
+    # Backoff for upstream fetches; jobs.retries is the attempt count
+    configure_retry_policy(config['jobs'].get('retry'), retries)
+
+    # Shared boto3 client, or a local/in-memory stand-in
+    s3 = get_storage_client(config.get('storage'), config.get('s3'))
 
-    # Unpack args
-    years = args.years
-    try:
-        if years[0] == 'all':
-            years = [x for x in range(1999,2023)]
-    except TypeError as err:
-        logger.info("No 'years' argument provided.")
-    file_format = args.file_format
-    data = args.data
-    logger.info(f"Job: {data}\nYears: {years}\nFile format: {file_format}")
-    
     if args.dry_run:
         logger.info("Running dry mode -- no files will be uploaded.")
         dry_run = True
     else:
         dry_run = False
 
-    # Run extract-and-load job
-    if data == 'pbp':
-        run_pbp_job(s3, s3_bucket, s3_key, years, retries, file_format, dry_run)
-    if data == 'player_weekly':
-        run_player_weekly_job(s3, s3_bucket, s3_key, years, retries, file_format, dry_run)
-    if data == 'player_seasonal':
-        run_player_seasonal_job(s3, s3_bucket, s3_key, years, retries, file_format, dry_run)
-    if data == 'rosters':
-        run_rosters_job(s3, s3_bucket, s3_key, years, retries, file_format, dry_run)
-    if data == 'sc_lines':
-        run_sc_lines_job(s3, s3_bucket, s3_key, years, retries, file_format, dry_run)
-    if data == 'win_totals':
-        run_win_totals_job(s3, s3_bucket, s3_key, years, retries, file_format, dry_run)
-    if data == 'dk_player_props':
-        d = config['scrapers']['urls']['player_props']['draftkings']
-        chromedriver_path = config['scrapers']['chromedriver_location']
-        sleep_secs_range = config['scrapers']['sleep_secs_range']
-        urls = [url for url in d.values()]
-        get_draftkings_player_props(urls, chromedriver_path, sleep_secs_range)
-    # Add more data type jobs here
+    if args.daemon:
+        run_daemon(config, s3, dry_run, args.profile)
+        return
+
+    # Unpack args
+    years = resolve_years(args.years)
+    if years is None:
+        logger.info("No 'years' argument provided.")
+    run_datasets(config, s3, args.data, years, args.file_format, dry_run, args.profile)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Extract play-by-play data and send to S3 bronze layer.")
-    parser.add_argument('-d', '--data', required=True, help='The type of data to be fetched. Only accepts 1 argument; run a separate container for other data types. Corresponds to the name of the .py file in jobs.')
+    parser.add_argument('-d', '--data', nargs='+', choices=sorted(JOB_REGISTRY), help='The type(s) of data to be fetched. Corresponds to the name of the .py file in jobs. Several engine-backed datasets can be passed to run them concurrently in one process.')
     parser.add_argument('-y', '--years', nargs='+', help='List of weeks to extract data for.')
     parser.add_argument('-f', '--file_format', default='json', help='File format to be uploaded to S3.')
     parser.add_argument('--dry_run', action='store_true', help='Run the script without making changes')
+    parser.add_argument('--refresh', action='store_true', help='Ignore the local download cache and refetch from nfl_data_py')
+    parser.add_argument('--profile', action='store_true', help='Collect tracemalloc peaks and log expensive diagnostics such as describe()')
+    parser.add_argument('--list', action='store_true', help='List the available data types and exit')
+    parser.add_argument('--storage', choices=['s3', 'local', 'memory'], help='Override the storage backend in config.yml, e.g. local for offline runs')
+    parser.add_argument('--daemon', action='store_true', help='Stay resident and run the jobs in the schedules section of config.yml')
     args = parser.parse_args()
 
+    if args.list:
+        for name, (module_name, entry_point, kind) in JOB_REGISTRY.items():
+            print(f"{name:<20}{kind:<10}{module_name}.{entry_point}")
+        raise SystemExit(0)
+    if not args.data and not args.daemon:
+        parser.error("the following arguments are required: -d/--data")
+    if args.data and len(args.data) > 1 and any(load_spec(name) is None for name in args.data):
+        parser.error("only engine-backed datasets can be run together; run pbp and scrapers on their own")
+
     main(args)
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""Parsers for DraftKings player prop pages. Both return one market's props as a
+frame indexed by player_name (see build_props_frame):
+
+- parse_player_props reads a rendered page. Only the selected Player Stats
+  card is parsed, with lxml when it is installed, and names, lines and odds
+  are collected in one pass over the card.
+- parse_subcategory_payload reads the JSON payload of the market's
+  subcategory api endpoint. The subcategory id comes from the initial state
+  embedded in the raw page (find_subcategory).
+"""
+# Standard
+import re
+import json
+from io import BytesIO
+from datetime import datetime
+from typing import List, Optional, Tuple
+# External
+import pandas as pd
+from bs4 import BeautifulSoup
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+# Internal
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HAS_LXML = etree is not None
+
+CARD_MARKER = 'aria-labelledby="game_category_Player Stats"'
+DIV_TAG_PATTERN = re.compile(r'<(/?)div\b', re.IGNORECASE)
+PLAYER_NAME_CLASSES = {'sportsbook-event-accordion__title'}
+CELL_CLASSES = {'game-props-card17__cell', 'double'}
+LINE_CLASSES = {'sportsbook-outcome-cell__label'}
+ODDS_CLASSES = {'sportsbook-odds', 'american', 'default-color'}
+
+# The server-rendered page embeds its offer data as a JSON assignment
+INITIAL_STATE_MARKER = 'window.__INITIAL_STATE__ ='
+
+def get_stat_name(url: str) -> str:
+    """Player prop stat name from a market url, e.g. rec_yards."""
+    return url.split('=')[-1].replace('-', '_')
+
+def build_props_frame(
+        stat_name: str, 
+        player_names: List[str], 
+        over_lines: List[Optional[str]], 
+        over_odds: List[Optional[str]], 
+        under_lines: List[Optional[str]], 
+        under_odds: List[Optional[str]], 
+        scraped_at: datetime) -> pd.DataFrame:
+    """One market's props indexed by player_name, with lines and odds cleaned."""
+    # Create a dataframe from the extracted data
+    df = pd.DataFrame({
+        "player_name": player_names,
+        f"{stat_name}_over_line": over_lines,
+        f"{stat_name}_over_odds": over_odds,
+        f"{stat_name}_under_line": under_lines,
+        f"{stat_name}_under_odds": under_odds
+    })
+    df['timestamp'] = scraped_at
+    if df.empty:
+        return df
+
+    ## Transformations
+    # Set index to player_name for future join
+    df.set_index('player_name', inplace=True)
+    for col in df.columns:
+        # Replace unicode minus with ASCII hyphen-minus
+        if 'odds' in col:
+            df[col] = df[col].str.replace('−', '-')
+        # Remove 'Over ' and 'Under ' from line columns
+        if 'line' in col:
+            df[col] = df[col].str.replace('Over ', '')
+            df[col] = df[col].str.replace('Under ', '')
+    return df
+
+def parse_initial_state(html: str) -> Optional[dict]:
+    """Decodes the window.__INITIAL_STATE__ payload of a raw page, or None if absent."""
+    start = html.find(INITIAL_STATE_MARKER)
+    if start == -1:
+        return None
+    try:
+        state, _ = json.JSONDecoder().raw_decode(html[start + len(INITIAL_STATE_MARKER):].lstrip())
+    except ValueError:
+        return None
+    return state
+
+def normalize_market_name(name: str) -> str:
+    # 'Rec Yards' and the url's 'rec-yards' both become 'recyards'
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+def find_subcategory(state: dict, url: str) -> Optional[Tuple[str, int, int]]:
+    """(event group id, offer category id, subcategory id) of the url's market,
+    looked up by name in the subcategory descriptors of a page's initial state,
+    or None if the page does not list the market."""
+    market = normalize_market_name(url.split('=')[-1])
+    for event_group_id, event_group in state.get('eventGroups', {}).items():
+        for category in event_group.get('offerCategories', []):
+            for descriptor in category.get('offerSubcategoryDescriptors', []):
+                if normalize_market_name(descriptor.get('name', '')) == market:
+                    return event_group_id, category.get('offerCategoryId'), descriptor.get('subcategoryId')
+    return None
+
+def is_game_event(event: dict) -> bool:
+    # Season-long futures hang off one event per player, with no opponent
+    return bool(event.get('teamShortName1') and event.get('teamShortName2'))
+
+def outcome_line(outcome: dict) -> Optional[str]:
+    if outcome.get('line') is not None:
+        return str(outcome['line'])
+    # Older payloads only carry the line in the label, e.g. 'Over 45.5'
+    parts = outcome.get('label', '').split(' ', 1)
+    return parts[1] if len(parts) == 2 else None
+
+def parse_subcategory_payload(payload: str, url: str, subcategory_id: int, scraped_at: datetime) -> pd.DataFrame:
+    """Extracts one market's props from the JSON payload of its subcategory api
+    endpoint, without rendering a page. Only offers of subcategory_id on game
+    events are kept, so season-long futures in the same subcategory are not
+    recorded as game props."""
+    event_group = json.loads(payload).get('eventGroup', {})
+    events = {str(event.get('eventId')): event for event in event_group.get('events', [])}
+
+    player_names, over_lines, over_odds, under_lines, under_odds = [], [], [], [], []
+    for category in event_group.get('offerCategories', []):
+        for descriptor in category.get('offerSubcategoryDescriptors', []):
+            # Offers are grouped per event: a list of lists
+            for offers in descriptor.get('offerSubcategory', {}).get('offers', []):
+                for offer in offers:
+                    if offer.get('offerSubcategoryId', descriptor.get('subcategoryId')) != subcategory_id:
+                        continue
+                    if not is_game_event(events.get(str(offer.get('eventId')), {})):
+                        continue
+                    outcomes = {outcome.get('label', '').split(' ')[0]: outcome for outcome in offer.get('outcomes', [])}
+                    if 'Over' not in outcomes and 'Under' not in outcomes:
+                        continue
+                    over, under = outcomes.get('Over', {}), outcomes.get('Under', {})
+                    player_names.append(over.get('participant') or under.get('participant') or offer.get('label'))
+                    over_lines.append(outcome_line(over))
+                    over_odds.append(over.get('oddsAmerican'))
+                    under_lines.append(outcome_line(under))
+                    under_odds.append(under.get('oddsAmerican'))
+    return build_props_frame(get_stat_name(url), player_names, over_lines, over_odds, under_lines, under_odds, scraped_at)
+
+def find_player_stats_card(html: str) -> Optional[str]:
+    """Slices the selected Player Stats card out of a page, from its opening tag
+    to the matching closing tag found by counting div nesting, so only it is
+    parsed. Returns None if the page has no selected Player Stats card."""
+    start = html.find(CARD_MARKER)
+    while start != -1:
+        tag_start = html.rfind('<', 0, start)
+        tag_end = html.find('>', start)
+        if tag_start != -1 and tag_end != -1 and 'selected' in html[tag_start:tag_end]:
+            depth = 1
+            for match in DIV_TAG_PATTERN.finditer(html, tag_end):
+                depth += -1 if match.group(1) else 1
+                if depth == 0:
+                    return html[tag_start:html.find('>', match.end()) + 1]
+            return html[tag_start:]
+        start = html.find(CARD_MARKER, start + len(CARD_MARKER))
+    return None
+
+def has_classes(classes: str, required: set) -> bool:
+    return required.issubset(classes.split())
+
+def scan_card_lxml(card: str) -> Tuple[List[str], List[Tuple[Optional[str], Optional[str]]]]:
+    """One pass over the card's parse events, collecting player names and
+    (line, odds) pairs for every outcome cell in document order."""
+    names, cells = [], []
+    cell = None
+    for event, element in etree.iterparse(BytesIO(card.encode('utf-8')), events=('start', 'end'), html=True, encoding='utf-8'):
+        classes = element.get('class', '')
+        if event == 'start':
+            if element.tag == 'li' and has_classes(classes, CELL_CLASSES):
+                cell = [None, None]
+            continue
+        if element.tag == 'a' and has_classes(classes, PLAYER_NAME_CLASSES):
+            names.append(''.join(element.itertext()))
+        elif cell is not None and element.tag == 'span':
+            if cell[0] is None and has_classes(classes, LINE_CLASSES):
+                cell[0] = ''.join(element.itertext())
+            elif cell[1] is None and has_classes(classes, ODDS_CLASSES):
+                cell[1] = ''.join(element.itertext())
+        elif element.tag == 'li' and cell is not None and has_classes(classes, CELL_CLASSES):
+            cells.append(tuple(cell))
+            cell = None
+    return names, cells
+
+def scan_card_bs4(card: str) -> Tuple[List[str], List[Tuple[Optional[str], Optional[str]]]]:
+    """Same as scan_card_lxml, with BeautifulSoup's built-in parser."""
+    names, cells = [], []
+    soup = BeautifulSoup(card, 'html.parser')
+    is_prop_element = lambda tag: (
+        (tag.name == 'a' and has_classes(' '.join(tag.get('class', [])), PLAYER_NAME_CLASSES))
+        or (tag.name == 'li' and has_classes(' '.join(tag.get('class', [])), CELL_CLASSES)))
+    for element in soup.find_all(is_prop_element):
+        if element.name == 'a':
+            names.append(element.text)
+            continue
+        line = odds = None
+        for span in element.find_all('span'):
+            classes = ' '.join(span.get('class', []))
+            if line is None and has_classes(classes, LINE_CLASSES):
+                line = span.text
+            elif odds is None and has_classes(classes, ODDS_CLASSES):
+                odds = span.text
+        cells.append((line, odds))
+    return names, cells
+
+def parse_player_props(html: str, url: str, scraped_at: datetime, use_lxml: bool = HAS_LXML) -> pd.DataFrame:
+    """Extracts player over/under lines and odds from one rendered market page,
+    indexed by player_name. Returns an empty frame if the page has no props."""
+    card = find_player_stats_card(html)
+    if card is None:
+        return pd.DataFrame()
+    names, cells = scan_card_lxml(card) if use_lxml else scan_card_bs4(card)
+
+    # Each player has an Over cell followed by an Under cell
+    if len(cells) < 2 * len(names):
+        logger.info(f"{url}: {len(names)} players but {len(cells)} outcome cells; keeping complete rows only.")
+        names = names[:len(cells) // 2]
+    over_cells, under_cells = cells[0:2 * len(names):2], cells[1:2 * len(names):2]
+    return build_props_frame(
+        get_stat_name(url), 
+        names, 
+        [line for line, _ in over_cells], 
+        [odds for _, odds in over_cells], 
+        [line for line, _ in under_cells], 
+        [odds for _, odds in under_cells], 
+        scraped_at)
@@ -1,133 +1,215 @@
 # Standard
-import yaml
+import os
 import time
-from typing import List
-from datetime import datetime
+import threading
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 # External
 import pandas as pd
-import numpy as np
-from bs4 import BeautifulSoup
 # Internal
 from utils.logger import get_logger
-from utils.s3_utils import write_df_to_s3, check_file_exists
-from utils.scraper_utils import get_selenium_chrome_browser
+from utils.s3_utils import get_storage_client
+from utils.scraper_utils import BrowserPool, BrowserPageFetcher, HostRateLimiter, HttpPageFetcher
+from scrapers.draftkings.parsing import (
+    find_subcategory, get_stat_name, parse_initial_state, parse_player_props, parse_subcategory_payload
+)
+from scrapers.prop_line_store import PROP_LINE_COLUMNS, PropLineStore, market_frame_to_long
 
 logger = get_logger(__name__)
 
+# Offers of one subcategory (market) of one event group, as JSON
+DEFAULT_API_URL = (
+    'https://sportsbook-nash.draftkings.com/sites/US-SB/api/v5/eventgroups/{event_group_id}'
+    '/categories/{category_id}/subcategories/{subcategory_id}?format=json')
+
+def fetch_and_parse(fetcher, host_limiter: HostRateLimiter, url: str, parse) -> Optional[pd.DataFrame]:
+    """Fetches one market page and parses it after the fetch slot is released.
+    Returns None if the fetch or the parse failed."""
+    try:
+        with host_limiter.slot(url):
+            html = fetcher.fetch(url)
+            scraped_at = datetime.now(timezone.utc)
+        logger.info(f"Fetched {url} ({len(html)} chars)")
+    except Exception as e:
+        logger.info(f"Failed to fetch {url}.")
+        logger.exception(e)
+        return None
+    try:
+        return parse(html, url, scraped_at)
+    except Exception as e:
+        # e.g. an html error page where a json payload was expected
+        logger.info(f"Failed to parse {url}.")
+        logger.exception(e)
+        return None
+
+class DraftKingsHttpFetcher:
+    """Reads markets from the DraftKings subcategory api over an HttpPageFetcher.
+    A market page's embedded initial state names the subcategory id of every
+    market, so it is fetched once per page and the offers of each market come
+    from its own api payload rather than the page's default subcategory."""
+
+    def __init__(self, fetcher: HttpPageFetcher, api_url: str = DEFAULT_API_URL):
+        self.fetcher = fetcher
+        self.api_url = api_url
+        self._states: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def page_state(self, url: str, host_limiter: HostRateLimiter) -> Optional[dict]:
+        page = url.split('?')[0]
+        # Held across the fetch so concurrent markets wait for one page fetch
+        with self._lock:
+            if page not in self._states:
+                with host_limiter.slot(url):
+                    state = parse_initial_state(self.fetcher.fetch(url))
+                if state is None:
+                    return None
+                self._states[page] = state
+            return self._states[page]
+
+    def fetch_market(self, url: str, host_limiter: HostRateLimiter) -> Optional[pd.DataFrame]:
+        """One market's props from its subcategory payload, or None if the
+        market could not be resolved or fetched."""
+        try:
+            state = self.page_state(url, host_limiter)
+        except Exception as e:
+            logger.info(f"Failed to fetch {url}.")
+            logger.exception(e)
+            return None
+        subcategory = find_subcategory(state, url) if state is not None else None
+        if subcategory is None:
+            logger.info(f"{url}: market not found in the page's initial state.")
+            return None
+        event_group_id, category_id, subcategory_id = subcategory
+        api_url = self.api_url.format(event_group_id=event_group_id, category_id=category_id, subcategory_id=subcategory_id)
+        parse = lambda payload, _, scraped_at: parse_subcategory_payload(payload, url, subcategory_id, scraped_at)
+        return fetch_and_parse(self.fetcher, host_limiter, api_url, parse)
+
+    def close(self) -> None:
+        self.fetcher.close()
+
+def scrape_market(
+        http_fetcher: Optional[DraftKingsHttpFetcher], 
+        browser_fetcher: Optional[BrowserPageFetcher], 
+        host_limiter: HostRateLimiter, 
+        url: str) -> Optional[pd.DataFrame]:
+    """Scrapes one market from its api payload over HTTP, falling back to a
+    rendered page in a pooled browser when there is no http_fetcher or the
+    payload has no props for the market. Browsers are only started when the
+    fallback is actually needed."""
+    df = None
+    if http_fetcher is not None:
+        df = http_fetcher.fetch_market(url, host_limiter)
+        if df is not None and not df.empty:
+            return df
+        if browser_fetcher is not None:
+            logger.info(f"No props in the api payload of {url}; falling back to the browser.")
+    if browser_fetcher is not None:
+        df = fetch_and_parse(browser_fetcher, host_limiter, url, parse_player_props)
+    return df
+
+def build_fetchers(
+        markets: int, 
+        chromedriver_path: str, 
+        max_browsers: int = 4, 
+        host_limits: Optional[dict] = None, 
+        fetch_mode: str = 'http', 
+        http_options: Optional[dict] = None, 
+        fallback_to_browser: bool = True) -> Tuple[Optional[DraftKingsHttpFetcher], Optional[BrowserPageFetcher], HostRateLimiter]:
+    """The http fetcher, browser fetcher and per-host limiter for scraping
+    markets pages; see get_draftkings_player_props for the options."""
+    if fetch_mode not in ('http', 'browser'):
+        raise ValueError("fetch_mode must be 'http' or 'browser'")
+    host_limits = host_limits or {}
+    http_options = http_options or {}
+    host_limiter = HostRateLimiter(
+        max_concurrent=host_limits.get('max_concurrent', max_browsers), 
+        min_interval_secs=host_limits.get('min_interval_secs', 1.0))
+
+    http_fetcher = None
+    if fetch_mode == 'http':
+        http_fetcher = DraftKingsHttpFetcher(
+            HttpPageFetcher(
+                pool_size=http_options.get('pool_size', markets), 
+                timeout_secs=http_options.get('timeout_secs', 15.0), 
+                base_url=http_options.get('base_url')), 
+            api_url=http_options.get('api_url') or DEFAULT_API_URL)
+    browser_fetcher = None
+    if fetch_mode == 'browser' or fallback_to_browser:
+        # Browsers start lazily, so an http run with no fallbacks never launches Chrome
+        browser_fetcher = BrowserPageFetcher(BrowserPool(chromedriver_path, size=min(max_browsers, markets)))
+    return http_fetcher, browser_fetcher, host_limiter
+
+def build_line_store(config: dict) -> PropLineStore:
+    """The prop line store configured under scrapers.line_store."""
+    # Bronze layout: <S3_BRONZE_KEY>/<line_store.dataset>/date=YYYY-MM-DD/part-*.parquet
+    line_store_config = config['scrapers'].get('line_store', {})
+    s3 = get_storage_client(config.get('storage'), config.get('s3'))
+    prefix = '/'.join(part for part in (os.getenv('S3_BRONZE_KEY'), line_store_config.get('dataset', 'dk_prop_lines')) if part)
+    return PropLineStore(s3, os.getenv('S3_BUCKET'), prefix, dry_run=config.get('dry_run', False))
+
+def get_fetch_options(config: dict) -> dict:
+    """Fetcher keyword arguments from the scrapers section of config.yml."""
+    return {
+        'max_browsers': config['scrapers'].get('max_browsers', 4), 
+        'host_limits': config['scrapers'].get('host_limits'), 
+        'fetch_mode': config['scrapers'].get('fetch_mode', 'http'), 
+        'http_options': config['scrapers'].get('http'), 
+        'fallback_to_browser': config['scrapers'].get('fallback_to_browser', True), 
+    }
+
 def get_draftkings_player_props(
         urls: List[str], 
         chromedriver_path: str, 
-        sleep_secs_range: list):
-    # Instantiate headless Chrome browser
-    browser = get_selenium_chrome_browser(chromedriver_path)
-    logger.info("Headless Selenium Chrome browser created.")
-
-    dfs = []
-    for url in urls:
-        # Randomize sleep time
-        min_sleep_secs = sleep_secs_range[0]
-        max_sleep_secs = sleep_secs_range[1]
-        sleep_secs = np.random.randint(min_sleep_secs, max_sleep_secs)
-
-        # Connect to the website
-        browser.get(url)
-        logger.info(f"Connected to {url}")
-
-        # Create BeautifulSoup object from html
-        soup = BeautifulSoup(browser.page_source, 'html.parser')
-        logger.info("Scraping data...")
-        
-        # Lists to store extracted data
-        player_names = []
-        over_lines = []
-        over_odds = []
-        under_lines = []
-        under_odds = []
-
-        # Select the main div containing the desired data in the new HTML content
-        main_div = soup.select_one('div[aria-labelledby="game_category_Player Stats"].sportsbook-responsive-card-container__card.selected')
-
-        # Directly extracting all player names, over/under lines, and odds from the new main div
-        all_player_names = main_div.select("a.sportsbook-event-accordion__title")
-        all_game_props_cells = main_div.select("li.game-props-card17__cell.double")
-
-        # Iterating through the new player names and game props cells in pairs
-        for i, player_name_element in enumerate(all_player_names):
-            # Extract player name
-            player_name = player_name_element.text
-            player_names.append(player_name)
-            
-            # Extract "Over" line and odds
-            over_line_element = all_game_props_cells[2*i].select_one("span.sportsbook-outcome-cell__label")
-            over_od_element = all_game_props_cells[2*i].select_one("span.sportsbook-odds.american.default-color")
-            
-            # Extract "Under" line and odds
-            under_line_element = all_game_props_cells[2*i+1].select_one("span.sportsbook-outcome-cell__label")
-            under_od_element = all_game_props_cells[2*i+1].select_one("span.sportsbook-odds.american.default-color")
-            
-            over_lines.append(over_line_element.text if over_line_element else None)
-            over_odds.append(over_od_element.text if over_od_element else None)
-            under_lines.append(under_line_element.text if under_line_element else None)
-            under_odds.append(under_od_element.text if under_od_element else None)
-
-        # Extract the player prop stat name from the url
-        player_prop_stat_name = url.split('=')[-1].replace('-', '_')
-
-        # Create a dataframe from the extracted data
-        df = pd.DataFrame({
-            "player_name": player_names,
-            f"{player_prop_stat_name}_over_line": over_lines,
-            f"{player_prop_stat_name}_over_odds": over_odds,
-            f"{player_prop_stat_name}_under_line": under_lines,
-            f"{player_prop_stat_name}_under_odds": under_odds
-        })
-        df['timestamp'] = datetime.now()
-
+        max_browsers: int = 4, 
+        host_limits: Optional[dict] = None, 
+        fetch_mode: str = 'http', 
+        http_options: Optional[dict] = None, 
+        fallback_to_browser: bool = True) -> pd.DataFrame:
+    """Scrapes every market concurrently and returns one long-format snapshot
+    of PROP_LINE_COLUMNS rows, so one snapshot is collected within
+    seconds rather than one market at a time. fetch_mode 'http' reads each
+    market's api payload over a pooled HTTP session (http_options: pool_size,
+    timeout_secs, base_url, api_url) and only starts headless browsers, up to max_browsers, for markets
+    it cannot read when fallback_to_browser is set; 'browser' renders every
+    page. host_limits (max_concurrent, min_interval_secs) keep the request rate
+    polite per host."""
+    http_fetcher, browser_fetcher, host_limiter = build_fetchers(
+        len(urls), chromedriver_path, max_browsers, host_limits, fetch_mode, http_options, fallback_to_browser)
+
+    start = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(host_limiter.max_concurrent, len(urls)))) as executor:
+            results = list(executor.map(lambda url: scrape_market(http_fetcher, browser_fetcher, host_limiter, url), urls))
+    finally:
+        for fetcher in (http_fetcher, browser_fetcher):
+            if fetcher is not None:
+                fetcher.close()
+    logger.info(f"Scraped {len(urls)} markets in {time.monotonic() - start:.1f}s.")
+
+    frames = []
+    for url, df in zip(urls, results):
         # If no data was scraped, continue
-        if df.empty:
-            logger.info("No data scraped; continuing to next player stat.")
-            logger.info(f"Sleeping for {sleep_secs} seconds...")
-            time.sleep(sleep_secs)
+        if df is None or df.empty:
+            logger.info(f"No data scraped from {url}; continuing to next player stat.")
             continue
-
-        ## Transformations
-        # Set index to player_name for future join
-        df.set_index('player_name', inplace=True)
-        for col in df.columns:
-            # Replace unicode minus with ASCII hyphen-minus
-            if 'odds' in col:
-                logger.info(f"Replacing unicode in {col}...")
-                df[col] = df[col].str.replace('−', '-')
-            # Remove 'Over ' and 'Under ' from line columns
-            if 'line' in col:
-                logger.info(f"Replacing Over/Under strings in {col}...")
-                df[col] = df[col].str.replace('Over ', '')
-                df[col] = df[col].str.replace('Under ', '')
-        logger.info(f"Preview of {player_prop_stat_name} data:")
-        logger.info(df.head())
-        logger.info(df.shape)
-        logger.info(df.columns)
-
-        # Append to list of DataFrames
-        dfs.append(df)
-
-        # Sleep
-        # Refer to website's /robot.txt for appropriate sleep time
-        logger.info(f"Sleeping for {sleep_secs} seconds...")
-        time.sleep(sleep_secs)
-    
-    # Combine the dfs by outer joining on player_name
-    result_df = pd.concat(dfs, axis=1, join='outer')
-
-    logger.info("Preview of result_df:")
-    logger.info(result_df.head())
-    logger.info(result_df.shape)
-    logger.info(result_df.columns)
-
-    # Save .csv
-    result_df.to_csv('dk_player_props.csv')
-    logger.info("Data saved to csv.")
-
-    # Close the browser
-    browser.quit()
-    logger.info("Browser closed.")
+        frames.append(market_frame_to_long(df, get_stat_name(url)))
+    if not frames:
+        logger.info("No player props scraped.")
+        return pd.DataFrame(columns=PROP_LINE_COLUMNS)
+
+    snapshot = pd.concat(frames, ignore_index=True)
+    logger.info(f"Snapshot of {snapshot['player'].nunique()} players across {snapshot['market'].nunique()} markets:")
+    logger.info(snapshot.head())
+    return snapshot
+
+def run_dk_player_props_job(config: dict) -> None:
+    """Scrapes every DraftKings player prop market listed in config.yml and
+    appends the lines that moved to the prop line store."""
+    d = config['scrapers']['urls']['player_props']['draftkings']
+    chromedriver_path = config['scrapers']['chromedriver_location']
+    urls = [url for url in d.values()]
+    snapshot = get_draftkings_player_props(urls, chromedriver_path, **get_fetch_options(config))
+    if snapshot.empty:
+        return
+    build_line_store(config).append(snapshot)
@@ -0,0 +1,175 @@
+# Standard
+import time
+import random
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+# External
+import pandas as pd
+# Internal
+from utils.logger import get_logger
+from scrapers.draftkings.parsing import get_stat_name
+from scrapers.draftkings.player_props import build_fetchers, build_line_store, get_fetch_options, scrape_market
+from scrapers.prop_line_store import PropLineStore, market_frame_to_long
+
+logger = get_logger(__name__)
+
+def next_interval(current_secs: float, moved: bool, min_interval_secs: float, max_interval_secs: float, backoff: float) -> float:
+    """Polling interval after a poll: back to the minimum when the market moved,
+    otherwise stretched by backoff up to the maximum."""
+    if moved:
+        return min_interval_secs
+    return min(max_interval_secs, current_secs * backoff)
+
+class MarketPollState:
+    """Polling state of one market page."""
+
+    def __init__(self, url: str, interval_secs: float, next_poll: float):
+        self.url = url
+        self.market = get_stat_name(url)
+        self.interval_secs = interval_secs
+        self.next_poll = next_poll
+        self.running = False
+        self.polls = 0
+        self.moves = 0
+        self.last_move_at: Optional[float] = None
+
+class PropLinePoller:
+    """Polls each market page on its own adaptive interval and appends the lines
+    that moved to a PropLineStore.
+
+    A market that just moved is polled again after min_interval_secs; each poll
+    that finds nothing new stretches its interval by backoff, up to
+    max_interval_secs. Active markets are watched closely while stable ones cost
+    a request every few minutes, so moves are caught sooner than by a fixed
+    full-scrape timer at the same or lower request volume. The host limits on
+    the fetchers still cap the request rate. HTTP sessions and browsers stay
+    open between polls. A market is never polled while its previous poll is in
+    flight."""
+
+    def __init__(
+            self,
+            urls: List[str],
+            store: PropLineStore,
+            http_fetcher,
+            browser_fetcher,
+            host_limiter,
+            min_interval_secs: float = 20.0,
+            max_interval_secs: float = 300.0,
+            backoff: float = 2.0,
+            jitter: float = 0.1,
+            max_workers: int = 4):
+        if min_interval_secs <= 0 or max_interval_secs < min_interval_secs or backoff < 1:
+            raise ValueError("Poller needs 0 < min_interval_secs <= max_interval_secs and backoff >= 1")
+        self.store = store
+        self.http_fetcher = http_fetcher
+        self.browser_fetcher = browser_fetcher
+        self.host_limiter = host_limiter
+        self.min_interval_secs = min_interval_secs
+        self.max_interval_secs = max_interval_secs
+        self.backoff = backoff
+        self.jitter = jitter
+        self.max_workers = max_workers
+        now = time.monotonic()
+        # Every market is polled once at start, then moves onto its own interval
+        self.markets: Dict[str, MarketPollState] = {
+            url: MarketPollState(url, min_interval_secs, now) for url in urls
+        }
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def due_markets(self, now: float) -> List[MarketPollState]:
+        """Marks the markets due at now as running and returns them."""
+        due = []
+        with self._lock:
+            for state in self.markets.values():
+                if not state.running and state.next_poll <= now:
+                    state.running = True
+                    due.append(state)
+        return due
+
+    def poll(self, state: MarketPollState) -> pd.DataFrame:
+        """Scrapes one market, appends its moved lines to the store and schedules
+        its next poll. Returns the change events (moved lines)."""
+        changes = pd.DataFrame()
+        try:
+            df = scrape_market(self.http_fetcher, self.browser_fetcher, self.host_limiter, state.url)
+            if df is not None and not df.empty:
+                changes = self.store.append(market_frame_to_long(df, state.market))
+        except Exception as e:
+            logger.info(f"Polling {state.market} failed.")
+            logger.exception(e)
+        finally:
+            moved = not changes.empty
+            now = time.monotonic()
+            with self._lock:
+                state.polls += 1
+                # The first poll records every line; only later ones are moves
+                if moved and state.polls > 1:
+                    state.moves += 1
+                    state.last_move_at = now
+                state.interval_secs = next_interval(
+                    state.interval_secs, moved and state.polls > 1,
+                    self.min_interval_secs, self.max_interval_secs, self.backoff)
+                # Jitter keeps markets on the same interval from polling in lockstep
+                state.next_poll = now + state.interval_secs * random.uniform(1 - self.jitter, 1 + self.jitter)
+                state.running = False
+        if moved and state.polls > 1:
+            for change in changes.to_dict('records'):
+                logger.info(
+                    f"Line move: {change['player']} {change['market']} {change['side']} "
+                    f"{change['line']} ({change['odds']}) at {change['observed_at']}")
+        logger.info(f"{state.market}: {len(changes)} changed lines; next poll in {state.interval_secs:.0f}s.")
+        return changes
+
+    def run_forever(self, tick_secs: float = 1.0) -> None:
+        """Blocks, dispatching due polls to the worker pool, until stop() is called.
+        Fetchers are closed once in-flight polls finish."""
+        logger.info(
+            f"Polling {len(self.markets)} markets every {self.min_interval_secs}-{self.max_interval_secs}s "
+            f"with {self.max_workers} workers.")
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='poller') as executor:
+                while not self._stop.is_set():
+                    for state in self.due_markets(time.monotonic()):
+                        executor.submit(self.poll, state)
+                    self._stop.wait(tick_secs)
+                logger.info("Poller stopping; waiting for in-flight polls to finish.")
+        finally:
+            for fetcher in (self.http_fetcher, self.browser_fetcher):
+                if fetcher is not None:
+                    fetcher.close()
+            for state in self.markets.values():
+                logger.info(f"{state.market}: {state.polls} polls, {state.moves} with moves.")
+
+def run_dk_prop_poller_job(config: dict) -> None:
+    """Polls every DraftKings player prop market listed in config.yml until
+    SIGTERM/SIGINT, writing line moves to the prop line store."""
+    urls = list(config['scrapers']['urls']['player_props']['draftkings'].values())
+    poller_config = config['scrapers'].get('poller', {})
+    fetch_options = get_fetch_options(config)
+    http_fetcher, browser_fetcher, host_limiter = build_fetchers(
+        len(urls), config['scrapers']['chromedriver_location'], **fetch_options)
+    poller = PropLinePoller(
+        urls,
+        build_line_store(config),
+        http_fetcher,
+        browser_fetcher,
+        host_limiter,
+        min_interval_secs=poller_config.get('min_interval_secs', 20.0),
+        max_interval_secs=poller_config.get('max_interval_secs', 300.0),
+        backoff=poller_config.get('backoff', 2.0),
+        jitter=poller_config.get('jitter', 0.1),
+        max_workers=host_limiter.max_concurrent)
+
+    def handle_signal(signum, frame):
+        logger.info(f"Received signal {signum}; stopping the poller.")
+        poller.stop()
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    poller.run_forever(tick_secs=poller_config.get('tick_secs', 1.0))
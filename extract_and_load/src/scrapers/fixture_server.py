@@ -0,0 +1,31 @@
+"""Serves saved sportsbook responses so scrapers can run offline from a fixture
+directory routed by its routes.json, or one file on every path.
+
+A DraftKings scrape reads the market page and then one api payload per market,
+so it needs a routed directory: a single saved page (e.g. scripts/dk_response.txt)
+has no api payloads, and its markets fall back to the browser.
+
+Run from extract_and_load/src, then set scrapers.http.base_url to the printed url:
+    python -m scrapers.fixture_server ../tests/fixtures/draftkings --port 8765
+"""
+# Standard
+import argparse
+# Internal
+from utils.logger import get_logger
+from utils.scraper_utils import FixtureServer
+
+logger = get_logger(__name__)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay saved response bodies for GET requests.")
+    parser.add_argument('path', help='File returned for every path, or a directory with a routes.json')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    server = FixtureServer(args.path, args.host, args.port)
+    logger.info(f"Replaying {args.path} on {server.base_url}; Ctrl-C to stop.")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        server.server.server_close()
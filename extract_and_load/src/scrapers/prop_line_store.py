@@ -0,0 +1,130 @@
+# Standard
+import threading
+from datetime import date
+from typing import List, Optional
+# External
+import pandas as pd
+# Internal
+from utils.logger import get_logger
+from utils.s3_utils import read_parquet_from_s3, write_df_to_s3
+
+logger = get_logger(__name__)
+
+PROP_LINE_COLUMNS = ['player', 'market', 'side', 'line', 'odds', 'observed_at']
+KEY_COLUMNS = ['player', 'market', 'side']
+SIDES = ['over', 'under']
+LATEST_NAME = '_latest.parquet'
+
+def market_frame_to_long(df: pd.DataFrame, market: str) -> pd.DataFrame:
+    """Turns one market's wide props frame (indexed by player_name, with
+    <market>_over_line, <market>_over_odds, ... and timestamp columns) into
+    long rows of PROP_LINE_COLUMNS. Lines become floats and American odds
+    nullable integers; timestamp becomes observed_at, in UTC."""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=PROP_LINE_COLUMNS)
+    observed_at = pd.to_datetime(df['timestamp'], utc=True)
+    frames = []
+    for side in SIDES:
+        frames.append(pd.DataFrame({
+            'player': df.index.astype(str),
+            'market': market,
+            'side': side,
+            'line': pd.to_numeric(df[f'{market}_{side}_line'], errors='coerce').astype('float64').to_numpy(),
+            'odds': pd.to_numeric(df[f'{market}_{side}_odds'], errors='coerce').astype('Int64').array,
+            'observed_at': observed_at.to_numpy(),
+        }))
+    long_df = pd.concat(frames, ignore_index=True)
+    long_df['observed_at'] = pd.to_datetime(long_df['observed_at'], utc=True)
+    return long_df[PROP_LINE_COLUMNS]
+
+def changed_rows(snapshot: pd.DataFrame, latest: pd.DataFrame) -> pd.DataFrame:
+    """Rows of snapshot whose (player, market, side) is new or whose line or
+    odds differ from latest. A missing line or odds counts as a value, so a
+    market being pulled and re-posted is recorded."""
+    if latest.empty:
+        return snapshot.reset_index(drop=True)
+    merged = snapshot.merge(latest[KEY_COLUMNS + ['line', 'odds']], on=KEY_COLUMNS, how='left', suffixes=('', '_previous'), indicator=True)
+    is_new = merged['_merge'] == 'left_only'
+    line_changed = ~((merged['line'] == merged['line_previous']) | (merged['line'].isna() & merged['line_previous'].isna()))
+    odds_changed = ~((merged['odds'] == merged['odds_previous']).fillna(False) | (merged['odds'].isna() & merged['odds_previous'].isna()))
+    return merged.loc[is_new | line_changed | odds_changed, PROP_LINE_COLUMNS].reset_index(drop=True)
+
+class PropLineStore:
+    """Append-only history of player prop lines under one S3 prefix.
+
+    Each append writes only the rows whose line or odds moved since the last
+    observation of that (player, market, side), as a new parquet object under
+    <prefix>/date=YYYY-MM-DD/ (UTC date of observed_at). Unchanged snapshots
+    write nothing, so history grows with line movement rather than with the
+    scrape rate. The last observation per key is kept in <prefix>/_latest.parquet
+    so a new process diffs against the previous run. Assumes a single writer."""
+
+    def __init__(self, s3, bucket: str, prefix: str, dry_run: bool = False):
+        self.s3 = s3
+        self.bucket = bucket
+        self.prefix = prefix
+        self.dry_run = dry_run
+        self.latest_key = f"{prefix}/{LATEST_NAME}"
+        self._latest: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+
+    @property
+    def latest(self) -> pd.DataFrame:
+        """The last observed row per (player, market, side)."""
+        if self._latest is None:
+            latest = read_parquet_from_s3(self.s3, self.bucket, self.latest_key)
+            self._latest = latest if latest is not None else pd.DataFrame(columns=PROP_LINE_COLUMNS)
+            logger.info(f"Loaded {len(self._latest)} latest prop lines from S3://{self.bucket}/{self.latest_key}")
+        return self._latest
+
+    def append(self, snapshot: pd.DataFrame) -> pd.DataFrame:
+        """Records the rows of a long-format snapshot that changed and returns them."""
+        with self._lock:
+            snapshot = snapshot[PROP_LINE_COLUMNS].drop_duplicates(KEY_COLUMNS, keep='last')
+            changed = changed_rows(snapshot, self.latest)
+            logger.info(f"{len(changed)} of {len(snapshot)} prop lines changed since the last snapshot.")
+            if changed.empty:
+                return changed
+            for day, day_df in changed.groupby(changed['observed_at'].dt.date):
+                key = f"{self.prefix}/date={day.isoformat()}/part-{day_df['observed_at'].min():%H%M%S%f}.parquet"
+                if self.dry_run:
+                    logger.info(f"Dry run: would write {len(day_df)} prop lines to S3://{self.bucket}/{key}")
+                    continue
+                write_df_to_s3(self.s3, day_df.reset_index(drop=True), 'parquet', self.bucket, key)
+                logger.info(f"Wrote {len(day_df)} prop lines to S3://{self.bucket}/{key}")
+
+            latest = pd.concat([self.latest, changed], ignore_index=True)
+            latest = latest.drop_duplicates(KEY_COLUMNS, keep='last').reset_index(drop=True)
+            if not self.dry_run:
+                write_df_to_s3(self.s3, latest, 'parquet', self.bucket, self.latest_key)
+            self._latest = latest
+            return changed
+
+    def list_keys(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[str]:
+        """History objects for observation dates in [start_date, end_date]."""
+        keys = []
+        paginator = self.s3.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{self.prefix}/date="):
+            for obj in page.get('Contents', []):
+                day = date.fromisoformat(obj['Key'][len(self.prefix) + len('/date='):].split('/', 1)[0])
+                if (start_date is None or day >= start_date) and (end_date is None or day <= end_date):
+                    keys.append(obj['Key'])
+        return sorted(keys)
+
+    def read(
+            self,
+            start_date: Optional[date] = None,
+            end_date: Optional[date] = None,
+            players: Optional[List[str]] = None,
+            markets: Optional[List[str]] = None) -> pd.DataFrame:
+        """Line movement history, oldest first. Only the date partitions in range are read."""
+        frames = [read_parquet_from_s3(self.s3, self.bucket, key) for key in self.list_keys(start_date, end_date)]
+        frames = [frame for frame in frames if frame is not None]
+        if not frames:
+            return pd.DataFrame(columns=PROP_LINE_COLUMNS)
+        history = pd.concat(frames, ignore_index=True)
+        if players is not None:
+            history = history[history['player'].isin(players)]
+        if markets is not None:
+            history = history[history['market'].isin(markets)]
+        return history.sort_values('observed_at', kind='stable').reset_index(drop=True)
@@ -0,0 +1,29 @@
+# Standard
+from typing import Iterator, Optional
+# External
+import pandas as pd
+import pyarrow
+# Internal
+from utils.concurrency_utils import iter_prefetched
+
+def arrow_schema(df: pd.DataFrame) -> pyarrow.Schema:
+    """Arrow schema for a frame, including the pandas metadata used to restore it on read."""
+    return pyarrow.Schema.from_pandas(df)
+
+def frame_to_table(df: pd.DataFrame, schema: Optional[pyarrow.Schema] = None, nthreads: Optional[int] = None) -> pyarrow.Table:
+    """Converts a frame to Arrow once. Numeric columns without nulls are wrapped
+    without copying; other columns are converted on nthreads threads (pyarrow
+    picks a count for large frames when None)."""
+    return pyarrow.Table.from_pandas(df, schema=schema, nthreads=nthreads)
+
+def iter_arrow_tables(
+        df: pd.DataFrame, 
+        schema: pyarrow.Schema, 
+        rows: int, 
+        nthreads: Optional[int] = None) -> Iterator[pyarrow.Table]:
+    """Converts df to Arrow in slices of rows rows, converting the next slice on a
+    background thread while the caller writes the current one. Parquet encoding
+    and compression run in C++ without the GIL, so the two overlap, and only two
+    slices are held in Arrow memory at a time."""
+    slices = (df.iloc[start:start + rows] for start in range(0, len(df), rows))
+    return iter_prefetched(slices, lambda chunk: frame_to_table(chunk, schema, nthreads))
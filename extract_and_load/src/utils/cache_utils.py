@@ -0,0 +1,159 @@
+# Standard
+import os
+import json
+import hashlib
+import threading
+from typing import Callable, List, Optional
+# External
+import pandas as pd
+import requests
+# Internal
+from utils.logger import get_logger
+from utils.time_utils import get_current_nfl_season
+
+logger = get_logger(__name__)
+
+class DownloadCache:
+    """On-disk cache of nfl_data_py fetches. Entries are pickled frames stored
+    under the sha256 of (dataset, seasons, upstream version), so a changed
+    upstream file never collides with a stale entry. Closed seasons use a fixed
+    version and are only ever fetched once; seasons still in progress are keyed
+    by the upstream ETag. Least recently used entries are evicted once the
+    cache grows past max_bytes."""
+
+    def __init__(
+            self,
+            cache_dir: str,
+            max_bytes: int,
+            upstream_urls: Optional[dict] = None,
+            refresh: bool = False,
+            enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.upstream_urls = upstream_urls or {}
+        self.refresh = refresh
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        if enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def upstream_version(self, dataset: str, years: List[int]) -> Optional[str]:
+        """Returns a version string for the requested seasons, or None if it cannot
+        be determined (an open season without a known upstream URL)."""
+        current_season = get_current_nfl_season()
+        open_years = [year for year in years if year >= current_season]
+        # Datasets not split by season (years == []) can change at any time
+        if years and not open_years:
+            return 'final'
+        url_template = self.upstream_urls.get(dataset)
+        if not url_template:
+            return None
+        etags = []
+        for url in sorted({url_template.format(year=year) for year in open_years or [None]}):
+            try:
+                response = requests.head(url, allow_redirects=True, timeout=10)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                logger.info(f"Could not read upstream version of {url}: {e}")
+                return None
+            etag = response.headers.get('ETag') or response.headers.get('Last-Modified')
+            if not etag:
+                return None
+            etags.append(etag)
+        return '|'.join(etags)
+
+    def entry_path(self, dataset: str, years: List[int], version: str, variant: Optional[str] = None) -> str:
+        descriptor = json.dumps(
+            {'dataset': dataset, 'years': sorted(years), 'version': version, 'variant': variant},
+            sort_keys=True)
+        digest = hashlib.sha256(descriptor.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.pkl")
+
+    def fetch(
+            self,
+            dataset: str,
+            years: List[int],
+            fetch_fn: Callable[[], pd.DataFrame],
+            variant: Optional[str] = None) -> pd.DataFrame:
+        """Returns the cached frame for dataset/years if present, otherwise calls
+        fetch_fn and stores its result. variant distinguishes different projections
+        of the same upstream file (e.g. a column subset)."""
+        if not self.enabled:
+            return fetch_fn()
+        years = [int(year) for year in years]
+        version = self.upstream_version(dataset, years)
+        if version is None:
+            logger.info(f"No upstream version for {dataset} {years}; bypassing download cache.")
+            return fetch_fn()
+
+        path = self.entry_path(dataset, years, version, variant)
+        if not self.refresh and os.path.exists(path):
+            try:
+                df = pd.read_pickle(path)
+                # Touch the entry so eviction treats it as recently used
+                os.utime(path)
+                logger.info(f"Download cache hit for {dataset} {years}.")
+                return df
+            except Exception as e:
+                logger.info(f"Discarding unreadable cache entry {path}: {e}")
+
+        df = fetch_fn()
+        if df is not None and not df.empty:
+            self.store(path, df)
+        return df
+
+    def store(self, path: str, df: pd.DataFrame) -> None:
+        """Writes an entry atomically, then evicts down to max_bytes."""
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            df.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.info(f"Error occurred while writing download cache entry: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.pkl'):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total_bytes <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total_bytes -= size
+                    logger.info(f"Evicted download cache entry {path}.")
+                except FileNotFoundError:
+                    pass
+
+# Process-wide cache; disabled until main configures it
+_download_cache = DownloadCache(cache_dir='', max_bytes=0, enabled=False)
+
+def configure_download_cache(cache_config: Optional[dict], refresh: bool = False) -> DownloadCache:
+    """Sets up the process-wide download cache from the cache section of config.yml."""
+    global _download_cache
+    cache_config = cache_config or {}
+    _download_cache = DownloadCache(
+        cache_dir=cache_config.get('dir', '/tmp/nfl_data_cache'),
+        max_bytes=int(cache_config.get('max_size_mb', 2048)) * 1024 * 1024,
+        upstream_urls=cache_config.get('upstream_urls'),
+        refresh=refresh,
+        enabled=cache_config.get('enabled', True),
+    )
+    return _download_cache
+
+def get_download_cache() -> DownloadCache:
+    return _download_cache
@@ -0,0 +1,54 @@
+# Standard
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+# Internal
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+class RateLimiter:
+    """Spaces out calls to an upstream API across threads.
+    Each call to wait() blocks until at least min_interval_secs
+    have passed since the previous caller was let through."""
+
+    def __init__(self, min_interval_secs: float = 0.0):
+        self.min_interval_secs = min_interval_secs
+        self._lock = threading.Lock()
+        self._next_allowed: Optional[float] = None
+
+    def wait(self) -> float:
+        """Blocks until the caller may proceed; returns seconds slept."""
+        with self._lock:
+            now = time.monotonic()
+            if self._next_allowed is None or now >= self._next_allowed:
+                sleep_secs = 0.0
+                start = now
+            else:
+                sleep_secs = self._next_allowed - now
+                start = self._next_allowed
+            self._next_allowed = start + self.min_interval_secs
+        if sleep_secs > 0:
+            time.sleep(sleep_secs)
+        return sleep_secs
+
+def iter_prefetched(items: Iterable[T], fn: Callable[[T], R]) -> Iterator[R]:
+    """Yields fn(item) for each item, computing the next result on a background
+    thread while the caller consumes the current one. Overlaps a conversion step
+    (e.g. DataFrame -> Arrow or CSV text) with a consumer that releases the GIL
+    (compression, network writes). At most two results are held at once."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        iterator = iter(items)
+        try:
+            future = executor.submit(fn, next(iterator))
+        except StopIteration:
+            return
+        for item in iterator:
+            result = future.result()
+            future = executor.submit(fn, item)
+            yield result
+        yield future.result()
@@ -1,3 +1,6 @@
+import hashlib
+from typing import Dict
+import numpy as np
 import pandas as pd
 import pyarrow
 from utils.logger import get_logger
@@ -27,4 +30,123 @@ def ensure_single_dtype(ser: pd.Series) -> pd.Series:
             ser = ser.astype(str)
             logger.info(f"{ser.name} converted to string.")
     
-    return ser
\ No newline at end of file
+    return ser
+
+def hash_df(df: pd.DataFrame) -> str:
+    """Returns a stable content hash of a frame's columns, dtypes and values.
+    The index is ignored, so the same rows hash the same after a reset_index."""
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+class FrameHasher:
+    """Incremental hash_df: feeding the row chunks of a frame in order gives the
+    same digest as hash_df of the whole frame, without holding it in memory."""
+
+    def __init__(self):
+        self._digest = hashlib.sha256()
+        self._dtypes = None
+
+    def update(self, df: pd.DataFrame) -> None:
+        dtypes = repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()])
+        # Chunks whose dtypes drift still hash deterministically, just not like the whole frame
+        if dtypes != self._dtypes:
+            self._digest.update(dtypes.encode('utf-8'))
+            self._dtypes = dtypes
+        self._digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+def hash_schema(df: pd.DataFrame) -> str:
+    """Returns a short hash of a frame's column names and dtypes."""
+    schema = repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()])
+    return hashlib.sha256(schema.encode('utf-8')).hexdigest()[:16]
+
+# Arrow type names used in utils.schemas and the pandas dtype each is cast to
+ARROW_TO_PANDAS_DTYPES = {
+    'string': 'string',
+    'bool': 'boolean',
+    'int8': 'Int8',
+    'int16': 'Int16',
+    'int32': 'Int32',
+    'int64': 'Int64',
+    'float32': 'float32',
+    'float64': 'float64',
+    'timestamp[ns]': 'datetime64[ns]',
+}
+
+# nflverse dates are ISO 8601 ('1998-05-01', or with a time); an explicit format
+# keeps to_datetime on its vectorized parser instead of dateutil per element
+DATETIME_FORMAT = 'ISO8601'
+
+# Text forms of booleans accepted by cast_series, after lower-casing
+BOOLEAN_VALUES = {'true': True, 'false': False, '1': True, '0': False, '1.0': True, '0.0': False}
+
+def cast_series(ser: pd.Series, arrow_type: str) -> pd.Series:
+    """Casts a column to a declared Arrow type with one vectorized conversion.
+    Values that cannot be converted become null and are reported."""
+    dtype = ARROW_TO_PANDAS_DTYPES[arrow_type]
+    if str(ser.dtype) == dtype:
+        return ser
+
+    if dtype == 'string':
+        # IDs read as floats (because of NaN) should render as '15782', not '15782.0'
+        if pd.api.types.is_float_dtype(ser) and (ser.dropna() % 1 == 0).all():
+            ser = ser.astype('Int64')
+        return ser.astype('string')
+
+    nulls_before = ser.isna().sum()
+    if dtype == 'datetime64[ns]':
+        converted = pd.to_datetime(ser, format=DATETIME_FORMAT, errors='coerce').astype(dtype)
+    elif dtype == 'boolean':
+        if pd.api.types.is_bool_dtype(ser):
+            converted = ser.astype(dtype)
+        else:
+            converted = ser.astype('string').str.strip().str.lower().map(BOOLEAN_VALUES).astype(dtype)
+    else:
+        converted = pd.to_numeric(ser, errors='coerce')
+        if dtype.startswith('Int'):
+            # Via float so mixed int/float objects cast; non-integral and
+            # out-of-range values would raise, so they are nulled first
+            converted = converted.astype('float64')
+            bounds = np.iinfo(dtype.lower())
+            converted = converted.where((converted % 1 == 0) & converted.between(bounds.min, bounds.max))
+            converted = converted.astype(dtype)
+        else:
+            converted = converted.astype(dtype)
+    coerced = converted.isna().sum() - nulls_before
+    if coerced > 0:
+        logger.info(f"{ser.name}: {coerced} value(s) could not be cast to {arrow_type} and were set to null.")
+    return converted
+
+def cast_to_schema(df: pd.DataFrame, schema: Dict[str, str], dataset: str) -> pd.DataFrame:
+    """Casts a frame to its declared schema (column -> Arrow type name).
+    Declared columns that are missing are added as nulls; undeclared columns are
+    reported and kept as strings, so the written schema never depends on the data."""
+    missing = [col for col in schema if col not in df.columns]
+    unexpected = [col for col in df.columns if col not in schema]
+    if missing:
+        logger.info(f"{dataset}: declared columns missing from frame: {missing}")
+    if unexpected:
+        logger.info(f"{dataset}: undeclared columns will be stored as strings: {unexpected}")
+
+    columns = {}
+    for col, arrow_type in schema.items():
+        if col in df.columns:
+            columns[col] = cast_series(df[col], arrow_type)
+        else:
+            columns[col] = pd.Series(pd.NA, index=df.index, dtype=ARROW_TO_PANDAS_DTYPES[arrow_type], name=col)
+    for col in unexpected:
+        columns[col] = cast_series(df[col], 'string')
+    return pd.DataFrame(columns, index=df.index)
+
+def normalize_mixed_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Stores object columns holding mixed value types as strings, for datasets
+    without a declared schema. infer_dtype runs in C, unlike a per-cell type() pass."""
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].astype('string')
+            logger.info(f"{col} has mixed types; stored as string.")
+    return df
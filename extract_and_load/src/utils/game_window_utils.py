@@ -0,0 +1,97 @@
+# Standard
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+# External
+import pandas as pd
+# Internal
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# nflverse schedules give gameday/gametime in US Eastern time
+SCHEDULE_TIMEZONE = 'America/New_York'
+DEFAULT_GAMETIME = '13:00'
+
+Window = Tuple[datetime, datetime]
+
+def kickoff_times(schedule: pd.DataFrame) -> List[datetime]:
+    """Kickoff of every game in a schedules frame, in UTC. Games without a
+    gametime yet (flexed or unscheduled) are assumed to kick off at 1pm."""
+    if schedule is None or schedule.empty or 'gameday' not in schedule.columns:
+        return []
+    gametime = schedule['gametime'] if 'gametime' in schedule.columns else pd.Series(None, index=schedule.index)
+    local = pd.to_datetime(
+        schedule['gameday'].astype(str) + ' ' + gametime.fillna(DEFAULT_GAMETIME).astype(str),
+        errors='coerce')
+    local = local.dropna()
+    kickoffs = local.dt.tz_localize(SCHEDULE_TIMEZONE, ambiguous='NaT', nonexistent='shift_forward').dt.tz_convert('UTC')
+    return sorted(kickoff.to_pydatetime() for kickoff in kickoffs.dropna())
+
+def game_windows(kickoffs: List[datetime], lead_mins: float, game_hours: float, settle_hours: float) -> List[Window]:
+    """Turns kickoffs into merged (start, end) windows during which game data can
+    change: from lead_mins before kickoff to settle_hours after the game ends,
+    which covers the upstream publishing the final play-by-play and stats."""
+    windows = []
+    for kickoff in kickoffs:
+        start = kickoff - timedelta(minutes=lead_mins)
+        end = kickoff + timedelta(hours=game_hours + settle_hours)
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+        else:
+            windows.append((start, end))
+    return windows
+
+class GameWindowPlanner:
+    """Decides whether game-driven datasets (pbp, player_weekly, snap_counts) can
+    have changed, from the kickoff times in the current season's schedule.
+    load_schedule returns the schedules frame; it is called again every
+    schedule_refresh_hours so flexed kickoffs are picked up."""
+
+    def __init__(
+            self,
+            load_schedule: Callable[[], pd.DataFrame],
+            lead_mins: float = 15,
+            game_hours: float = 4,
+            settle_hours: float = 6,
+            schedule_refresh_hours: float = 6):
+        self.load_schedule = load_schedule
+        self.lead_mins = lead_mins
+        self.game_hours = game_hours
+        self.settle_hours = settle_hours
+        self.schedule_refresh_hours = schedule_refresh_hours
+        self.windows: List[Window] = []
+        self.loaded_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, now: datetime) -> None:
+        try:
+            schedule = self.load_schedule()
+        except Exception as e:
+            # Keep planning from the last schedule we had rather than stopping all game jobs
+            logger.info(f"Could not reload the schedule; keeping {len(self.windows)} known game windows.")
+            logger.exception(e)
+            if self.loaded_at is None:
+                raise
+            return
+        self.windows = game_windows(kickoff_times(schedule), self.lead_mins, self.game_hours, self.settle_hours)
+        self.loaded_at = now
+        logger.info(f"Loaded {len(self.windows)} game windows; next: {self.next_window(now)}")
+
+    def active_window(self, now: Optional[datetime] = None) -> Optional[Window]:
+        """The game window containing now, or None on an idle stretch."""
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            stale = self.loaded_at is None or now - self.loaded_at >= timedelta(hours=self.schedule_refresh_hours)
+            if stale:
+                self.refresh(now)
+            for start, end in self.windows:
+                if start <= now <= end:
+                    return (start, end)
+        return None
+
+    def next_window(self, now: datetime) -> Optional[Window]:
+        return next(((start, end) for start, end in self.windows if end >= now), None)
+
+    def should_run(self, now: Optional[datetime] = None) -> bool:
+        return self.active_window(now) is not None
@@ -0,0 +1,126 @@
+# Standard
+import threading
+from typing import Optional, Dict
+from datetime import datetime, timezone
+# Internal
+from utils.logger import get_logger
+from utils.s3_utils import read_json_from_s3, write_json_to_s3
+
+logger = get_logger(__name__)
+
+MANIFEST_NAME = '_manifest.json'
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+class Manifest:
+    """Index of the bronze objects under one dataset prefix, stored at
+    <prefix>/_manifest.json. Each entry records size, row count, schema hash,
+    content hash and last-modified time, so jobs can make existence and freshness
+    decisions in memory and downstream jobs can plan from a single object.
+    Watermarks hold per-dataset load state, e.g. the last week loaded per season."""
+
+    def __init__(self, s3, bucket: str, prefix: str, entries: Optional[Dict[str, dict]] = None, watermarks: Optional[Dict[str, dict]] = None):
+        self.s3 = s3
+        self.bucket = bucket
+        self.prefix = prefix
+        self.key = f"{prefix}/{MANIFEST_NAME}"
+        self.entries = entries or {}
+        self.watermarks = watermarks or {}
+        self.updated_at = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, s3, bucket: str, prefix: str) -> 'Manifest':
+        """Reads the manifest for a dataset prefix. If there is none yet, it is
+        bootstrapped from a single listing of the objects already in the bucket."""
+        body = read_json_from_s3(s3, bucket, f"{prefix}/{MANIFEST_NAME}")
+        if body is not None:
+            manifest = cls(s3, bucket, prefix, body.get('entries'), body.get('watermarks'))
+            manifest.updated_at = body.get('updated_at')
+            logger.info(f"Loaded manifest with {len(manifest.entries)} entries from S3://{bucket}/{manifest.key}")
+            return manifest
+
+        manifest = cls(s3, bucket, prefix)
+        paginator = s3.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                key = obj['Key']
+                # Only this dataset's objects: prefix/... or a single file prefix.<ext>
+                if key == manifest.key or not (key.startswith(prefix + '/') or key.startswith(prefix + '.')):
+                    continue
+                manifest.entries[key] = {
+                    'size': obj['Size'],
+                    'rows': None,
+                    'schema_hash': None,
+                    'content_hash': None,
+                    'last_modified': str(obj['LastModified']),
+                }
+        logger.info(f"Bootstrapped manifest with {len(manifest.entries)} entries from S3://{bucket}/{prefix}")
+        return manifest
+
+    def exists(self, key: str) -> bool:
+        with self._lock:
+            return key in self.entries
+
+    def has_prefix(self, prefix: str) -> bool:
+        """True if any object under prefix is in the manifest."""
+        with self._lock:
+            return any(key.startswith(prefix) for key in self.entries)
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            return self.entries.get(key)
+
+    def content_hashes(self, prefix: str) -> Dict[str, str]:
+        """Content hashes of every object under prefix, keyed by S3 key."""
+        with self._lock:
+            return {
+                key: entry['content_hash'] for key, entry in self.entries.items()
+                if key.startswith(prefix) and entry.get('content_hash')
+            }
+
+    def record(
+            self,
+            key: str,
+            size: int,
+            rows: Optional[int] = None,
+            schema_hash: Optional[str] = None,
+            content_hash: Optional[str] = None) -> None:
+        """Adds or replaces the entry for an object that was just written."""
+        with self._lock:
+            self.entries[key] = {
+                'size': size,
+                'rows': rows,
+                'schema_hash': schema_hash,
+                'content_hash': content_hash,
+                'last_modified': utc_now(),
+            }
+
+    def record_partitions(self, partitions: Dict[str, dict], schema_hash: Optional[str] = None) -> None:
+        """Records the partitions written by write_partitioned_df_to_s3; skipped ones keep their entry."""
+        for key, partition in partitions.items():
+            if partition['written']:
+                self.record(key, partition['bytes'], partition['rows'], schema_hash, partition['content_hash'])
+
+    def get_watermark(self, name: str) -> dict:
+        with self._lock:
+            return dict(self.watermarks.get(name, {}))
+
+    def set_watermark(self, name: str, watermark: dict) -> None:
+        with self._lock:
+            self.watermarks[name] = watermark
+
+    def save(self) -> None:
+        """Writes the whole manifest in a single put_object, so readers
+        always see either the previous or the new version."""
+        with self._lock:
+            self.updated_at = utc_now()
+            body = {
+                'prefix': self.prefix,
+                'updated_at': self.updated_at,
+                'entries': self.entries,
+                'watermarks': self.watermarks,
+            }
+        write_json_to_s3(self.s3, body, self.bucket, self.key)
+        logger.info(f"Manifest saved to S3://{self.bucket}/{self.key}")
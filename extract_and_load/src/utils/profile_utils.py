@@ -0,0 +1,92 @@
+# Standard
+import sys
+import json
+import time
+import resource
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+# tracemalloc's peak is process-wide: it is only reset when no phase is being traced
+_traced_phases = 0
+_traced_phases_lock = threading.Lock()
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB (ru_maxrss is KB on Linux)."""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+class JobProfiler:
+    """Collects per-phase wall time, memory, bytes and rows for one job run
+    and emits them as a single JSON line. Phases with the same name (e.g. one
+    fetch per season) are accumulated. detailed turns on tracemalloc and the
+    expensive diagnostics jobs only log under --profile.
+
+    Memory figures are process-wide, not per phase: process_peak_rss_mb is the
+    process's RSS high-water mark when the phase ended, and
+    process_traced_peak_mb the tracemalloc peak since the start of the phase.
+    The traced peak is only reset when no other phase is being traced, so it is
+    the phase's own peak when phases run one at a time; when phases overlap
+    (concurrent seasons or datasets) it covers all of them."""
+
+    def __init__(self, job_name: str, detailed: bool = False):
+        self.job_name = job_name
+        self.detailed = detailed
+        self.phases = {}
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        if detailed and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Times a block. The yielded dict may be given 'bytes' and 'rows' counts."""
+        global _traced_phases
+        counts = {'bytes': 0, 'rows': 0}
+        if self.detailed:
+            with _traced_phases_lock:
+                if _traced_phases == 0 and hasattr(tracemalloc, 'reset_peak'):
+                    tracemalloc.reset_peak()
+                _traced_phases += 1
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            if self.detailed:
+                with _traced_phases_lock:
+                    _traced_phases -= 1
+            wall_secs = time.perf_counter() - start
+            with self._lock:
+                record = self.phases.setdefault(name, {'wall_secs': 0.0, 'calls': 0, 'bytes': 0, 'rows': 0})
+                record['wall_secs'] = round(record['wall_secs'] + wall_secs, 3)
+                record['calls'] += 1
+                record['bytes'] += counts['bytes']
+                record['rows'] += counts['rows']
+                record['process_peak_rss_mb'] = peak_rss_mb()
+                if self.detailed:
+                    traced_peak_mb = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+                    record['process_traced_peak_mb'] = max(record.get('process_traced_peak_mb', 0.0), traced_peak_mb)
+
+    def summary(self, status: str = 'ok') -> dict:
+        with self._lock:
+            return {
+                'job': self.job_name,
+                'status': status,
+                'started_at': self.started_at,
+                'wall_secs': round(time.perf_counter() - self._start, 3),
+                'process_peak_rss_mb': peak_rss_mb(),
+                'phases': {name: dict(record) for name, record in self.phases.items()},
+            }
+
+    def emit(self, status: str = 'ok') -> dict:
+        """Writes the job summary to stdout as one JSON line."""
+        record = self.summary(status)
+        sys.stdout.write(json.dumps(record) + '\n')
+        sys.stdout.flush()
+        return record
+
+def get_profiler(profiler: Optional[JobProfiler], job_name: str) -> JobProfiler:
+    """Returns the profiler passed to a job, or a default one if it was called directly."""
+    return profiler if profiler is not None else JobProfiler(job_name)
@@ -0,0 +1,99 @@
+# Standard
+import time
+import random
+import socket
+import urllib.error
+from typing import Callable, Optional, TypeVar
+# External
+import requests
+# Internal
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar('T')
+
+# HTTP statuses worth another attempt: throttling and server-side failures
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+def is_retryable(e: BaseException) -> bool:
+    """True for transient network and upstream errors. Anything else (a missing
+    season, a bad argument, a parse error) fails the same way on every attempt."""
+    if isinstance(e, urllib.error.HTTPError):
+        return e.code in RETRYABLE_STATUS_CODES
+    if isinstance(e, requests.HTTPError):
+        return e.response is not None and e.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(e, (
+        urllib.error.URLError,
+        requests.ConnectionError,
+        requests.Timeout,
+        ConnectionError,
+        TimeoutError,
+        socket.timeout,
+    ))
+
+class RetryPolicy:
+    """Retries a call on retryable errors with exponential backoff and full jitter:
+    attempt n sleeps a random time in [0, min(max_delay_secs, base_delay_secs * 2**n)].
+    Stops at the first success, after max_attempts, or when the next sleep would
+    run past deadline_secs from the first attempt."""
+
+    def __init__(
+            self,
+            max_attempts: int = 3,
+            base_delay_secs: float = 2.0,
+            max_delay_secs: float = 60.0,
+            deadline_secs: Optional[float] = 600.0,
+            retryable: Callable[[BaseException], bool] = is_retryable):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay_secs = base_delay_secs
+        self.max_delay_secs = max_delay_secs
+        self.deadline_secs = deadline_secs
+        self.retryable = retryable
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to sleep after the given (0-based) failed attempt."""
+        return random.uniform(0, min(self.max_delay_secs, self.base_delay_secs * (2 ** attempt)))
+
+    def call(self, fn: Callable[[], T], description: str, max_attempts: Optional[int] = None) -> T:
+        """Returns fn() from the first successful attempt. Re-raises the last error
+        once it is not retryable or the attempts or deadline are used up."""
+        max_attempts = max(1, int(max_attempts)) if max_attempts is not None else self.max_attempts
+        start = time.monotonic()
+        for attempt in range(max_attempts):
+            try:
+                return fn()
+            except Exception as e:
+                if not self.retryable(e):
+                    logger.info(f"Non-retryable error fetching {description}: {e!r}")
+                    raise
+                if attempt + 1 >= max_attempts:
+                    logger.info(f"Giving up on {description} after {max_attempts} attempts.")
+                    raise
+                sleep_secs = self.backoff(attempt)
+                elapsed = time.monotonic() - start
+                if self.deadline_secs is not None and elapsed + sleep_secs > self.deadline_secs:
+                    logger.info(f"Giving up on {description}: retry deadline of {self.deadline_secs}s reached.")
+                    raise
+                logger.info(
+                    f"Retryable error fetching {description} ({e!r}). "
+                    f"Attempt {attempt + 1}/{max_attempts}; retrying in {sleep_secs:.1f}s.")
+                time.sleep(sleep_secs)
+
+# Process-wide policy; main configures it from jobs.retry in config.yml
+_retry_policy = RetryPolicy()
+
+def configure_retry_policy(retry_config: Optional[dict], max_attempts: int) -> RetryPolicy:
+    """Sets up the process-wide retry policy from the jobs.retry section of config.yml."""
+    global _retry_policy
+    retry_config = retry_config or {}
+    _retry_policy = RetryPolicy(
+        max_attempts=max_attempts,
+        base_delay_secs=float(retry_config.get('base_delay_secs', 2.0)),
+        max_delay_secs=float(retry_config.get('max_delay_secs', 60.0)),
+        deadline_secs=retry_config.get('deadline_secs', 600.0),
+    )
+    return _retry_policy
+
+def get_retry_policy() -> RetryPolicy:
+    return _retry_policy
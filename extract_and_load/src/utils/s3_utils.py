@@ -1,22 +1,308 @@
 # Standard
+import io
+import os
 import json
-from typing import Optional
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Optional, Iterator, List, Dict
+from concurrent.futures import ThreadPoolExecutor
 # External
 import zipfile
 import shutil
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import pandas as pd
-from io import StringIO, BytesIO
+import pyarrow.parquet as pq
 # Internal
 from utils.logger import get_logger
+from utils.data_utils import hash_df
+from utils.arrow_utils import arrow_schema, iter_arrow_tables
+from utils.concurrency_utils import iter_prefetched
 
 logger = get_logger(__name__)
 
+# S3 rejects multipart parts under 5 MiB (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_CHUNK_ROWS = 50000
+HIVE_DEFAULT_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+# User metadata key (x-amz-meta-content-hash) holding hash_df of the frame an object was written from
+CONTENT_HASH_METADATA_KEY = 'content-hash'
+
+# Process-wide client shared by every job; boto3 clients are thread-safe
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+# head_object results keyed by (bucket, key); None records a missing object
+_head_cache = {}
+_head_cache_lock = threading.Lock()
+
+def get_s3_client(client_config: Optional[dict] = None):
+    """Returns the shared boto3 S3 client, creating it on first use with a
+    tuned connection pool, TCP keep-alive and retry configuration."""
+    global _s3_client
+    with _s3_client_lock:
+        if _s3_client is None:
+            client_config = client_config or {}
+            botocore_config = Config(
+                max_pool_connections=client_config.get('max_pool_connections', 32),
+                tcp_keepalive=client_config.get('tcp_keepalive', True),
+                connect_timeout=client_config.get('connect_timeout', 10),
+                read_timeout=client_config.get('read_timeout', 60),
+                retries={
+                    'max_attempts': client_config.get('max_attempts', 5),
+                    'mode': client_config.get('retry_mode', 'adaptive'),
+                },
+            )
+            _s3_client = boto3.client('s3', config=botocore_config)
+            logger.info("Shared S3 client created.")
+        return _s3_client
+
+class ObjectStore(ABC):
+    """Stand-in for the boto3 S3 client, implementing the subset of its API the
+    jobs use (put/get/head, multipart uploads and list_objects_v2 with its
+    paginator) with the same request and response shapes and the same
+    ClientError codes for missing objects. Subclasses decide where bytes live.
+    Lets jobs run and be measured offline; bytes_written and objects_written
+    count what a run would have stored in S3."""
+
+    def __init__(self):
+        self.bytes_written = 0
+        self.objects_written = 0
+        self._uploads = {}
+        self._lock = threading.Lock()
+
+    # Storage primitives
+    @abstractmethod
+    def _read(self, bucket: str, key: str) -> Optional[tuple]:
+        """Returns (body, metadata, last_modified) or None."""
+
+    @abstractmethod
+    def _write(self, bucket: str, key: str, body: bytes, metadata: Dict[str, str]) -> None:
+        """Stores body and its user metadata under key."""
+
+    @abstractmethod
+    def _list(self, bucket: str, prefix: str) -> List[tuple]:
+        """Returns sorted (key, size, last_modified) for keys under prefix."""
+
+    @staticmethod
+    def _not_found(operation: str, code: str = '404') -> ClientError:
+        return ClientError({'Error': {'Code': code, 'Message': 'Not Found'}}, operation)
+
+    def _put(self, bucket: str, key: str, body: bytes, metadata: Optional[Dict[str, str]]) -> dict:
+        self._write(bucket, key, body, dict(metadata or {}))
+        with self._lock:
+            self.bytes_written += len(body)
+            self.objects_written += 1
+        return {'ETag': f'"{hashlib.md5(body).hexdigest()}"'}
+
+    # Client API
+    def put_object(self, Bucket: str, Key: str, Body=b'', Metadata: Optional[Dict[str, str]] = None, **kwargs) -> dict:
+        if isinstance(Body, str):
+            Body = Body.encode('utf-8')
+        return self._put(Bucket, Key, bytes(Body), Metadata)
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        stored = self._read(Bucket, Key)
+        if stored is None:
+            raise self._not_found('GetObject', 'NoSuchKey')
+        body, metadata, last_modified = stored
+        return {'Body': io.BytesIO(body), 'ContentLength': len(body), 'Metadata': metadata, 'LastModified': last_modified}
+
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        stored = self._read(Bucket, Key)
+        if stored is None:
+            raise self._not_found('HeadObject')
+        body, metadata, last_modified = stored
+        return {'ContentLength': len(body), 'Metadata': metadata, 'LastModified': last_modified}
+
+    def create_multipart_upload(self, Bucket: str, Key: str, Metadata: Optional[Dict[str, str]] = None, **kwargs) -> dict:
+        with self._lock:
+            upload_id = f"upload-{len(self._uploads) + 1}-{threading.get_ident()}"
+            self._uploads[upload_id] = {'metadata': dict(Metadata or {}), 'parts': {}}
+        return {'UploadId': upload_id}
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes, **kwargs) -> dict:
+        with self._lock:
+            if UploadId not in self._uploads:
+                raise self._not_found('UploadPart', 'NoSuchUpload')
+            self._uploads[UploadId]['parts'][PartNumber] = bytes(Body)
+        return {'ETag': f'"{hashlib.md5(Body).hexdigest()}"'}
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict, **kwargs) -> dict:
+        with self._lock:
+            upload = self._uploads.pop(UploadId, None)
+        if upload is None:
+            raise self._not_found('CompleteMultipartUpload', 'NoSuchUpload')
+        body = b''.join(upload['parts'][part['PartNumber']] for part in MultipartUpload['Parts'])
+        return self._put(Bucket, Key, body, upload['metadata'])
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str, **kwargs) -> dict:
+        with self._lock:
+            self._uploads.pop(UploadId, None)
+        return {}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = '', MaxKeys: int = 1000, ContinuationToken: Optional[str] = None, **kwargs) -> dict:
+        entries = [entry for entry in self._list(Bucket, Prefix) if ContinuationToken is None or entry[0] > ContinuationToken]
+        page, truncated = entries[:MaxKeys], len(entries) > MaxKeys
+        response = {
+            'Contents': [{'Key': key, 'Size': size, 'LastModified': last_modified} for key, size, last_modified in page],
+            'KeyCount': len(page),
+            'IsTruncated': truncated,
+        }
+        if truncated:
+            response['NextContinuationToken'] = page[-1][0]
+        return response
+
+    def get_paginator(self, operation_name: str) -> 'ObjectStorePaginator':
+        if operation_name != 'list_objects_v2':
+            raise ValueError(f"No paginator for {operation_name}")
+        return ObjectStorePaginator(self)
+
+class ObjectStorePaginator:
+    """list_objects_v2 paginator for an ObjectStore."""
+
+    def __init__(self, store: ObjectStore):
+        self.store = store
+
+    def paginate(self, **kwargs) -> Iterator[dict]:
+        token = None
+        while True:
+            page = self.store.list_objects_v2(**kwargs, ContinuationToken=token)
+            yield page
+            if not page['IsTruncated']:
+                return
+            token = page['NextContinuationToken']
+
+class InMemoryObjectStore(ObjectStore):
+    """ObjectStore that keeps objects in a dict; everything is gone at exit."""
+
+    def __init__(self):
+        super().__init__()
+        self.objects = {}
+
+    def _read(self, bucket: str, key: str) -> Optional[tuple]:
+        with self._lock:
+            return self.objects.get((bucket, key))
+
+    def _write(self, bucket: str, key: str, body: bytes, metadata: Dict[str, str]) -> None:
+        with self._lock:
+            self.objects[(bucket, key)] = (body, metadata, datetime.now(timezone.utc))
+
+    def _list(self, bucket: str, prefix: str) -> List[tuple]:
+        with self._lock:
+            return sorted(
+                (key, len(body), last_modified)
+                for (object_bucket, key), (body, _, last_modified) in self.objects.items()
+                if object_bucket == bucket and key.startswith(prefix))
+
+class LocalObjectStore(ObjectStore):
+    """ObjectStore backed by a directory tree: objects live at <root>/<bucket>/<key>
+    and their user metadata at <root>/_metadata/<bucket>/<key>.json. Writes go
+    through a temporary file and a rename, so readers never see partial objects."""
+
+    METADATA_DIR = '_metadata'
+
+    def __init__(self, root: str):
+        super().__init__()
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, bucket: str, key: str) -> str:
+        return os.path.join(self.root, bucket, *key.split('/'))
+
+    def _metadata_path(self, bucket: str, key: str) -> str:
+        return os.path.join(self.root, self.METADATA_DIR, bucket, *key.split('/')) + '.json'
+
+    def _read(self, bucket: str, key: str) -> Optional[tuple]:
+        path = self._path(bucket, key)
+        try:
+            with open(path, 'rb') as f:
+                body = f.read()
+            last_modified = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+        try:
+            with open(self._metadata_path(bucket, key)) as f:
+                metadata = json.load(f)
+        except FileNotFoundError:
+            metadata = {}
+        return body, metadata, last_modified
+
+    def _write(self, bucket: str, key: str, body: bytes, metadata: Dict[str, str]) -> None:
+        for path, content in ((self._metadata_path(bucket, key), json.dumps(metadata).encode('utf-8')), (self._path(bucket, key), body)):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+    def _list(self, bucket: str, prefix: str) -> List[tuple]:
+        bucket_dir = os.path.join(self.root, bucket)
+        entries = []
+        for dirpath, _, filenames in os.walk(bucket_dir):
+            for filename in filenames:
+                if filename.endswith('.tmp'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                key = os.path.relpath(path, bucket_dir).replace(os.sep, '/')
+                if key.startswith(prefix):
+                    stat = os.stat(path)
+                    entries.append((key, stat.st_size, datetime.fromtimestamp(stat.st_mtime, timezone.utc)))
+        return sorted(entries)
+
+def get_storage_client(storage_config: Optional[dict] = None, client_config: Optional[dict] = None):
+    """Returns the client jobs write through, from the storage section of config.yml:
+    the shared boto3 client for backend 's3', or a LocalObjectStore/InMemoryObjectStore."""
+    storage_config = storage_config or {}
+    backend = storage_config.get('backend', 's3')
+    if backend == 's3':
+        return get_s3_client(client_config)
+    if backend == 'local':
+        store = LocalObjectStore(storage_config.get('root', '/tmp/nfl_bronze'))
+        logger.info(f"Writing to local object store at {store.root}.")
+        return store
+    if backend == 'memory':
+        logger.info("Writing to in-memory object store; nothing will be kept.")
+        return InMemoryObjectStore()
+    raise ValueError("storage backend must be 's3', 'local' or 'memory'")
+
+def head_object_cached(s3, bucket: str, key: str) -> Optional[dict]:
+    """Returns head_object metadata for an S3 object, or None if it does not exist.
+    Results are cached so existence, size and timestamp checks share one round-trip.
+    The cache never expires on its own; see clear_head_cache."""
+    with _head_cache_lock:
+        if (bucket, key) in _head_cache:
+            return _head_cache[(bucket, key)]
+    try:
+        file_info = s3.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') not in ('404', 'NoSuchKey', 'NotFound'):
+            raise
+        file_info = None
+    with _head_cache_lock:
+        _head_cache[(bucket, key)] = file_info
+    return file_info
+
+def invalidate_head_cache(bucket: str, key: str) -> None:
+    """Drops the cached head_object result for an object that was just written."""
+    with _head_cache_lock:
+        _head_cache.pop((bucket, key), None)
+
+def clear_head_cache() -> None:
+    """Drops every cached head_object result, e.g. when switching storage clients
+    or at the start of each scheduled run of a long-lived process."""
+    with _head_cache_lock:
+        _head_cache.clear()
+
 def check_file_exists(s3, bucket: str, key: str) -> bool:
     """Checks if an S3 object exists. Returns true/false."""
     try:
-        s3.head_object(Bucket=bucket, Key=key)
-        return True
+        return head_object_cached(s3, bucket, key) is not None
     except:
         return False
 
@@ -24,7 +310,7 @@ def fetch_file_size(s3, bucket: str, key: str) -> Optional[int]:
     """Reads the file size metadata for an S3 object
     and returns it as an integer (number of bytes)."""
     try:
-        file_info = s3.head_object(Bucket=bucket, Key=key)
+        file_info = head_object_cached(s3, bucket, key)
         return file_info['ContentLength']
     except Exception as e:
         logger.info(f"Error occurred while fetching file size: {e}")
@@ -34,12 +320,24 @@ def fetch_last_update_timestamp(s3, bucket: str, key: str, job_name: str) -> Opt
     """Reads the last updated metadata for an S3 object
     and returns it as a string."""
     try:
-        file_info = s3.head_object(Bucket=bucket, Key=key)
+        file_info = head_object_cached(s3, bucket, key)
         return str(file_info['LastModified'])
     except Exception as e:
         logger.info(f"Error occurred while fetching last update timestamp: {e}")
         return None
 
+def fetch_content_hash(s3, bucket: str, key: str) -> Optional[str]:
+    """Reads the content hash stored in an S3 object's metadata.
+    Returns None if the object does not exist or was written without one."""
+    try:
+        file_info = head_object_cached(s3, bucket, key)
+    except Exception as e:
+        logger.info(f"Error occurred while fetching content hash: {e}")
+        return None
+    if file_info is None:
+        return None
+    return file_info.get('Metadata', {}).get(CONTENT_HASH_METADATA_KEY)
+
 def write_last_update_timestamp(s3, bucket: str, key: str, job_name: str) -> None:
     """Writes a .txt file to S3 with the timestamp
     that another file in that folder was last updated (job_name)."""
@@ -47,42 +345,375 @@ def write_last_update_timestamp(s3, bucket: str, key: str, job_name: str) -> Non
         timestamp = fetch_last_update_timestamp(s3, bucket, key, job_name)
         if timestamp:
             s3.put_object(Body=timestamp, Bucket=bucket, Key=key)
+            invalidate_head_cache(bucket, key)
     except Exception as e:
         logger.info(f"Error occurred while writing last update timestamp: {e}")
 
-def write_df_to_s3(s3, df: pd.DataFrame, file_format: str, bucket: str, key: str) -> None:
-    s3 = boto3.client('s3')
-
-    if file_format == 'csv':
-        csv_buffer = StringIO()
-        df.to_csv(csv_buffer)
-        s3.put_object(Bucket=bucket, Key=key, Body=csv_buffer.getvalue())
-
-    elif file_format == 'json':
-        json_buffer = StringIO()
-        df.to_json(json_buffer, orient='records')
-        s3.put_object(Bucket=bucket, Key=key, Body=json_buffer.getvalue())
-
-    elif file_format == 'parquet':
-        parquet_buffer = BytesIO()
-        df.to_parquet(parquet_buffer, engine='pyarrow')
-        s3.put_object(Bucket=bucket, Key=key, Body=parquet_buffer.getvalue())
-
-    elif file_format == 'zip':
-        str_buffer = BytesIO()
-        df.to_csv(str_buffer, index=False)
-        # Use BytesIO to write zip file to buffer
-        zip_buffer = BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'a', zipfile.ZIP_DEFLATED, False) as zip_file:
-            # The arcname parameter avoids including the full path in the zip file
-            zip_file.writestr(f'{key}.csv', str_buffer.getvalue())
-        
-        # Reset the position of the buffers
-        str_buffer.seek(0)
-        zip_buffer.seek(0)
-
-        # Upload buffer content to S3
-        s3.put_object(Bucket=bucket, Key=key, Body=zip_buffer.getvalue())
-
-    else:
+class MultipartUploadWriter(io.RawIOBase):
+    """Write-only file object that streams bytes into an S3 multipart upload.
+    Bytes are buffered until a part is full, then the part is uploaded on a
+    thread pool while serialization continues. At most max_concurrency parts
+    are in flight, so memory is bounded by part size rather than object size.
+    Objects smaller than one part are sent with a single put_object.
+    metadata is stored as the object's user metadata."""
+
+    def __init__(
+            self, 
+            s3, 
+            bucket: str, 
+            key: str, 
+            part_size: int = DEFAULT_PART_SIZE, 
+            max_concurrency: int = DEFAULT_MAX_CONCURRENCY, 
+            metadata: Optional[Dict[str, str]] = None):
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.metadata = metadata or {}
+        self.bytes_written = 0
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._parts = []
+        self._futures = []
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._in_flight = threading.BoundedSemaphore(max_concurrency)
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.bytes_written
+
+    def write(self, b) -> int:
+        if self.closed:
+            raise ValueError("write to closed MultipartUploadWriter")
+        if isinstance(b, str):
+            b = b.encode('utf-8')
+        self._buffer += b
+        self.bytes_written += len(b)
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[:self.part_size])
+            del self._buffer[:self.part_size]
+            self._submit_part(part)
+        return len(b)
+
+    def _submit_part(self, body: bytes) -> None:
+        if self._upload_id is None:
+            response = self.s3.create_multipart_upload(Bucket=self.bucket, Key=self.key, Metadata=self.metadata)
+            self._upload_id = response['UploadId']
+        part_number = len(self._futures) + 1
+        # Blocks while max_concurrency parts are already uploading
+        self._in_flight.acquire()
+        future = self._executor.submit(self._upload_part, part_number, body)
+        self._futures.append(future)
+
+    def _upload_part(self, part_number: int, body: bytes) -> dict:
+        try:
+            response = self.s3.upload_part(
+                Bucket=self.bucket, 
+                Key=self.key, 
+                UploadId=self._upload_id, 
+                PartNumber=part_number, 
+                Body=body)
+            return {'PartNumber': part_number, 'ETag': response['ETag']}
+        finally:
+            self._in_flight.release()
+
+    def close(self) -> None:
+        """Flushes the final part and completes the upload."""
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self.s3.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer), Metadata=self.metadata)
+            else:
+                if self._buffer:
+                    self._submit_part(bytes(self._buffer))
+                parts = [future.result() for future in self._futures]
+                self.s3.complete_multipart_upload(
+                    Bucket=self.bucket, 
+                    Key=self.key, 
+                    UploadId=self._upload_id, 
+                    MultipartUpload={'Parts': parts})
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._buffer = bytearray()
+            self._executor.shutdown(wait=True)
+            super().close()
+
+    def abort(self) -> None:
+        """Cancels the multipart upload so no partial object or parts are left behind."""
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=True)
+        if self._upload_id is not None:
+            try:
+                self.s3.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+            except Exception as e:
+                logger.info(f"Error occurred while aborting multipart upload: {e}")
+            self._upload_id = None
+        self._buffer = bytearray()
+        if not self.closed:
+            super().close()
+
+def iter_df_chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Yields consecutive row slices of at most chunk_rows rows."""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+class DataFrameStreamWriter:
+    """Serializes a sequence of frames with the same columns into one writable
+    binary file object, as if they were a single frame. Lets callers that produce
+    data piece by piece (e.g. one season at a time) write one object without
+    holding the whole frame. parquet_options may set row_group_size, compression,
+    use_dictionary, write_statistics and threads (Arrow conversion threads) for
+    parquet output; the parquet schema is taken from the first frame."""
+
+    def __init__(
+            self, 
+            sink, 
+            file_format: str, 
+            key: str, 
+            chunk_rows: int = DEFAULT_CHUNK_ROWS, 
+            parquet_options: Optional[dict] = None):
+        if file_format not in ('csv', 'json', 'parquet', 'zip'):
+            raise ValueError("file_format must be 'csv', 'json', 'parquet', or 'zip'")
+        self.sink = sink
+        self.file_format = file_format
+        self.key = key
+        self.chunk_rows = chunk_rows
+        self.parquet_options = parquet_options or {}
+        self.rows = 0
+        self._frames = 0
+        self._parquet_writer = None
+        self._schema = None
+        self._zip_file = None
+        self._zip_entry = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        # Text chunks are encoded one ahead on a background thread while the
+        # previous chunk is written to the sink (compressed, uploaded)
+        chunks = enumerate(iter_df_chunks(df, self.chunk_rows))
+        header = self.rows == 0
+        if self.file_format == 'csv':
+            # Empty frames still get a header if nothing else will
+            if self.rows == 0 and df.empty:
+                return
+            encode = lambda item: item[1].to_csv(header=(header and item[0] == 0)).encode('utf-8')
+            for encoded in iter_prefetched(chunks, encode):
+                self.sink.write(encoded)
+            self.rows += len(df)
+
+        elif self.file_format == 'json':
+            # Stitch record batches into a single JSON array
+            if self._frames == 0:
+                self.sink.write(b'[')
+            encode = lambda item: (len(item[1]), item[1].to_json(orient='records')[1:-1].encode('utf-8'))
+            for chunk_rows, records in iter_prefetched(chunks, encode):
+                if self.rows > 0:
+                    self.sink.write(b',')
+                self.sink.write(records)
+                self.rows += chunk_rows
+
+        elif self.file_format == 'parquet':
+            # One row group per slice, all written against the schema of the first frame.
+            # Each slice is converted to Arrow once, zero-copy where dtypes allow.
+            row_group_size = self.parquet_options.get('row_group_size', self.chunk_rows)
+            if self._parquet_writer is None:
+                self._schema = arrow_schema(df)
+                self._parquet_writer = pq.ParquetWriter(
+                    self.sink, 
+                    self._schema, 
+                    compression=self.parquet_options.get('compression', 'snappy'), 
+                    use_dictionary=self.parquet_options.get('use_dictionary', True), 
+                    write_statistics=self.parquet_options.get('write_statistics', True))
+            for table in iter_arrow_tables(df, self._schema, row_group_size, self.parquet_options.get('threads')):
+                self._parquet_writer.write_table(table, row_group_size=row_group_size)
+                self.rows += table.num_rows
+
+        elif self.file_format == 'zip':
+            # As with csv, an empty first frame leaves the header to close()
+            if self.rows == 0 and df.empty:
+                return
+            if self._zip_file is None:
+                self._zip_file = zipfile.ZipFile(self.sink, 'w', zipfile.ZIP_DEFLATED)
+                # The arcname parameter avoids including the full path in the zip file
+                self._zip_entry = self._zip_file.open(f'{self.key}.csv', 'w', force_zip64=True)
+            encode = lambda item: item[1].to_csv(index=False, header=(header and item[0] == 0)).encode('utf-8')
+            for encoded in iter_prefetched(chunks, encode):
+                # zlib releases the GIL while deflating
+                self._zip_entry.write(encoded)
+            self.rows += len(df)
+        self._frames += 1
+
+    def close(self, empty_df: Optional[pd.DataFrame] = None) -> None:
+        """Finishes the format's trailer. empty_df supplies the columns for the
+        header/schema if no rows were written."""
+        if self.file_format == 'csv':
+            if self.rows == 0 and empty_df is not None:
+                self.sink.write(empty_df.to_csv().encode('utf-8'))
+        elif self.file_format == 'json':
+            if self._frames == 0:
+                self.sink.write(b'[')
+            self.sink.write(b']')
+        elif self.file_format == 'parquet':
+            if self._parquet_writer is None and empty_df is not None:
+                self.write(empty_df)
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+        elif self.file_format == 'zip':
+            if self._zip_file is None:
+                self._zip_file = zipfile.ZipFile(self.sink, 'w', zipfile.ZIP_DEFLATED)
+                if empty_df is not None:
+                    self._zip_file.writestr(f'{self.key}.csv', empty_df.to_csv(index=False))
+            else:
+                self._zip_entry.close()
+            self._zip_file.close()
+
+def write_df_to_stream(
+        df: pd.DataFrame, 
+        file_format: str, 
+        sink, 
+        key: str, 
+        chunk_rows: int = DEFAULT_CHUNK_ROWS, 
+        parquet_options: Optional[dict] = None) -> None:
+    """Serializes df into a writable binary file object chunk by chunk.
+    Output matches the single-shot pandas writers for each format."""
+    writer = DataFrameStreamWriter(sink, file_format, key, chunk_rows, parquet_options)
+    writer.write(df)
+    writer.close(empty_df=df)
+
+def write_df_to_s3(
+        s3, 
+        df: pd.DataFrame, 
+        file_format: str, 
+        bucket: str, 
+        key: str, 
+        part_size: int = DEFAULT_PART_SIZE, 
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY, 
+        chunk_rows: int = DEFAULT_CHUNK_ROWS, 
+        parquet_options: Optional[dict] = None, 
+        content_hash: Optional[str] = None) -> int:
+    """Streams df to S3 in the requested format via a multipart upload.
+    content_hash, if given, is stored in the object metadata so later runs can
+    tell whether the object is already up to date. Returns the number of bytes written."""
+    if file_format not in ('csv', 'json', 'parquet', 'zip'):
         raise ValueError("file_format must be 'csv', 'json', 'parquet', or 'zip'")
+    metadata = {CONTENT_HASH_METADATA_KEY: content_hash} if content_hash else None
+    writer = MultipartUploadWriter(s3, bucket, key, part_size, max_concurrency, metadata)
+    try:
+        write_df_to_stream(df, file_format, writer, key, chunk_rows, parquet_options)
+    except Exception:
+        writer.abort()
+        raise
+    writer.close()
+    invalidate_head_cache(bucket, key)
+    return writer.bytes_written
+
+
+def upload_file_to_s3(
+        s3, 
+        fileobj, 
+        bucket: str, 
+        key: str, 
+        part_size: int = DEFAULT_PART_SIZE, 
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY, 
+        content_hash: Optional[str] = None) -> int:
+    """Uploads a readable binary file object, e.g. a local spool file, from its
+    current position via a multipart upload, reading one part at a time.
+    content_hash is stored in the object metadata as in write_df_to_s3.
+    Returns the number of bytes written."""
+    metadata = {CONTENT_HASH_METADATA_KEY: content_hash} if content_hash else None
+    writer = MultipartUploadWriter(s3, bucket, key, part_size, max_concurrency, metadata)
+    try:
+        shutil.copyfileobj(fileobj, writer, part_size)
+    except Exception:
+        writer.abort()
+        raise
+    writer.close()
+    invalidate_head_cache(bucket, key)
+    return writer.bytes_written
+
+def format_partition_value(value) -> str:
+    """Renders a partition value for a Hive-style key segment."""
+    if pd.isna(value):
+        return HIVE_DEFAULT_PARTITION
+    # Downcast pbp stores some integer columns as floats; keep keys like week=1, not week=1.0
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+def partition_key(key_prefix: str, partition_cols: List[str], values: tuple) -> str:
+    """Builds the key prefix for one partition, e.g. pbp/season=2022/week=1."""
+    segments = [f"{col}={format_partition_value(value)}" for col, value in zip(partition_cols, values)]
+    return '/'.join([key_prefix] + segments)
+
+def check_prefix_exists(s3, bucket: str, prefix: str) -> bool:
+    """Checks if any S3 object exists under a prefix. Returns true/false."""
+    try:
+        response = s3.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=1)
+        return response.get('KeyCount', 0) > 0
+    except Exception as e:
+        logger.info(f"Error occurred while listing prefix: {e}")
+        return False
+
+def write_partitioned_df_to_s3(
+        s3, 
+        df: pd.DataFrame, 
+        bucket: str, 
+        key_prefix: str, 
+        partition_cols: List[str], 
+        parquet_options: Optional[dict] = None, 
+        previous_hashes: Optional[Dict[str, str]] = None) -> Dict[str, dict]:
+    """Writes df as a Hive-partitioned parquet dataset, one object per partition at
+    key_prefix/col=value/.../part-0.parquet. Partition columns live in the key and are
+    dropped from the files, matching what pyarrow.dataset expects when reading back.
+    Partitions whose content hash matches previous_hashes are skipped.
+    Returns a record per key with rows, content_hash, bytes and whether it was written."""
+    previous_hashes = previous_hashes or {}
+    results = {}
+    for values, partition_df in df.groupby(partition_cols, dropna=False, sort=True):
+        if not isinstance(values, tuple):
+            values = (values,)
+        key = partition_key(key_prefix, partition_cols, values) + '/part-0.parquet'
+        partition_df = partition_df.drop(columns=partition_cols).reset_index(drop=True)
+        content_hash = hash_df(partition_df)
+        result = {'rows': len(partition_df), 'content_hash': content_hash, 'bytes': 0, 'written': False}
+        if previous_hashes.get(key) == content_hash:
+            logger.info(f"S3://{bucket}/{key} unchanged; skipping.")
+        else:
+            result['bytes'] = write_df_to_s3(
+                s3, partition_df, 'parquet', bucket, key, parquet_options=parquet_options, content_hash=content_hash)
+            result['written'] = True
+            logger.info(f"Partition uploaded to S3://{bucket}/{key}")
+        results[key] = result
+    return results
+
+def read_json_from_s3(s3, bucket: str, key: str) -> Optional[dict]:
+    """Reads a small JSON object from S3. Returns None if it does not exist."""
+    try:
+        response = s3.get_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') not in ('404', 'NoSuchKey', 'NotFound'):
+            raise
+        return None
+    return json.loads(response['Body'].read())
+
+def read_parquet_from_s3(s3, bucket: str, key: str) -> Optional[pd.DataFrame]:
+    """Reads a parquet object from S3 into a frame. Returns None if it does not exist."""
+    try:
+        response = s3.get_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') not in ('404', 'NoSuchKey', 'NotFound'):
+            raise
+        return None
+    return pd.read_parquet(io.BytesIO(response['Body'].read()))
+
+def write_json_to_s3(s3, obj: dict, bucket: str, key: str) -> None:
+    """Writes a small JSON object to S3 in a single put_object."""
+    s3.put_object(Bucket=bucket, Key=key, Body=json.dumps(obj, indent=2, default=str).encode('utf-8'))
+    invalidate_head_cache(bucket, key)
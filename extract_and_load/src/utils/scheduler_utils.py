@@ -0,0 +1,161 @@
+# Standard
+import threading
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set
+# Internal
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (low, high) bounds of the five cron fields; weekday 7 is Sunday, same as 0
+CRON_FIELDS = [('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7)]
+
+def parse_cron_field(field: str, low: int, high: int) -> Set[int]:
+    """Expands one cron field ('*', '5', '1-5', '*/15', '0,30', '10-40/10') to the set of values it matches."""
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step_str = part.split('/', 1)
+            step = int(step_str)
+            if step < 1:
+                raise ValueError(f"Invalid cron step in '{field}'")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start_str, end_str = part.split('-', 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron field '{field}' out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CronSchedule:
+    """A standard five-field cron expression (minute hour day month weekday),
+    evaluated in UTC. As in cron, when both day and weekday are restricted a
+    time matches if either one does."""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have 5 fields")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            parse_cron_field(field, low, high) for field, (_, low, high) in zip(fields, CRON_FIELDS)
+        ]
+        self.weekdays = {weekday % 7 for weekday in self.weekdays}
+        self.day_restricted = fields[2] != '*'
+        self.weekday_restricted = fields[4] != '*'
+
+    def matches_day(self, dt: datetime) -> bool:
+        day_match = dt.day in self.days
+        # Cron counts weekdays from Sunday = 0; datetime from Monday = 0
+        weekday_match = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def next_after(self, dt: datetime) -> datetime:
+        """Returns the first matching minute strictly after dt."""
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Five years covers every valid expression, including Feb 29 only
+        limit = candidate + timedelta(days=5 * 366)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self.matches_day(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+class ScheduledJob:
+    """One entry in the scheduler: a name, a cron schedule and the callable it runs."""
+
+    def __init__(self, name: str, schedule: CronSchedule, run_fn: Callable[[], None]):
+        self.name = name
+        self.schedule = schedule
+        self.run_fn = run_fn
+        self.next_run: Optional[datetime] = None
+        self.running = False
+        self.last_status: Optional[str] = None
+
+class Scheduler:
+    """Runs jobs on cron schedules in a fixed-size worker pool.
+
+    A job never overlaps itself: if it is still running when it comes due again,
+    that run is skipped, so a slow pbp load holds at most one worker and cannot
+    queue up behind itself and starve the other jobs. Missed runs are coalesced:
+    after a busy or suspended period a job runs once, then resumes from its next
+    scheduled time rather than replaying every run it missed."""
+
+    def __init__(self, max_workers: int = 4, run_on_start: bool = False):
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self.max_workers = max_workers
+        self.run_on_start = run_on_start
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def add(self, name: str, cron: str, run_fn: Callable[[], None]) -> ScheduledJob:
+        job = ScheduledJob(name, CronSchedule(cron), run_fn)
+        self.jobs[name] = job
+        return job
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self, job: ScheduledJob) -> None:
+        status = 'failed'
+        try:
+            job.run_fn()
+            status = 'ok'
+        except Exception as e:
+            logger.info(f"Scheduled job {job.name} failed.")
+            logger.exception(e)
+        finally:
+            with self._lock:
+                job.running = False
+                job.last_status = status
+            logger.info(f"Scheduled job {job.name} finished ({status}); next run at {job.next_run}.")
+
+    def due_jobs(self, now: datetime) -> List[ScheduledJob]:
+        """Marks the jobs due at now as running and returns them, advancing every
+        due job's next run past now whether or not it was started."""
+        due = []
+        with self._lock:
+            for job in self.jobs.values():
+                if job.next_run is None or job.next_run > now:
+                    continue
+                late_secs = (now - job.next_run).total_seconds()
+                if job.running:
+                    logger.info(f"Skipping {job.name} run due at {job.next_run}: previous run still in progress.")
+                else:
+                    if late_secs >= 60:
+                        logger.info(f"Running {job.name} {int(late_secs)}s late; missed runs are coalesced into this one.")
+                    job.running = True
+                    due.append(job)
+                job.next_run = job.schedule.next_after(now)
+        return due
+
+    def run_forever(self, tick_secs: float = 1.0) -> None:
+        """Blocks, dispatching due jobs to the worker pool, until stop() is called.
+        Running jobs are allowed to finish on shutdown."""
+        now = datetime.now(timezone.utc)
+        for job in self.jobs.values():
+            job.next_run = now if self.run_on_start else job.schedule.next_after(now)
+            logger.info(f"Scheduled {job.name} ({job.schedule.expression}); first run at {job.next_run}.")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scheduler') as executor:
+            while not self._stop.is_set():
+                for job in self.due_jobs(datetime.now(timezone.utc)):
+                    executor.submit(self._run, job)
+                self._stop.wait(tick_secs)
+            logger.info("Scheduler stopping; waiting for running jobs to finish.")
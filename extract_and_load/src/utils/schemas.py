@@ -0,0 +1,189 @@
+# Declared column types per bronze dataset, as Arrow type names.
+# Frames are cast to these once with vectorized conversions (see
+# utils.data_utils.cast_to_schema) instead of inferring a type per column
+# at runtime, so every run writes the same parquet schema.
+#
+# Supported types: string, bool, int8, int16, int32, int64, float32,
+# float64, timestamp[ns]. Integer columns are nullable.
+# Standard
+from typing import Dict, Optional
+
+SCHEMAS = {
+    'rosters': {
+        'season': 'int32',
+        'team': 'string',
+        'position': 'string',
+        'depth_chart_position': 'string',
+        'jersey_number': 'int32',
+        'status': 'string',
+        'player_name': 'string',
+        'first_name': 'string',
+        'last_name': 'string',
+        'birth_date': 'timestamp[ns]',
+        'height': 'float64',
+        'weight': 'float64',
+        'college': 'string',
+        'player_id': 'string',
+        'espn_id': 'string',
+        'sportradar_id': 'string',
+        'yahoo_id': 'string',
+        'rotowire_id': 'string',
+        'pff_id': 'string',
+        'pfr_id': 'string',
+        'fantasy_data_id': 'string',
+        'sleeper_id': 'string',
+        'years_exp': 'int32',
+        'headshot_url': 'string',
+        'ngs_position': 'string',
+        'week': 'int32',
+        'game_type': 'string',
+        'status_description_abbr': 'string',
+        'football_name': 'string',
+        'esb_id': 'string',
+        'gsis_it_id': 'string',
+        'smart_id': 'string',
+        'entry_year': 'int32',
+        'rookie_year': 'int32',
+        'draft_club': 'string',
+        'draft_number': 'int32',
+    },
+    'sc_lines': {
+        'season': 'int32',
+        'week': 'int32',
+        'away_team': 'string',
+        'home_team': 'string',
+        'game_id': 'string',
+        'side': 'string',
+        'line': 'float64',
+    },
+    'win_totals': {
+        'season': 'int32',
+        'team': 'string',
+        'line': 'float64',
+        'over_odds': 'int32',
+        'under_odds': 'int32',
+    },
+    'player_seasonal': {
+        'player_id': 'string',
+        'season': 'int32',
+        'season_type': 'string',
+        'player_name': 'string',
+        'player_display_name': 'string',
+        'position': 'string',
+        'position_group': 'string',
+        'headshot_url': 'string',
+        'completions': 'int32',
+        'attempts': 'int32',
+        'passing_yards': 'float64',
+        'passing_tds': 'int32',
+        'interceptions': 'float64',
+        'sacks': 'float64',
+        'sack_yards': 'float64',
+        'sack_fumbles': 'int32',
+        'sack_fumbles_lost': 'int32',
+        'passing_air_yards': 'float64',
+        'passing_yards_after_catch': 'float64',
+        'passing_first_downs': 'float64',
+        'passing_epa': 'float64',
+        'passing_2pt_conversions': 'int32',
+        'pacr': 'float64',
+        'dakota': 'float64',
+        'carries': 'int32',
+        'rushing_yards': 'float64',
+        'rushing_tds': 'int32',
+        'rushing_fumbles': 'float64',
+        'rushing_fumbles_lost': 'float64',
+        'rushing_first_downs': 'float64',
+        'rushing_epa': 'float64',
+        'rushing_2pt_conversions': 'int32',
+        'receptions': 'int32',
+        'targets': 'int32',
+        'receiving_yards': 'float64',
+        'receiving_tds': 'int32',
+        'receiving_fumbles': 'float64',
+        'receiving_fumbles_lost': 'float64',
+        'receiving_air_yards': 'float64',
+        'receiving_yards_after_catch': 'float64',
+        'receiving_first_downs': 'float64',
+        'receiving_epa': 'float64',
+        'receiving_2pt_conversions': 'int32',
+        'racr': 'float64',
+        'target_share': 'float64',
+        'air_yards_share': 'float64',
+        'wopr_x': 'float64',
+        'special_teams_tds': 'float64',
+        'fantasy_points': 'float64',
+        'fantasy_points_ppr': 'float64',
+        'games': 'int32',
+        'tgt_sh': 'float64',
+        'ay_sh': 'float64',
+        'yac_sh': 'float64',
+        'wopr_y': 'float64',
+        'ry_sh': 'float64',
+        'rtd_sh': 'float64',
+        'rfd_sh': 'float64',
+        'rtdfd_sh': 'float64',
+        'dom': 'float64',
+        'w8dom': 'float64',
+        'yptmpa': 'float64',
+        'ppr_sh': 'float64',
+    },
+    'player_weekly': {
+        'player_id': 'string',
+        'player_name': 'string',
+        'player_display_name': 'string',
+        'position': 'string',
+        'position_group': 'string',
+        'headshot_url': 'string',
+        'recent_team': 'string',
+        'season': 'int32',
+        'week': 'int32',
+        'season_type': 'string',
+        'completions': 'int32',
+        'attempts': 'int32',
+        'passing_yards': 'float64',
+        'passing_tds': 'int32',
+        'interceptions': 'float64',
+        'sacks': 'float64',
+        'sack_yards': 'float64',
+        'sack_fumbles': 'int32',
+        'sack_fumbles_lost': 'int32',
+        'passing_air_yards': 'float64',
+        'passing_yards_after_catch': 'float64',
+        'passing_first_downs': 'float64',
+        'passing_epa': 'float64',
+        'passing_2pt_conversions': 'int32',
+        'pacr': 'float64',
+        'dakota': 'float64',
+        'carries': 'int32',
+        'rushing_yards': 'float64',
+        'rushing_tds': 'int32',
+        'rushing_fumbles': 'float64',
+        'rushing_fumbles_lost': 'float64',
+        'rushing_first_downs': 'float64',
+        'rushing_epa': 'float64',
+        'rushing_2pt_conversions': 'int32',
+        'receptions': 'int32',
+        'targets': 'int32',
+        'receiving_yards': 'float64',
+        'receiving_tds': 'int32',
+        'receiving_fumbles': 'float64',
+        'receiving_fumbles_lost': 'float64',
+        'receiving_air_yards': 'float64',
+        'receiving_yards_after_catch': 'float64',
+        'receiving_first_downs': 'float64',
+        'receiving_epa': 'float64',
+        'receiving_2pt_conversions': 'int32',
+        'racr': 'float64',
+        'target_share': 'float64',
+        'air_yards_share': 'float64',
+        'wopr': 'float64',
+        'special_teams_tds': 'float64',
+        'fantasy_points': 'float64',
+        'fantasy_points_ppr': 'float64',
+    },
+}
+
+def get_schema(dataset: str) -> Optional[Dict[str, str]]:
+    """Returns the declared schema for a dataset, or None if it has none."""
+    return SCHEMAS.get(dataset)
@@ -1,10 +1,34 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+# Standard
+import os
+import json
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+# External
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+# Internal
+from utils.logger import get_logger
+from utils.concurrency_utils import RateLimiter
+from utils.retry_utils import get_retry_policy
+
+logger = get_logger(__name__)
+
+# Sportsbooks serve a stripped page to clients that do not look like a browser
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
 
 def get_selenium_chrome_browser(chromedriver_path):
     """Returns a headless Selenium Chromedriver instance."""
+    # Imported here so the http fetch mode does not need selenium installed
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
     # Point to the location of chromedriver.exe if it's not in your PATH
     #driver_path = '/usr/bin/chromedriver'  # Change this to the path where chromedriver is located
     # Selenium 4.10.0 -- GPT does not know how to set up the browser/driver
@@ -16,4 +40,244 @@ def get_selenium_chrome_browser(chromedriver_path):
     chrome_options.add_argument("--window-size=1920x1080")  # optional
     
     return webdriver.Chrome(service=service, options=chrome_options)
-    
\ No newline at end of file
+
+class BrowserPool:
+    """A bounded pool of reusable headless browsers. Browsers are started on
+    demand, up to size, and handed out one caller at a time; a browser whose
+    page load raised is quit and its slot freed, so a waiting caller starts a
+    replacement rather than waiting for a browser that will never come back."""
+
+    def __init__(
+            self, 
+            chromedriver_path: str, 
+            size: int = 4, 
+            create_browser: Callable = get_selenium_chrome_browser):
+        self.chromedriver_path = chromedriver_path
+        self.size = max(1, int(size))
+        self.create_browser = create_browser
+        self._condition = threading.Condition()
+        self._idle: List = []
+        self._browsers: List = []
+        # Browsers running or being started; never more than size
+        self._slots_used = 0
+        self._closed = False
+
+    @contextmanager
+    def browser(self) -> Iterator:
+        """Lends a browser for the duration of the with block."""
+        browser = self._acquire()
+        try:
+            yield browser
+        except Exception:
+            self._discard(browser)
+            raise
+        else:
+            self._release(browser)
+
+    def _acquire(self):
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("BrowserPool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._slots_used < self.size:
+                    # Reserve the slot before the slow browser start
+                    self._slots_used += 1
+                    break
+                self._condition.wait()
+        try:
+            browser = self.create_browser(self.chromedriver_path)
+        except Exception:
+            with self._condition:
+                self._slots_used -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._browsers.append(browser)
+        logger.info(f"Headless browser {len(self._browsers)}/{self.size} started.")
+        return browser
+
+    def _release(self, browser) -> None:
+        with self._condition:
+            if self._closed:
+                close_now = True
+            else:
+                close_now = False
+                self._idle.append(browser)
+                self._condition.notify()
+        if close_now:
+            self._quit(browser)
+
+    def _discard(self, browser) -> None:
+        with self._condition:
+            if browser in self._browsers:
+                self._browsers.remove(browser)
+            self._slots_used -= 1
+            self._condition.notify()
+        self._quit(browser)
+
+    @staticmethod
+    def _quit(browser) -> None:
+        try:
+            browser.quit()
+        except Exception as e:
+            logger.info(f"Could not quit browser: {e!r}")
+
+    def close(self) -> None:
+        """Quits every browser the pool started; browsers still lent out are
+        quit when they are handed back."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for browser in idle:
+            self._quit(browser)
+        logger.info(f"Closed {len(idle)} browsers.")
+
+    def __enter__(self) -> 'BrowserPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class HostRateLimiter:
+    """Politeness limits applied per host: at most max_concurrent requests in
+    flight to a host, and request starts spaced at least min_interval_secs apart.
+    Different hosts do not wait on each other."""
+
+    def __init__(self, max_concurrent: int = 4, min_interval_secs: float = 1.0):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.min_interval_secs = min_interval_secs
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Blocks until a request to url's host may start; holds a concurrency
+        slot for that host until the with block exits."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = RateLimiter(self.min_interval_secs)
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_concurrent)
+            limiter, semaphore = self._limiters[host], self._semaphores[host]
+        with semaphore:
+            limiter.wait()
+            yield
+
+class BrowserPageFetcher:
+    """Fetches rendered page html through a BrowserPool."""
+
+    def __init__(self, pool: BrowserPool):
+        self.pool = pool
+
+    def fetch(self, url: str) -> str:
+        with self.pool.browser() as browser:
+            browser.get(url)
+            return browser.page_source
+
+    def close(self) -> None:
+        self.pool.close()
+
+def get_http_session(pool_size: int = 10, headers: Optional[dict] = None) -> requests.Session:
+    """Returns a requests session that keeps up to pool_size connections per host alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(headers or DEFAULT_HEADERS)
+    return session
+
+class HttpPageFetcher:
+    """Fetches raw (unrendered) page html over a pooled HTTP session, without a
+    browser. base_url, e.g. a FixtureServer's, replaces the scheme and host of
+    every url so scrapes can run against saved responses."""
+
+    def __init__(self, pool_size: int = 10, timeout_secs: float = 15.0, base_url: Optional[str] = None):
+        self.session = get_http_session(pool_size)
+        self.timeout_secs = timeout_secs
+        self.base_url = base_url.rstrip('/') if base_url else None
+
+    def resolve(self, url: str) -> str:
+        if self.base_url is None:
+            return url
+        parts = urlsplit(url)
+        return f"{self.base_url}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else '')
+
+    def fetch(self, url: str) -> str:
+        def get() -> str:
+            response = self.session.get(self.resolve(url), timeout=self.timeout_secs)
+            response.raise_for_status()
+            return response.text
+        return get_retry_policy().call(get, url)
+
+    def close(self) -> None:
+        self.session.close()
+
+def load_fixture_routes(path: str) -> Dict[Optional[str], Tuple[bytes, str]]:
+    """Response bodies and content types by url path for a FixtureServer. A
+    file is served on every path (key None); a directory maps paths to its
+    files through its routes.json, e.g. {"/leagues/football/nfl": "page.html"}."""
+    def load(file_path: str) -> Tuple[bytes, str]:
+        with open(file_path, 'rb') as fixture:
+            body = fixture.read()
+        content_type = 'application/json' if file_path.endswith('.json') else 'text/html; charset=utf-8'
+        return body, content_type
+
+    if not os.path.isdir(path):
+        return {None: load(path)}
+    with open(os.path.join(path, 'routes.json')) as routes_file:
+        routes = json.load(routes_file)
+    return {route: load(os.path.join(path, name)) for route, name in routes.items()}
+
+class FixtureServer:
+    """A local HTTP server that replays saved responses for running scrapers
+    offline: a fixture directory routed by url path (see load_fixture_routes),
+    where unrouted paths get a 404, or one file for every GET. Runs on a
+    background thread between start() and stop(), or as a context manager."""
+
+    def __init__(self, path: str, host: str = '127.0.0.1', port: int = 0):
+        routes = load_fixture_routes(path)
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                route = routes.get(urlsplit(self.path).path, routes.get(None))
+                if route is None:
+                    self.send_error(404)
+                    return
+                body, content_type = route
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Fixture server: {format % args}")
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FixtureServer':
+        self._thread = threading.Thread(target=self.server.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        logger.info(f"Fixture server listening on {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> 'FixtureServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
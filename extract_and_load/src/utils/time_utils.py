@@ -1,10 +1,11 @@
 from datetime import datetime
 
 def get_current_nfl_season() -> int:
+    # A season kicks off in September and ends in February of the next year
     current_year = datetime.now().year
     current_month = datetime.now().month
 
-    if current_month <= 9:
+    if current_month >= 9:
         return current_year
     else:
-        return current_year - 1
\ No newline at end of file
+        return current_year - 1
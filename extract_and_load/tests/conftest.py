@@ -0,0 +1,13 @@
+# Standard
+import sys
+import types
+
+# Job modules import nfl_data_py at load time. Where it is not installed, an
+# empty stand-in module lets them import, as in benchmarks.throughput; tests
+# patch in the functions they call.
+try:
+    import nfl_data_py
+except ImportError:
+    stub = types.ModuleType('nfl_data_py')
+    stub.__doc__ = "Stub nfl_data_py for the unit tests."
+    sys.modules['nfl_data_py'] = stub
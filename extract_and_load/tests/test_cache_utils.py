@@ -0,0 +1,75 @@
+# Standard
+import os
+import time
+# External
+import pandas as pd
+# Internal
+from utils.cache_utils import DownloadCache
+
+# Closed seasons have a fixed upstream version, so no network is needed
+SEASONS = [[2015], [2016], [2017]]
+
+def frame(season: int) -> pd.DataFrame:
+    return pd.DataFrame({'season': [season] * 200, 'value': range(200)})
+
+def counting_fetch(season: int):
+    calls = []
+
+    def fetch() -> pd.DataFrame:
+        calls.append(season)
+        return frame(season)
+    return fetch, calls
+
+def entry_size(tmp_path) -> int:
+    path = tmp_path / 'probe.pkl'
+    frame(2015).to_pickle(path)
+    size = os.path.getsize(path)
+    os.remove(path)
+    return size
+
+def test_hit_skips_the_fetch(tmp_path):
+    cache = DownloadCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    fetch, calls = counting_fetch(2015)
+    first = cache.fetch('pbp', [2015], fetch)
+    second = cache.fetch('pbp', [2015], fetch)
+    assert calls == [2015]
+    pd.testing.assert_frame_equal(first, second)
+
+def test_variants_and_datasets_do_not_collide(tmp_path):
+    cache = DownloadCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    paths = {
+        cache.entry_path('pbp', [2015], 'final'),
+        cache.entry_path('pbp', [2015], 'final', variant='slim'),
+        cache.entry_path('rosters', [2015], 'final'),
+        cache.entry_path('pbp', [2015], 'etag-1'),
+    }
+    assert len(paths) == 4
+
+def test_refresh_refetches(tmp_path):
+    fetch, calls = counting_fetch(2015)
+    DownloadCache(str(tmp_path), max_bytes=10 * 1024 * 1024).fetch('pbp', [2015], fetch)
+    DownloadCache(str(tmp_path), max_bytes=10 * 1024 * 1024, refresh=True).fetch('pbp', [2015], fetch)
+    assert calls == [2015, 2015]
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    # Room for two entries
+    cache = DownloadCache(str(tmp_path), max_bytes=int(entry_size(tmp_path) * 2.5))
+    now = time.time()
+    for age, years in zip([300, 200], SEASONS[:2]):
+        cache.fetch('pbp', years, lambda years=years: frame(years[0]))
+        os.utime(cache.entry_path('pbp', years, 'final'), (now - age, now - age))
+
+    # A hit makes 2015 the most recently used, so 2016 is evicted for 2017
+    cache.fetch('pbp', [2015], lambda: frame(2015))
+    cache.fetch('pbp', [2017], lambda: frame(2017))
+    assert os.path.exists(cache.entry_path('pbp', [2015], 'final'))
+    assert not os.path.exists(cache.entry_path('pbp', [2016], 'final'))
+    assert os.path.exists(cache.entry_path('pbp', [2017], 'final'))
+
+def test_disabled_cache_always_fetches(tmp_path):
+    cache = DownloadCache(str(tmp_path / 'unused'), max_bytes=0, enabled=False)
+    fetch, calls = counting_fetch(2015)
+    cache.fetch('pbp', [2015], fetch)
+    cache.fetch('pbp', [2015], fetch)
+    assert calls == [2015, 2015]
+    assert not os.path.exists(tmp_path / 'unused')
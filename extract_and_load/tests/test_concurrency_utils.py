@@ -0,0 +1,59 @@
+# Standard
+import time
+import threading
+# External
+import pytest
+# Internal
+from utils.concurrency_utils import RateLimiter, iter_prefetched
+
+def test_iter_prefetched_keeps_order():
+    assert list(iter_prefetched(range(10), lambda x: x * x)) == [x * x for x in range(10)]
+
+def test_iter_prefetched_handles_no_items():
+    assert list(iter_prefetched([], lambda x: x)) == []
+
+def test_iter_prefetched_computes_one_item_ahead():
+    started = []
+    lock = threading.Lock()
+
+    def work(x: int) -> int:
+        with lock:
+            started.append(x)
+        return x
+
+    results = iter_prefetched(range(5), work)
+    assert next(results) == 0
+    # Item 1 is being computed while 0 is consumed, but nothing further
+    time.sleep(0.05)
+    assert started == [0, 1]
+    assert list(results) == [1, 2, 3, 4]
+
+def test_iter_prefetched_raises_worker_errors():
+    def work(x: int) -> int:
+        if x == 2:
+            raise ValueError("bad chunk")
+        return x
+
+    results = iter_prefetched(range(5), work)
+    assert [next(results), next(results)] == [0, 1]
+    with pytest.raises(ValueError, match="bad chunk"):
+        next(results)
+
+def test_rate_limiter_spaces_callers_across_threads():
+    limiter = RateLimiter(min_interval_secs=0.05)
+    times = []
+    lock = threading.Lock()
+
+    def call():
+        limiter.wait()
+        with lock:
+            times.append(time.monotonic())
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    times.sort()
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert all(gap >= 0.04 for gap in gaps)
@@ -0,0 +1,80 @@
+# Standard
+import warnings
+# External
+import numpy as np
+import pandas as pd
+# Internal
+from utils.data_utils import FrameHasher, cast_series, cast_to_schema, hash_df, hash_schema
+
+def test_cast_int_nulls_non_integral_and_out_of_range_values(caplog):
+    ser = pd.Series([1, 2.5, '3', 'x', None, 300], name='week')
+    converted = cast_series(ser, 'int8')
+    assert str(converted.dtype) == 'Int8'
+    assert (converted.iloc[0], converted.iloc[2]) == (1, 3)
+    assert converted.isna().tolist() == [False, True, False, True, True, True]
+    assert '3 value(s) could not be cast to int8' in caplog.text
+
+def test_cast_int_keeps_integral_floats():
+    converted = cast_series(pd.Series([1.0, np.nan, 17.0], name='season'), 'int32')
+    assert str(converted.dtype) == 'Int32'
+    assert converted.isna().tolist() == [False, True, False]
+    assert converted.dropna().tolist() == [1, 17]
+
+def test_cast_bool_accepts_text_and_nulls_the_rest(caplog):
+    ser = pd.Series(['True', 'false', ' 1 ', 0, 'maybe', None], name='is_home', dtype=object)
+    converted = cast_series(ser, 'bool')
+    assert str(converted.dtype) == 'boolean'
+    assert converted.iloc[:4].tolist() == [True, False, True, False]
+    assert converted.iloc[4:].isna().all()
+    assert '1 value(s) could not be cast to bool' in caplog.text
+
+def test_cast_bool_from_numpy_bool():
+    converted = cast_series(pd.Series([True, False], name='flag'), 'bool')
+    assert converted.tolist() == [True, False]
+
+def test_cast_string_renders_float_ids_without_decimals():
+    converted = cast_series(pd.Series([15782.0, np.nan], name='gsis_id'), 'string')
+    assert converted.iloc[0] == '15782'
+    assert converted.isna().iloc[1]
+
+def test_cast_datetime_parses_iso_dates_without_inferring_a_format(caplog):
+    ser = pd.Series(['1998-05-01', '2001-12-30T08:15:00', 'unknown', None], name='birth_date')
+    with warnings.catch_warnings():
+        # pandas warns when it falls back to parsing each value with dateutil
+        warnings.simplefilter('error')
+        converted = cast_series(ser, 'timestamp[ns]')
+    assert str(converted.dtype) == 'datetime64[ns]'
+    assert converted.iloc[:2].tolist() == [pd.Timestamp('1998-05-01'), pd.Timestamp('2001-12-30 08:15')]
+    assert converted.iloc[2:].isna().all()
+    assert '1 value(s) could not be cast to timestamp[ns]' in caplog.text
+
+def frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'season': pd.array([2022, 2022, 2023, 2023, 2023], dtype='Int32'),
+        'team': pd.array(['KC', 'DET', 'PHI', None, 'NE'], dtype='string'),
+        'epa': [0.5, -1.25, np.nan, 2.0, 0.0],
+    })
+
+def test_frame_hasher_over_chunks_matches_hash_df():
+    df = frame()
+    hasher = FrameHasher()
+    for start in range(0, len(df), 2):
+        hasher.update(df.iloc[start:start + 2])
+    assert hasher.hexdigest() == hash_df(df)
+
+def test_hash_df_ignores_the_index_but_not_values_or_dtypes():
+    df = frame()
+    assert hash_df(df.set_axis(range(10, 15))) == hash_df(df)
+    changed = df.copy()
+    changed.loc[0, 'epa'] = 0.75
+    assert hash_df(changed) != hash_df(df)
+    assert hash_df(df.astype({'season': 'Int64'})) != hash_df(df)
+    assert hash_schema(df.astype({'season': 'Int64'})) != hash_schema(df)
+
+def test_cast_to_schema_adds_missing_and_keeps_undeclared_columns():
+    raw = pd.DataFrame({'season': ['2023', '2022'], 'book': ['dk', 'fd']})
+    df = cast_to_schema(raw, {'season': 'int32', 'team': 'string'}, 'win_totals')
+    assert list(df.columns) == ['season', 'team', 'book']
+    assert str(df['season'].dtype) == 'Int32'
+    assert df['team'].isna().all() and str(df['team'].dtype) == 'string'
+    assert str(df['book'].dtype) == 'string'
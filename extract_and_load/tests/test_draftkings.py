@@ -0,0 +1,221 @@
+# Standard
+import os
+import json
+from datetime import datetime, timezone
+# External
+import pytest
+import requests
+# Internal
+from utils.scraper_utils import FixtureServer, HostRateLimiter, HttpPageFetcher
+from utils.s3_utils import InMemoryObjectStore
+from scrapers.draftkings.parsing import (
+    HAS_LXML, find_player_stats_card, find_subcategory, parse_initial_state, parse_player_props, parse_subcategory_payload
+)
+from scrapers.draftkings.player_props import DraftKingsHttpFetcher, get_draftkings_player_props, scrape_market
+from scrapers.draftkings.poller import PropLinePoller, next_interval
+from scrapers.prop_line_store import PropLineStore
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'draftkings')
+SAVED_PAGE = os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'dk_response.txt')
+PAGE_URL = 'https://sportsbook.draftkings.com/leagues/football/nfl?category=player-stats&subcategory={}'
+MARKETS = {
+    'receptions': 13405,
+    'rec-yards': 7203,
+    'rec-tds': 13349,
+    'rush-yards': 7204,
+    'rush-tds': 13348,
+    'pass-yards': 7202,
+    'pass-tds': 7201,
+    'qb-ints': 13350,
+}
+SCRAPED_AT = datetime(2023, 9, 7, 12, tzinfo=timezone.utc)
+
+def render_card(players, selected: bool = True, cells_per_player: int = 2) -> str:
+    """A Player Stats card marked up like the rendered page."""
+    rows = []
+    for i, name in enumerate(players):
+        cells = ''.join(
+            '<li class="game-props-card17__cell double"><div class="sportsbook-outcome-cell__body">'
+            f'<span class="sportsbook-outcome-cell__label">{side} {i + 0.5}</span>'
+            f'<div><span class="sportsbook-odds american default-color">{odds}</span></div></div></li>'
+            for side, odds in [('Over', '\u2212110'), ('Under', '+100')][:cells_per_player])
+        rows.append(
+            '<div class="sportsbook-event-accordion__wrapper"><div>'
+            f'<a class="sportsbook-event-accordion__title" href="/event/{i}">{name}</a></div>'
+            f'<ul class="game-props-card17__list">{cells}</ul></div>')
+    state = ' selected' if selected else ''
+    return (
+        '<div aria-labelledby="game_category_Player Stats" '
+        f'class="sportsbook-responsive-card-container__card{state}"><div>{"".join(rows)}</div></div>')
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as fixture:
+        return fixture.read()
+
+@pytest.fixture(scope='module')
+def server():
+    with FixtureServer(FIXTURE_DIR) as fixture_server:
+        yield fixture_server
+
+@pytest.mark.parametrize('market, subcategory_id', MARKETS.items())
+def test_find_subcategory_resolves_every_configured_market(market, subcategory_id):
+    state = parse_initial_state(read_fixture('page.html'))
+    assert find_subcategory(state, PAGE_URL.format(market)) == ('88808', 782, subcategory_id)
+
+def test_find_subcategory_returns_none_for_unlisted_market():
+    state = parse_initial_state(read_fixture('page.html'))
+    assert find_subcategory(state, PAGE_URL.format('kicking-points')) is None
+
+def test_payload_excludes_season_long_futures():
+    df = parse_subcategory_payload(read_fixture('pass_yards.json'), PAGE_URL.format('pass-yards'), 7202, SCRAPED_AT)
+    assert sorted(df.index) == ['Jalen Hurts', 'Jared Goff', 'Mac Jones', 'Patrick Mahomes']
+    assert 'Anthony Richardson' not in df.index
+    assert list(df.columns) == [
+        'pass_yards_over_line', 'pass_yards_over_odds', 'pass_yards_under_line', 'pass_yards_under_odds', 'timestamp']
+    assert (df['pass_yards_over_line'] == df['pass_yards_under_line']).all()
+
+def test_payload_keeps_only_the_requested_subcategory():
+    payload = json.loads(read_fixture('rec_yards.json'))
+    offers = payload['eventGroup']['offerCategories'][0]['offerSubcategoryDescriptors'][0]['offerSubcategory']['offers']
+    offers[0][0]['offerSubcategoryId'] = 7202
+    df = parse_subcategory_payload(json.dumps(payload), PAGE_URL.format('rec-yards'), 7203, SCRAPED_AT)
+    assert len(df) == 4
+    assert offers[0][0]['outcomes'][0]['participant'] not in df.index
+
+def test_fixture_server_routes_by_path(server):
+    assert requests.get(f"{server.base_url}/leagues/football/nfl?category=player-stats").status_code == 200
+    assert requests.get(f"{server.base_url}/not/a/route").status_code == 404
+
+def test_http_scrape_reads_each_market_from_its_own_payload(server):
+    urls = [PAGE_URL.format(market) for market in MARKETS]
+    snapshot = get_draftkings_player_props(
+        urls,
+        '/usr/bin/chromedriver',
+        host_limits={'max_concurrent': 4, 'min_interval_secs': 0},
+        http_options={'base_url': server.base_url},
+        fallback_to_browser=False)
+    assert sorted(snapshot['market'].unique()) == sorted(market.replace('-', '_') for market in MARKETS)
+    assert 'Anthony Richardson' not in set(snapshot['player'])
+    pass_players = set(snapshot.loc[snapshot['market'] == 'pass_yards', 'player'])
+    rec_players = set(snapshot.loc[snapshot['market'] == 'rec_yards', 'player'])
+    assert pass_players == {'Jalen Hurts', 'Jared Goff', 'Mac Jones', 'Patrick Mahomes'}
+    assert 'Amon-Ra St. Brown' in rec_players and not rec_players & pass_players
+
+class PageFetcher:
+    """Stands in for a BrowserPageFetcher, returning one rendered page."""
+
+    def __init__(self, page: str):
+        self.page = page
+        self.urls = []
+
+    def fetch(self, url: str) -> str:
+        self.urls.append(url)
+        return self.page
+
+    def close(self):
+        pass
+
+def test_unparseable_payload_falls_back_to_the_browser():
+    # A saved page on every path: the market resolves, but its api payload is html
+    url = PAGE_URL.format('rec-yards')
+    browser = PageFetcher(render_card(['Amon-Ra St. Brown']))
+    limiter = HostRateLimiter(max_concurrent=1, min_interval_secs=0)
+    with FixtureServer(SAVED_PAGE) as saved:
+        http_fetcher = DraftKingsHttpFetcher(HttpPageFetcher(pool_size=1, base_url=saved.base_url))
+        assert http_fetcher.fetch_market(url, limiter) is None
+        df = scrape_market(http_fetcher, browser, limiter, url)
+    assert browser.urls == [url]
+    assert df.index.tolist() == ['Amon-Ra St. Brown']
+
+def test_unparseable_payload_without_fallback_scrapes_nothing():
+    with FixtureServer(SAVED_PAGE) as saved:
+        snapshot = get_draftkings_player_props(
+            [PAGE_URL.format('rec-yards')],
+            '/usr/bin/chromedriver',
+            host_limits={'min_interval_secs': 0},
+            http_options={'base_url': saved.base_url},
+            fallback_to_browser=False)
+    assert snapshot.empty
+
+PARSERS = [
+    pytest.param(False, id='html.parser'),
+    pytest.param(True, id='lxml', marks=pytest.mark.skipif(not HAS_LXML, reason='lxml not installed')),
+]
+
+@pytest.mark.parametrize('use_lxml', PARSERS)
+def test_card_parser_reads_selected_card_only(use_lxml):
+    page = (
+        '<html><body>' + render_card(['Decoy Player'], selected=False)
+        + render_card(['Amon-Ra St. Brown', 'Travis Kelce']) + '<div>footer</div></body></html>')
+    df = parse_player_props(page, PAGE_URL.format('rec-yards'), SCRAPED_AT, use_lxml=use_lxml)
+    assert df.index.tolist() == ['Amon-Ra St. Brown', 'Travis Kelce']
+    assert df['rec_yards_over_line'].tolist() == ['0.5', '1.5']
+    # Unicode minus signs are normalized
+    assert df['rec_yards_over_odds'].tolist() == ['-110', '-110']
+    assert df['rec_yards_under_odds'].tolist() == ['+100', '+100']
+
+@pytest.mark.parametrize('use_lxml', PARSERS)
+def test_card_parser_keeps_complete_rows_only(use_lxml):
+    card = find_player_stats_card('<html>' + render_card(['Jared Goff', 'Patrick Mahomes'], cells_per_player=1) + '</html>')
+    df = parse_player_props(card, PAGE_URL.format('pass-yards'), SCRAPED_AT, use_lxml=use_lxml)
+    # Two names but only two cells: one complete row
+    assert df.index.tolist() == ['Jared Goff']
+    assert df['pass_yards_under_line'].tolist() == ['1.5']
+
+def test_card_slice_ends_at_the_matching_close_tag():
+    page = '<html>' + render_card(['Jared Goff']) + '<div class="after">not the card</div></html>'
+    card = find_player_stats_card(page)
+    assert card.startswith('<div aria-labelledby') and card.endswith('</div>')
+    assert 'not the card' not in card
+
+def test_page_without_props_parses_to_empty_frame():
+    assert parse_player_props('<html></html>', PAGE_URL.format('pass-yards'), SCRAPED_AT).empty
+    assert find_player_stats_card(render_card(['Jared Goff'], selected=False)) is None
+
+def test_next_interval_backs_off_and_resets():
+    assert next_interval(20, moved=True, min_interval_secs=20, max_interval_secs=300, backoff=2) == 20
+    assert next_interval(20, moved=False, min_interval_secs=20, max_interval_secs=300, backoff=2) == 40
+    assert next_interval(200, moved=False, min_interval_secs=20, max_interval_secs=300, backoff=2) == 300
+
+class ReplayFetcher:
+    """Stands in for DraftKingsHttpFetcher, returning one frame per poll."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def fetch_market(self, url, host_limiter):
+        return self.frames.pop(0)
+
+    def close(self):
+        pass
+
+def test_poller_shortens_interval_on_moves_and_backs_off_otherwise():
+    url = PAGE_URL.format('pass-yards')
+    payload = read_fixture('pass_yards.json')
+    first = parse_subcategory_payload(payload, url, 7202, SCRAPED_AT)
+    moved = first.copy()
+    moved.loc['Jared Goff', 'pass_yards_over_odds'] = '-125'
+    store = PropLineStore(InMemoryObjectStore(), 'bucket', 'bronze/dk_prop_lines')
+    poller = PropLinePoller(
+        [url], store, ReplayFetcher([first, first, moved]), None,
+        HostRateLimiter(max_concurrent=1, min_interval_secs=0),
+        min_interval_secs=20, max_interval_secs=300, backoff=2, jitter=0)
+    state = poller.markets[url]
+
+    # The first poll records every line but is not a move
+    assert len(poller.poll(state)) == 8
+    assert state.moves == 0 and state.interval_secs == 40
+    assert poller.poll(state).empty and state.interval_secs == 80
+    changes = poller.poll(state)
+    assert changes['player'].tolist() == ['Jared Goff']
+    assert state.moves == 1 and state.interval_secs == 20
+    assert not state.running
+
+def test_poller_never_runs_a_market_twice_at_once():
+    url = PAGE_URL.format('pass-yards')
+    poller = PropLinePoller(
+        [url], PropLineStore(InMemoryObjectStore(), 'bucket', 'lines'), ReplayFetcher([]), None,
+        HostRateLimiter(max_concurrent=1, min_interval_secs=0))
+    now = poller.markets[url].next_poll
+    assert len(poller.due_markets(now)) == 1
+    assert poller.due_markets(now + 1000) == []
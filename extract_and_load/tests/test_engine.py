@@ -0,0 +1,130 @@
+# Standard
+import io
+import csv
+from typing import List
+from collections import Counter
+# External
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+# Internal
+from jobs.engine import DatasetSpec, run_spec
+from utils.manifest_utils import MANIFEST_NAME
+from utils.s3_utils import CONTENT_HASH_METADATA_KEY, InMemoryObjectStore
+
+BUCKET = 'bucket'
+PREFIX = 'bronze'
+YEARS = [2019, 2020, 2021, 2022]
+
+class CountingStore(InMemoryObjectStore):
+    """InMemoryObjectStore that counts write calls, including aborted uploads."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = Counter()
+        self.written_keys = []
+
+    def put_object(self, **kwargs) -> dict:
+        self.calls['put_object'] += 1
+        self.written_keys.append(kwargs['Key'])
+        return super().put_object(**kwargs)
+
+    def create_multipart_upload(self, **kwargs) -> dict:
+        self.calls['create_multipart_upload'] += 1
+        self.written_keys.append(kwargs['Key'])
+        return super().create_multipart_upload(**kwargs)
+
+    def upload_part(self, **kwargs) -> dict:
+        self.calls['upload_part'] += 1
+        return super().upload_part(**kwargs)
+
+def fetch_win_totals(years: List[int], extra_from: int = None, extra_until: int = None) -> pd.DataFrame:
+    df = pd.DataFrame([
+        {'season': year, 'team': team, 'line': 8.5 + i, 'over_odds': -110, 'under_odds': -110}
+        for year in years for i, team in enumerate(['ARI', 'ATL', 'BAL'])
+    ])
+    # An upstream column that only exists for some seasons
+    in_range = df['season'].between(extra_from or min(YEARS), extra_until or max(YEARS))
+    if in_range.any():
+        df['book'] = df['season'].astype(str).where(in_range)
+    return df
+
+def run_chunked(fetcher, file_format: str, store=None):
+    store = store or InMemoryObjectStore()
+    spec = DatasetSpec(name='win_totals', description='win totals', fetcher=fetcher, schema='win_totals')
+    result = run_spec(spec, store, BUCKET, PREFIX, YEARS, 1, file_format, job_config={'memory_budget_mb': 1})
+    body = store.get_object(Bucket=BUCKET, Key=f'{PREFIX}/win_totals.{file_format}')['Body'].read()
+    return result, body
+
+@pytest.mark.parametrize('file_format', ['csv', 'parquet'])
+def test_chunked_batches_keep_the_first_batch_columns(file_format):
+    # The first batch is one season without 'book'; later batches have it
+    result, body = run_chunked(lambda years: fetch_win_totals(years, extra_from=2020), file_format)
+    assert result['status'] == 'uploaded' and result['rows'] == 12
+    if file_format == 'csv':
+        rows = list(csv.reader(io.StringIO(body.decode('utf-8'))))
+        assert {len(row) for row in rows} == {len(rows[0])}
+        assert 'book' not in rows[0]
+    else:
+        table = pq.read_table(io.BytesIO(body))
+        assert table.num_rows == 12
+        assert 'book' not in table.column_names
+
+def test_chunked_batches_fill_columns_missing_after_the_first_batch():
+    result, body = run_chunked(lambda years: fetch_win_totals(years, extra_until=2019), 'parquet')
+    df = pq.read_table(io.BytesIO(body)).to_pandas()
+    assert len(df) == 12
+    assert df.loc[df['season'] == 2019, 'book'].notna().all()
+    assert df.loc[df['season'] > 2019, 'book'].isna().all()
+
+@pytest.mark.parametrize('file_format', ['json', 'parquet'])
+def test_chunked_rerun_of_unchanged_object_writes_nothing(file_format):
+    store = CountingStore()
+    first, _ = run_chunked(fetch_win_totals, file_format, store)
+    assert first['status'] == 'uploaded' and first['bytes'] > 0
+    head = store.head_object(Bucket=BUCKET, Key=f'{PREFIX}/win_totals.{file_format}')
+    assert head['Metadata'][CONTENT_HASH_METADATA_KEY]
+
+    store.calls.clear()
+    second, _ = run_chunked(fetch_win_totals, file_format, store)
+    assert second['status'] == 'unchanged' and second['bytes'] == 0
+    assert sum(store.calls.values()) == 0
+
+    changed, _ = run_chunked(lambda years: fetch_win_totals(years).assign(line=9.5), file_format, store)
+    assert changed['status'] == 'uploaded'
+    rewritten = store.head_object(Bucket=BUCKET, Key=f'{PREFIX}/win_totals.{file_format}')
+    assert rewritten['Metadata'][CONTENT_HASH_METADATA_KEY] != head['Metadata'][CONTENT_HASH_METADATA_KEY]
+
+def run_single(store, fetcher, file_format: str = 'parquet') -> dict:
+    spec = DatasetSpec(name='win_totals', description='win totals', fetcher=fetcher, schema='win_totals')
+    return run_spec(spec, store, BUCKET, PREFIX, YEARS, 1, file_format)
+
+def test_rerun_of_unchanged_object_writes_nothing():
+    store = CountingStore()
+    assert run_single(store, fetch_win_totals)['status'] == 'uploaded'
+    store.calls.clear()
+    result = run_single(store, fetch_win_totals)
+    assert result['status'] == 'unchanged' and result['bytes'] == 0
+    assert sum(store.calls.values()) == 0
+
+def test_changed_frame_is_uploaded_again():
+    store = CountingStore()
+    run_single(store, fetch_win_totals)
+    store.written_keys.clear()
+    result = run_single(store, lambda years: fetch_win_totals(years).assign(line=9.5))
+    assert result['status'] == 'uploaded' and result['bytes'] > 0
+    assert f'{PREFIX}/win_totals.parquet' in store.written_keys
+
+def test_bootstrapped_manifest_reads_the_hash_from_object_metadata():
+    store = CountingStore()
+    run_single(store, fetch_win_totals)
+    # A bucket written before manifests existed: the object carries the hash, the manifest is gone
+    del store.objects[(BUCKET, f'{PREFIX}/win_totals/{MANIFEST_NAME}')]
+    store.written_keys.clear()
+    result = run_single(store, fetch_win_totals)
+    assert result['status'] == 'unchanged'
+    # Only the manifest is written, now holding the hash
+    assert store.written_keys == [f'{PREFIX}/win_totals/{MANIFEST_NAME}']
+    store.written_keys.clear()
+    assert run_single(store, fetch_win_totals)['status'] == 'unchanged'
+    assert store.written_keys == []
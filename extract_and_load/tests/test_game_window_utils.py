@@ -0,0 +1,90 @@
+# Standard
+from datetime import datetime, timedelta, timezone
+# External
+import pandas as pd
+import pytest
+# Internal
+from utils.game_window_utils import GameWindowPlanner, game_windows, kickoff_times
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+# Kickoffs in US Eastern time, as nflverse publishes them
+SCHEDULE = pd.DataFrame({
+    'game_id': ['2023_01_DET_KC', '2023_01_LA_SEA', '2023_01_BUF_NYJ', '2023_02_TBD'],
+    'gameday': ['2023-09-07', '2023-09-10', '2023-09-11', '2023-09-17'],
+    'gametime': ['20:20', '16:25', '20:15', None],
+})
+
+def test_kickoff_times_are_utc_with_a_default_gametime():
+    assert kickoff_times(SCHEDULE) == [
+        utc(2023, 9, 8, 0, 20), utc(2023, 9, 10, 20, 25), utc(2023, 9, 12, 0, 15), utc(2023, 9, 17, 17, 0)]
+    assert kickoff_times(pd.DataFrame()) == []
+
+def test_overlapping_windows_merge():
+    kickoffs = [utc(2023, 9, 10, 17), utc(2023, 9, 10, 20, 25), utc(2023, 9, 12, 0, 15)]
+    assert game_windows(kickoffs, lead_mins=15, game_hours=4, settle_hours=6) == [
+        (utc(2023, 9, 10, 16, 45), utc(2023, 9, 11, 6, 25)),
+        (utc(2023, 9, 12, 0, 0), utc(2023, 9, 12, 10, 15)),
+    ]
+    # Without the settle time the Sunday games no longer overlap
+    assert len(game_windows(kickoffs, lead_mins=15, game_hours=3, settle_hours=0)) == 3
+
+@pytest.mark.parametrize('now, should_run', [
+    # Thursday night: lead time, kickoff, and game + settle hours after kickoff
+    (utc(2023, 9, 8, 0, 4), False),
+    (utc(2023, 9, 8, 0, 5), True),
+    (utc(2023, 9, 8, 10, 20), True),
+    (utc(2023, 9, 8, 10, 21), False),
+    # Idle stretch before the late Sunday game
+    (utc(2023, 9, 10, 12), False),
+    (utc(2023, 9, 10, 21), True),
+    # The Sunday window runs into the Monday night window
+    (utc(2023, 9, 11, 6, 25), True),
+    (utc(2023, 9, 11, 23, 59), False),
+    (utc(2023, 9, 12, 10, 15), True),
+    # The game without a gametime is planned for 1pm Eastern
+    (utc(2023, 9, 17, 16, 50), True),
+])
+def test_planner_runs_only_inside_game_windows(now, should_run):
+    planner = GameWindowPlanner(lambda: SCHEDULE, lead_mins=15, game_hours=4, settle_hours=6)
+    assert planner.should_run(now) is should_run
+
+def test_schedule_is_reloaded_every_refresh_interval():
+    loads = []
+    flexed = SCHEDULE.assign(gametime=['20:20', '20:20', '20:15', '13:00'])
+
+    def load_schedule() -> pd.DataFrame:
+        loads.append(1)
+        return SCHEDULE if len(loads) == 1 else flexed
+
+    planner = GameWindowPlanner(load_schedule, lead_mins=15, game_hours=4, settle_hours=6, schedule_refresh_hours=6)
+    start = utc(2023, 9, 10, 12)
+    assert not planner.should_run(start)
+    assert not planner.should_run(start + timedelta(hours=5))
+    assert len(loads) == 1
+    # The late game was flexed to the night slot, 00:20 UTC Monday, so its window
+    # now ends at 10:20 rather than 06:25; the reload picks that up
+    assert planner.should_run(utc(2023, 9, 11, 7))
+    assert len(loads) == 2
+    assert planner.next_window(utc(2023, 9, 11, 7)) == (utc(2023, 9, 11, 0, 5), utc(2023, 9, 11, 10, 20))
+
+def test_failed_reload_keeps_the_known_windows():
+    schedules = [SCHEDULE]
+
+    def load_schedule() -> pd.DataFrame:
+        if not schedules:
+            raise ConnectionError("schedules unavailable")
+        return schedules.pop()
+
+    planner = GameWindowPlanner(load_schedule, schedule_refresh_hours=1)
+    assert planner.should_run(utc(2023, 9, 8, 1))
+    assert planner.should_run(utc(2023, 9, 8, 3))
+    assert planner.loaded_at == utc(2023, 9, 8, 1)
+
+def test_first_load_failure_is_raised():
+    def load_schedule() -> pd.DataFrame:
+        raise ConnectionError("schedules unavailable")
+
+    with pytest.raises(ConnectionError):
+        GameWindowPlanner(load_schedule).should_run(utc(2023, 9, 8, 1))
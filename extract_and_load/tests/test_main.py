@@ -0,0 +1,23 @@
+# External
+import pytest
+# Internal
+from main import JOB_REGISTRY, load_job, load_spec
+from jobs.engine import DatasetSpec
+
+# Jobs with their own pipeline rather than a DatasetSpec
+CUSTOM_JOBS = {'pbp'}
+
+@pytest.mark.parametrize('data', sorted(JOB_REGISTRY))
+def test_registry_entry_imports_its_entry_point(data):
+    module_name, entry_point, kind = JOB_REGISTRY[data]
+    assert kind in ('extract', 'scraper')
+    run_job = load_job(data)
+    assert callable(run_job) and run_job.__name__ == entry_point
+
+@pytest.mark.parametrize('data', sorted(name for name, (_, _, kind) in JOB_REGISTRY.items() if kind == 'extract'))
+def test_engine_jobs_expose_their_spec(data):
+    spec = load_spec(data)
+    if data in CUSTOM_JOBS:
+        assert spec is None
+    else:
+        assert isinstance(spec, DatasetSpec) and spec.name == data
@@ -0,0 +1,53 @@
+# Internal
+from utils.manifest_utils import MANIFEST_NAME, Manifest
+from utils.s3_utils import InMemoryObjectStore
+
+BUCKET = 'bucket'
+PREFIX = 'bronze/pbp'
+
+def test_bootstraps_from_a_listing_of_the_dataset_only():
+    store = InMemoryObjectStore()
+    for key in [f'{PREFIX}/season=2022/part-0.parquet', f'{PREFIX}.csv', 'bronze/pbp_participation/season=2022/part-0.parquet']:
+        store.put_object(Bucket=BUCKET, Key=key, Body=b'rows')
+    manifest = Manifest.load(store, BUCKET, PREFIX)
+    assert sorted(manifest.entries) == [f'{PREFIX}.csv', f'{PREFIX}/season=2022/part-0.parquet']
+    assert manifest.get(f'{PREFIX}.csv')['size'] == 4
+    assert manifest.get(f'{PREFIX}.csv')['content_hash'] is None
+
+def test_save_and_load_round_trip():
+    store = InMemoryObjectStore()
+    manifest = Manifest.load(store, BUCKET, PREFIX)
+    manifest.record(f'{PREFIX}/season=2023/part-0.parquet', 1024, rows=10, schema_hash='s1', content_hash='c1')
+    manifest.set_watermark('pbp', {'2023': 5})
+    manifest.save()
+
+    loaded = Manifest.load(store, BUCKET, PREFIX)
+    assert loaded.get(f'{PREFIX}/season=2023/part-0.parquet')['rows'] == 10
+    assert loaded.get_watermark('pbp') == {'2023': 5}
+    assert loaded.updated_at == manifest.updated_at
+    # The manifest object itself is never an entry
+    assert f'{PREFIX}/{MANIFEST_NAME}' not in loaded.entries
+
+def test_content_hashes_and_prefix_lookups():
+    manifest = Manifest(InMemoryObjectStore(), BUCKET, PREFIX)
+    manifest.record(f'{PREFIX}/season=2022/part-0.parquet', 1, content_hash='a')
+    manifest.record(f'{PREFIX}/season=2023/part-0.parquet', 1, content_hash='b')
+    manifest.record(f'{PREFIX}/season=2023/part-1.parquet', 1)
+    assert manifest.content_hashes(f'{PREFIX}/season=2023/') == {f'{PREFIX}/season=2023/part-0.parquet': 'b'}
+    assert manifest.has_prefix(f'{PREFIX}/season=2022')
+    assert not manifest.has_prefix(f'{PREFIX}/season=2021')
+
+def test_record_partitions_skips_unwritten_partitions():
+    manifest = Manifest(InMemoryObjectStore(), BUCKET, PREFIX)
+    manifest.record_partitions({
+        f'{PREFIX}/season=2022/part-0.parquet': {'written': False, 'bytes': 0, 'rows': 5, 'content_hash': 'a'},
+        f'{PREFIX}/season=2023/part-0.parquet': {'written': True, 'bytes': 64, 'rows': 7, 'content_hash': 'b'},
+    }, schema_hash='s1')
+    assert list(manifest.entries) == [f'{PREFIX}/season=2023/part-0.parquet']
+    assert manifest.get(f'{PREFIX}/season=2023/part-0.parquet')['schema_hash'] == 's1'
+
+def test_watermarks_are_copied():
+    manifest = Manifest(InMemoryObjectStore(), BUCKET, PREFIX)
+    manifest.set_watermark('pbp', {'2023': 5})
+    manifest.get_watermark('pbp')['2023'] = 6
+    assert manifest.get_watermark('pbp') == {'2023': 5}
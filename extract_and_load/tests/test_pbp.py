@@ -0,0 +1,126 @@
+# Standard
+import io
+import time
+import threading
+import types
+# External
+import pandas as pd
+import pytest
+# Internal
+from jobs import pbp
+from utils.manifest_utils import Manifest
+from utils.s3_utils import InMemoryObjectStore
+
+BUCKET = 'bucket'
+PREFIX = 'bronze'
+
+def pbp_frame(season: int, weeks=(1, 2)) -> pd.DataFrame:
+    return pd.DataFrame([
+        {
+            'play_id': play, 'game_id': f'{season}_{week:02d}_KC_DET', 'season': season, 'season_type': 'REG',
+            'week': week, 'posteam': 'KC', 'epa': 0.1 * play, 'yards_gained': play,
+        }
+        for week in weeks for play in range(3)
+    ])
+
+def stub_nfl(failing=(), weeks=(1, 2)):
+    """An nfl_data_py stand-in whose import_pbp_data records each call."""
+    calls = []
+    lock = threading.Lock()
+
+    def import_pbp_data(years, columns=None, **kwargs) -> pd.DataFrame:
+        with lock:
+            calls.append({'years': list(years), 'columns': columns, 'at': time.monotonic()})
+        if years[0] in failing:
+            raise ValueError(f"no pbp file for {years[0]}")
+        df = pd.concat([pbp_frame(year, weeks) for year in years], ignore_index=True)
+        return df[columns] if columns else df
+
+    return types.SimpleNamespace(import_pbp_data=import_pbp_data), calls
+
+@pytest.fixture
+def nfl(monkeypatch):
+    def install(**kwargs):
+        module, calls = stub_nfl(**kwargs)
+        monkeypatch.setattr(pbp, 'nfl', module)
+        return calls
+    return install
+
+def run(store, years, **job_config) -> list:
+    job_config = {'min_fetch_interval_secs': 0, **job_config}
+    return pbp.run_pbp_job(store, BUCKET, PREFIX, years, 1, 'parquet', job_config=job_config)
+
+def test_failed_season_lets_the_others_finish_then_raises(nfl):
+    nfl(failing=(2020,))
+    store = InMemoryObjectStore()
+    with pytest.raises(RuntimeError, match=r"\[2020\]"):
+        run(store, [2019, 2020, 2021], max_workers=3)
+    # The other seasons were written and recorded before the job raised
+    manifest = Manifest.load(store, BUCKET, f'{PREFIX}/pbp')
+    assert sorted(manifest.entries) == [f'{PREFIX}/pbp/pbp_2019.parquet', f'{PREFIX}/pbp/pbp_2021.parquet']
+    assert manifest.updated_at is not None
+
+def test_seasons_run_concurrently_and_report_each_product(nfl):
+    calls = nfl()
+    results = run(InMemoryObjectStore(), [2019, 2020, 2021], max_workers=3)
+    assert sorted(call['years'][0] for call in calls) == [2019, 2020, 2021]
+    assert [(r['season'], r['status']) for r in results] == [(2019, 'uploaded'), (2020, 'uploaded'), (2021, 'uploaded')]
+
+def test_rate_limiter_spaces_fetches_across_workers(nfl):
+    calls = nfl()
+    start = time.monotonic()
+    run(InMemoryObjectStore(), [2018, 2019, 2020, 2021], max_workers=4, min_fetch_interval_secs=0.1)
+    # Four workers start together, but the last fetch may not begin before three intervals
+    assert len(calls) == 4
+    assert max(call['at'] for call in calls) - start >= 0.3
+
+def test_incremental_rerun_without_changes_is_unchanged(nfl, monkeypatch):
+    monkeypatch.setattr(pbp, 'get_current_nfl_season', lambda: 2023)
+    store = InMemoryObjectStore()
+    layout = {'partition_cols': ['season', 'week'], 'incremental': True}
+    nfl(weeks=(1, 2))
+    first = run(store, [2023], **layout)
+    assert [(r['status'], r['partitions_written']) for r in first] == [('uploaded', 2)]
+
+    objects_before = store.objects_written
+    second = run(store, [2023], **layout)
+    assert [(r['status'], r['partitions_written']) for r in second] == [('unchanged', 0)]
+    # Neither partitions nor the manifest were rewritten
+    assert store.objects_written == objects_before
+
+    nfl(weeks=(1, 2, 3))
+    third = run(store, [2023], **layout)
+    assert [(r['status'], r['partitions_written']) for r in third] == [('uploaded', 1)]
+    assert Manifest.load(store, BUCKET, f'{PREFIX}/pbp').has_prefix(f'{PREFIX}/pbp/season=2023/week=3')
+
+def test_products_keep_the_key_columns():
+    products = pbp.get_pbp_products({'column_sets': {'full': 'all', 'modeling': ['posteam', 'week', 'epa']}})
+    assert products == {
+        'pbp': None,
+        'pbp_modeling': pbp.REQUIRED_PBP_COLUMNS + ['posteam', 'epa'],
+    }
+    assert pbp.get_pbp_products({}) == {'pbp': None}
+
+def test_fetch_columns_are_the_union_unless_a_set_is_all():
+    products = pbp.get_pbp_products({'column_sets': {'modeling': ['posteam', 'epa'], 'yards': ['yards_gained', 'posteam']}})
+    assert pbp.get_fetch_columns(products) == pbp.REQUIRED_PBP_COLUMNS + ['posteam', 'epa', 'yards_gained']
+    assert pbp.get_fetch_columns({**products, 'pbp': None}) is None
+
+def test_each_product_is_written_under_its_own_prefix(nfl):
+    calls = nfl()
+    store = InMemoryObjectStore()
+    run(store, [2019], column_sets={'modeling': ['posteam', 'epa'], 'yards': ['yards_gained']})
+    # One projected read covers both products
+    assert calls[0]['columns'] == pbp.REQUIRED_PBP_COLUMNS + ['posteam', 'epa', 'yards_gained']
+    keys = sorted(key for _, key in store.objects if not key.endswith('_manifest.json'))
+    assert keys == [f'{PREFIX}/pbp_modeling/pbp_modeling_2019.parquet', f'{PREFIX}/pbp_yards/pbp_yards_2019.parquet']
+    modeling = pd.read_parquet(io.BytesIO(store.objects[(BUCKET, keys[0])][0]))
+    assert list(modeling.columns) == pbp.REQUIRED_PBP_COLUMNS + ['posteam', 'epa']
+
+def test_full_product_is_written_as_pbp(nfl):
+    calls = nfl()
+    store = InMemoryObjectStore()
+    run(store, [2019], partition_cols=['season'], column_sets={'full': 'all', 'modeling': ['posteam']})
+    assert calls[0]['columns'] is None
+    assert store.list_objects_v2(Bucket=BUCKET, Prefix=f'{PREFIX}/pbp/season=2019/')['KeyCount'] == 1
+    assert store.list_objects_v2(Bucket=BUCKET, Prefix=f'{PREFIX}/pbp_modeling/season=2019/')['KeyCount'] == 1
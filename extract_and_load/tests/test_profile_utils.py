@@ -0,0 +1,62 @@
+# Standard
+import json
+import time
+import tracemalloc
+# External
+import pytest
+# Internal
+from utils.profile_utils import JobProfiler, get_profiler
+
+@pytest.fixture(autouse=True)
+def no_tracing():
+    tracemalloc.stop()
+    yield
+    tracemalloc.stop()
+
+def test_emit_writes_one_json_line_with_phase_totals(capsys):
+    profiler = JobProfiler('pbp')
+    for season_rows in (100, 250):
+        with profiler.phase('fetch') as counts:
+            time.sleep(0.01)
+            counts['rows'] = season_rows
+    with profiler.phase('upload') as counts:
+        counts['bytes'] = 4096
+        counts['rows'] = 350
+
+    record = profiler.emit('uploaded')
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 1 and json.loads(lines[0]) == record
+    assert record['job'] == 'pbp' and record['status'] == 'uploaded'
+    fetch = record['phases']['fetch']
+    assert (fetch['calls'], fetch['rows'], fetch['bytes']) == (2, 350, 0)
+    assert fetch['wall_secs'] >= 0.02
+    assert record['phases']['upload']['bytes'] == 4096
+    assert record['wall_secs'] >= fetch['wall_secs']
+    assert record['process_peak_rss_mb'] > 0
+
+def test_phase_is_recorded_when_the_block_raises():
+    profiler = JobProfiler('rosters')
+    with pytest.raises(ValueError):
+        with profiler.phase('fetch'):
+            raise ValueError("upstream down")
+    assert profiler.summary('failed')['phases']['fetch']['calls'] == 1
+
+def test_tracemalloc_runs_only_when_detailed():
+    profiler = JobProfiler('rosters')
+    with profiler.phase('cast'):
+        pass
+    assert not tracemalloc.is_tracing()
+    assert 'process_traced_peak_mb' not in profiler.phases['cast']
+
+    detailed = JobProfiler('rosters', detailed=True)
+    assert tracemalloc.is_tracing()
+    with detailed.phase('cast'):
+        buffer = bytearray(4 * 1024 * 1024)
+    del buffer
+    assert detailed.phases['cast']['process_traced_peak_mb'] >= 4
+
+def test_get_profiler_defaults_to_a_plain_profiler():
+    profiler = JobProfiler('pbp', detailed=True)
+    assert get_profiler(profiler, 'pbp') is profiler
+    default = get_profiler(None, 'qbr')
+    assert default.job_name == 'qbr' and not default.detailed
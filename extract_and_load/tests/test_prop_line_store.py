@@ -0,0 +1,99 @@
+# Standard
+from datetime import date, datetime, timezone
+# External
+import pandas as pd
+# Internal
+from scrapers.prop_line_store import PROP_LINE_COLUMNS, PropLineStore, changed_rows, market_frame_to_long
+from utils.s3_utils import InMemoryObjectStore
+
+BUCKET = 'bucket'
+PREFIX = 'bronze/dk_prop_lines'
+
+def snapshot(rows, observed_at: datetime) -> pd.DataFrame:
+    """Long rows from (player, market, side, line, odds) tuples."""
+    df = pd.DataFrame(rows, columns=PROP_LINE_COLUMNS[:-1])
+    df['line'] = df['line'].astype('float64')
+    df['odds'] = df['odds'].astype('Int64')
+    df['observed_at'] = pd.Timestamp(observed_at)
+    return df
+
+FIRST = datetime(2023, 9, 7, 23, 50, tzinfo=timezone.utc)
+SECOND = datetime(2023, 9, 8, 0, 10, tzinfo=timezone.utc)
+LINES = [
+    ('Jared Goff', 'pass_yards', 'over', 265.5, -115),
+    ('Jared Goff', 'pass_yards', 'under', 265.5, -105),
+    ('Travis Kelce', 'rec_yards', 'over', 70.5, -110),
+    ('Travis Kelce', 'rec_yards', 'under', 70.5, -110),
+]
+
+def test_market_frame_to_long():
+    wide = pd.DataFrame({
+        'player_name': ['Jared Goff'],
+        'pass_yards_over_line': ['265.5'],
+        'pass_yards_over_odds': ['-115'],
+        'pass_yards_under_line': ['265.5'],
+        'pass_yards_under_odds': [None],
+        'timestamp': [FIRST],
+    }).set_index('player_name')
+    long_df = market_frame_to_long(wide, 'pass_yards')
+    assert list(long_df.columns) == PROP_LINE_COLUMNS
+    assert long_df['side'].tolist() == ['over', 'under']
+    assert long_df['line'].tolist() == [265.5, 265.5]
+    assert long_df['odds'].iloc[0] == -115 and pd.isna(long_df['odds'].iloc[1])
+    assert str(long_df['odds'].dtype) == 'Int64'
+    assert long_df['observed_at'].dt.tz is not None
+
+def test_changed_rows_without_history_keeps_everything():
+    assert len(changed_rows(snapshot(LINES, FIRST), pd.DataFrame(columns=PROP_LINE_COLUMNS))) == 4
+
+def test_changed_rows_keeps_moves_and_new_keys_only():
+    latest = snapshot(LINES, FIRST)
+    rows = [
+        ('Jared Goff', 'pass_yards', 'over', 265.5, -120),
+        ('Jared Goff', 'pass_yards', 'under', 265.5, -105),
+        ('Travis Kelce', 'rec_yards', 'over', 71.5, -110),
+        ('Travis Kelce', 'rec_yards', 'under', 70.5, -110),
+        ('David Montgomery', 'rush_yards', 'over', 60.5, -110),
+    ]
+    changed = changed_rows(snapshot(rows, SECOND), latest)
+    assert list(zip(changed['player'], changed['side'])) == [
+        ('Jared Goff', 'over'), ('Travis Kelce', 'over'), ('David Montgomery', 'over')]
+
+def test_changed_rows_counts_pulled_and_reposted_odds():
+    latest = snapshot(LINES, FIRST)
+    pulled = snapshot(LINES, SECOND)
+    pulled.loc[0, 'odds'] = pd.NA
+    assert changed_rows(pulled, latest)['player'].tolist() == ['Jared Goff']
+    # Still pulled: no change; re-posted: a change
+    assert changed_rows(pulled, pulled).empty
+    assert len(changed_rows(snapshot(LINES, SECOND), pulled)) == 1
+
+def test_store_writes_only_changes_by_observation_date():
+    store = InMemoryObjectStore()
+    lines = PropLineStore(store, BUCKET, PREFIX)
+    assert len(lines.append(snapshot(LINES, FIRST))) == 4
+    assert lines.append(snapshot(LINES, SECOND)).empty
+
+    moved = LINES[:2] + [('Travis Kelce', 'rec_yards', 'over', 71.5, -115)] + LINES[3:]
+    assert len(lines.append(snapshot(moved, SECOND))) == 1
+    assert [key.split('/')[2] for key in lines.list_keys()] == ['date=2023-09-07', 'date=2023-09-08']
+    assert lines.list_keys(start_date=date(2023, 9, 8)) == [lines.list_keys()[1]]
+
+    history = lines.read(players=['Travis Kelce'])
+    assert history['line'].tolist() == [70.5, 70.5, 71.5]
+    assert history['observed_at'].is_monotonic_increasing
+
+def test_new_store_diffs_against_the_saved_latest():
+    store = InMemoryObjectStore()
+    PropLineStore(store, BUCKET, PREFIX).append(snapshot(LINES, FIRST))
+    restarted = PropLineStore(store, BUCKET, PREFIX)
+    assert len(restarted.latest) == 4
+    assert restarted.append(snapshot(LINES, SECOND)).empty
+
+def test_dry_run_writes_nothing():
+    store = InMemoryObjectStore()
+    lines = PropLineStore(store, BUCKET, PREFIX, dry_run=True)
+    assert len(lines.append(snapshot(LINES, FIRST))) == 4
+    assert store.objects == {}
+    # Still diffs against what it would have written
+    assert lines.append(snapshot(LINES, SECOND)).empty
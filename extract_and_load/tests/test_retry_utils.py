@@ -0,0 +1,73 @@
+# External
+import pytest
+import requests
+# Internal
+from utils import retry_utils
+from utils.retry_utils import RetryPolicy, is_retryable
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(retry_utils.time, 'sleep', sleeps.append)
+    return sleeps
+
+def flaky(failures: int, error: Exception):
+    calls = []
+
+    def fn() -> str:
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error
+        return 'ok'
+    return fn, calls
+
+def http_error(status_code: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(response=response)
+
+def test_retries_transient_errors_until_success(no_sleep):
+    fn, calls = flaky(2, ConnectionError("reset"))
+    assert RetryPolicy(max_attempts=3, base_delay_secs=1).call(fn, 'pbp 2023') == 'ok'
+    assert len(calls) == 3
+    assert len(no_sleep) == 2
+
+def test_gives_up_after_max_attempts():
+    fn, calls = flaky(5, TimeoutError("slow"))
+    with pytest.raises(TimeoutError):
+        RetryPolicy(max_attempts=3).call(fn, 'pbp 2023')
+    assert len(calls) == 3
+
+def test_call_max_attempts_overrides_the_policy():
+    fn, calls = flaky(5, TimeoutError("slow"))
+    with pytest.raises(TimeoutError):
+        RetryPolicy(max_attempts=3).call(fn, 'pbp 2023', max_attempts=1)
+    assert len(calls) == 1
+
+def test_non_retryable_errors_fail_at_once():
+    fn, calls = flaky(5, ValueError("no such season"))
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=3).call(fn, 'pbp 1900')
+    assert len(calls) == 1
+
+def test_deadline_stops_retrying():
+    fn, calls = flaky(5, ConnectionError("reset"))
+    policy = RetryPolicy(max_attempts=10, base_delay_secs=100, max_delay_secs=100, deadline_secs=0)
+    policy.backoff = lambda attempt: 1.0
+    with pytest.raises(ConnectionError):
+        policy.call(fn, 'pbp 2023')
+    assert len(calls) == 1
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(base_delay_secs=2, max_delay_secs=5)
+    assert all(0 <= policy.backoff(attempt) <= 5 for attempt in range(10))
+
+@pytest.mark.parametrize('error, expected', [
+    (http_error(503), True),
+    (http_error(429), True),
+    (http_error(404), False),
+    (requests.ConnectionError(), True),
+    (KeyError('season'), False),
+])
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
@@ -0,0 +1,134 @@
+# Standard
+import io
+import json
+import zipfile
+# External
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+# Internal
+from utils.s3_utils import (
+    MIN_PART_SIZE, DataFrameStreamWriter, InMemoryObjectStore, LocalObjectStore, MultipartUploadWriter,
+    clear_head_cache, head_object_cached, read_parquet_from_s3, upload_file_to_s3, write_df_to_s3, write_partitioned_df_to_s3)
+
+BUCKET = 'bucket'
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    return pd.DataFrame({
+        'season': pd.array([2022] * 5 + [2023] * 5, dtype='Int32'),
+        'week': pd.array([1, 2, 3, None, 5] * 2, dtype='Int8'),
+        'team': pd.array(['KC', 'DET', None, 'PHI', 'NE'] * 2, dtype='string'),
+        'epa': [0.5, -1.25, None, 2.0, 0.0] * 2,
+    })
+
+def stream(frames, file_format: str, chunk_rows: int = 2) -> bytes:
+    sink = io.BytesIO()
+    writer = DataFrameStreamWriter(sink, file_format, 'bronze/pbp', chunk_rows=chunk_rows)
+    for frame in frames:
+        writer.write(frame)
+    writer.close(empty_df=frames[0])
+    return sink.getvalue()
+
+def batches(df: pd.DataFrame):
+    return [df.iloc[:3], df.iloc[3:4], df.iloc[4:]]
+
+def test_stream_csv_matches_one_shot(df):
+    assert stream(batches(df), 'csv') == df.to_csv().encode('utf-8')
+
+def test_stream_json_is_one_array(df):
+    assert json.loads(stream(batches(df), 'json')) == json.loads(df.to_json(orient='records'))
+
+def test_stream_zip_holds_one_csv(df):
+    with zipfile.ZipFile(io.BytesIO(stream(batches(df), 'zip'))) as archive:
+        assert archive.namelist() == ['bronze/pbp.csv']
+        assert archive.read('bronze/pbp.csv') == df.to_csv(index=False).encode('utf-8')
+
+def test_stream_parquet_round_trips_dtypes(df):
+    body = stream(batches(df), 'parquet')
+    parquet = pq.ParquetFile(io.BytesIO(body))
+    # One row group per chunk of each batch: 2 + 1, 1 and 2 + 2 + 2 rows
+    assert parquet.metadata.num_row_groups == 6
+    pd.testing.assert_frame_equal(parquet.read().to_pandas().reset_index(drop=True), df, check_dtype=False)
+    assert parquet.schema_arrow.field('week').type == 'int8'
+
+@pytest.mark.parametrize('file_format', ['csv', 'json', 'parquet', 'zip'])
+def test_stream_of_empty_frame_still_has_a_header(df, file_format):
+    body = stream([df.iloc[:0]], file_format)
+    if file_format == 'csv':
+        assert body.decode('utf-8').splitlines() == [',season,week,team,epa']
+    elif file_format == 'json':
+        assert json.loads(body) == []
+    elif file_format == 'parquet':
+        assert pq.read_table(io.BytesIO(body)).column_names[:4] == ['season', 'week', 'team', 'epa']
+    else:
+        assert zipfile.ZipFile(io.BytesIO(body)).read('bronze/pbp.csv').decode('utf-8').strip() == 'season,week,team,epa'
+
+def test_multipart_upload_assembles_parts_in_order():
+    store = InMemoryObjectStore()
+    body = bytes(range(256)) * ((2 * MIN_PART_SIZE + 12345) // 256 + 1)
+    writer = MultipartUploadWriter(store, BUCKET, 'big.bin', part_size=MIN_PART_SIZE, max_concurrency=2, metadata={'content-hash': 'abc'})
+    for start in range(0, len(body), 1024 * 1024):
+        writer.write(body[start:start + 1024 * 1024])
+    writer.close()
+    response = store.get_object(Bucket=BUCKET, Key='big.bin')
+    assert response['Body'].read() == body
+    assert response['Metadata'] == {'content-hash': 'abc'}
+    assert writer.bytes_written == len(body)
+
+def test_file_upload_stores_the_hash_on_multipart_objects():
+    body = b'x' * (2 * MIN_PART_SIZE + 1)
+    store = InMemoryObjectStore()
+    assert upload_file_to_s3(store, io.BytesIO(body), BUCKET, 'big.json', part_size=MIN_PART_SIZE, content_hash='abc') == len(body)
+    response = store.get_object(Bucket=BUCKET, Key='big.json')
+    assert response['Body'].read() == body
+    assert response['Metadata'] == {'content-hash': 'abc'}
+
+def test_small_upload_is_a_single_put():
+    store = InMemoryObjectStore()
+    writer = MultipartUploadWriter(store, BUCKET, 'small.csv')
+    writer.write(b'a,b\n1,2\n')
+    writer.close()
+    assert store.get_object(Bucket=BUCKET, Key='small.csv')['Body'].read() == b'a,b\n1,2\n'
+    assert store._uploads == {}
+
+def test_aborted_upload_leaves_nothing_behind():
+    store = InMemoryObjectStore()
+    writer = MultipartUploadWriter(store, BUCKET, 'big.bin', part_size=MIN_PART_SIZE)
+    writer.write(b'x' * (MIN_PART_SIZE + 1))
+    writer.abort()
+    assert store._uploads == {}
+    assert store.list_objects_v2(Bucket=BUCKET)['KeyCount'] == 0
+    with pytest.raises(ValueError):
+        writer.write(b'more')
+
+def test_write_df_to_s3_invalidates_cached_heads(df):
+    clear_head_cache()
+    store = InMemoryObjectStore()
+    assert head_object_cached(store, BUCKET, 'bronze/pbp.parquet') is None
+    write_df_to_s3(store, df, 'parquet', BUCKET, 'bronze/pbp.parquet', content_hash='abc')
+    head = head_object_cached(store, BUCKET, 'bronze/pbp.parquet')
+    assert head['Metadata'] == {'content-hash': 'abc'}
+    pd.testing.assert_frame_equal(read_parquet_from_s3(store, BUCKET, 'bronze/pbp.parquet'), df, check_dtype=False)
+    assert read_parquet_from_s3(store, BUCKET, 'bronze/missing.parquet') is None
+
+def test_partitioned_write_skips_unchanged_partitions(df):
+    store = InMemoryObjectStore()
+    first = write_partitioned_df_to_s3(store, df, BUCKET, 'bronze/pbp', ['season'])
+    assert sorted(first) == ['bronze/pbp/season=2022/part-0.parquet', 'bronze/pbp/season=2023/part-0.parquet']
+    assert all(partition['written'] for partition in first.values())
+
+    previous = {key: partition['content_hash'] for key, partition in first.items()}
+    changed = df.copy()
+    changed.loc[changed['season'] == 2023, 'epa'] = 9.0
+    second = write_partitioned_df_to_s3(store, changed, BUCKET, 'bronze/pbp', ['season'], previous_hashes=previous)
+    assert {key: partition['written'] for key, partition in second.items()} == {
+        'bronze/pbp/season=2022/part-0.parquet': False,
+        'bronze/pbp/season=2023/part-0.parquet': True,
+    }
+
+def test_local_object_store_round_trip(tmp_path):
+    store = LocalObjectStore(str(tmp_path))
+    store.put_object(Bucket=BUCKET, Key='bronze/a.csv', Body=b'1', Metadata={'content-hash': 'h'})
+    assert store.head_object(Bucket=BUCKET, Key='bronze/a.csv')['Metadata'] == {'content-hash': 'h'}
+    assert [obj['Key'] for obj in store.list_objects_v2(Bucket=BUCKET, Prefix='bronze/')['Contents']] == ['bronze/a.csv']
@@ -0,0 +1,86 @@
+# Standard
+from datetime import datetime, timedelta, timezone
+# External
+import pytest
+# Internal
+from utils.scheduler_utils import CronSchedule, Scheduler, parse_cron_field
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+@pytest.mark.parametrize('field, low, high, expected', [
+    ('*', 0, 6, set(range(0, 7))),
+    ('5', 0, 59, {5}),
+    ('1-5', 0, 6, {1, 2, 3, 4, 5}),
+    ('*/15', 0, 59, {0, 15, 30, 45}),
+    ('0,30', 0, 59, {0, 30}),
+    ('10-40/10', 0, 59, {10, 20, 30, 40}),
+    ('50/5', 0, 59, {50, 55}),
+    ('1,3-4,*/10', 0, 23, {0, 1, 3, 4, 10, 20}),
+])
+def test_parse_cron_field(field, low, high, expected):
+    assert parse_cron_field(field, low, high) == expected
+
+@pytest.mark.parametrize('field, high', [('60', 59), ('5-1', 59), ('*/0', 59), ('0-24', 23), ('x', 59)])
+def test_parse_cron_field_rejects_invalid_fields(field, high):
+    with pytest.raises(ValueError):
+        parse_cron_field(field, 0, high)
+
+def test_cron_schedule_needs_five_fields():
+    with pytest.raises(ValueError):
+        CronSchedule('* * * *')
+
+def test_next_after_is_strictly_after():
+    schedule = CronSchedule('*/15 * * * *')
+    assert schedule.next_after(utc(2023, 9, 10, 12, 0)) == utc(2023, 9, 10, 12, 15)
+    assert schedule.next_after(utc(2023, 9, 10, 12, 59, 30)) == utc(2023, 9, 10, 13, 0)
+
+def test_next_after_rolls_over_months_and_years():
+    assert CronSchedule('0 6 1 * *').next_after(utc(2023, 12, 15)) == utc(2024, 1, 1, 6, 0)
+    assert CronSchedule('0 0 29 2 *').next_after(utc(2023, 3, 1)) == utc(2024, 2, 29)
+
+def test_weekday_seven_is_sunday():
+    # 2023-09-10 was a Sunday
+    assert CronSchedule('0 17 * * 7').next_after(utc(2023, 9, 4)) == utc(2023, 9, 10, 17, 0)
+    assert CronSchedule('0 17 * * 0').next_after(utc(2023, 9, 4)) == utc(2023, 9, 10, 17, 0)
+
+def test_day_and_weekday_match_either_when_both_restricted():
+    # The 15th, or any Monday (2023-09-11 was a Monday)
+    schedule = CronSchedule('0 0 15 * 1')
+    assert schedule.next_after(utc(2023, 9, 9)) == utc(2023, 9, 11)
+    assert schedule.next_after(utc(2023, 9, 12)) == utc(2023, 9, 15)
+
+def test_due_jobs_never_overlap_a_running_job():
+    scheduler = Scheduler()
+    job = scheduler.add('pbp', '*/5 * * * *', lambda: None)
+    now = utc(2023, 9, 10, 12, 0)
+    job.next_run = now
+    assert scheduler.due_jobs(now) == [job]
+    assert job.running and job.next_run == utc(2023, 9, 10, 12, 5)
+
+    # Still running when it comes due again: skipped, and rescheduled
+    later = utc(2023, 9, 10, 12, 5)
+    assert scheduler.due_jobs(later) == []
+    assert job.next_run == utc(2023, 9, 10, 12, 10)
+
+def test_due_jobs_coalesce_missed_runs():
+    scheduler = Scheduler()
+    job = scheduler.add('rosters', '*/5 * * * *', lambda: None)
+    job.next_run = utc(2023, 9, 10, 12, 0)
+    # An hour behind: one run now, then the next slot after now
+    now = utc(2023, 9, 10, 13, 2)
+    assert scheduler.due_jobs(now) == [job]
+    assert job.next_run == utc(2023, 9, 10, 13, 5)
+    scheduler._run(job)
+    assert not job.running and job.last_status == 'ok'
+    assert scheduler.due_jobs(now + timedelta(minutes=1)) == []
+
+def test_failed_run_frees_the_job():
+    scheduler = Scheduler()
+
+    def fail():
+        raise RuntimeError("upstream down")
+    job = scheduler.add('qbr', '0 * * * *', fail)
+    job.running = True
+    scheduler._run(job)
+    assert not job.running and job.last_status == 'failed'
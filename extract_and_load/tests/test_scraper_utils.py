@@ -0,0 +1,91 @@
+# Standard
+import threading
+from concurrent.futures import ThreadPoolExecutor
+# External
+import pytest
+# Internal
+from utils.scraper_utils import BrowserPool, HostRateLimiter
+
+class FakeBrowser:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.quit_called = False
+        self.page_source = ''
+
+    def get(self, url: str) -> None:
+        if self.fail:
+            raise RuntimeError(f"page load failed: {url}")
+        self.page_source = url
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+def make_factory(fail_first: int = 0):
+    created = []
+    lock = threading.Lock()
+
+    def create_browser(chromedriver_path: str) -> FakeBrowser:
+        with lock:
+            browser = FakeBrowser(fail=len(created) < fail_first)
+            created.append(browser)
+        return browser
+    return create_browser, created
+
+def fetch(pool: BrowserPool, url: str) -> str:
+    with pool.browser() as browser:
+        browser.get(url)
+        return browser.page_source
+
+def test_failed_browser_frees_its_slot_for_waiting_callers():
+    create_browser, created = make_factory(fail_first=1)
+    pool = BrowserPool('unused', size=1, create_browser=create_browser)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(fetch, pool, f'https://example.com/{i}') for i in range(2)]
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result(timeout=5))
+            except RuntimeError as e:
+                outcomes.append(e)
+    assert sum(isinstance(outcome, RuntimeError) for outcome in outcomes) == 1
+    assert sum(isinstance(outcome, str) for outcome in outcomes) == 1
+    assert len(created) == 2
+    assert created[0].quit_called
+    pool.close()
+    assert created[1].quit_called
+
+def test_browsers_are_reused_up_to_size():
+    create_browser, created = make_factory()
+    pool = BrowserPool('unused', size=2, create_browser=create_browser)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda i: fetch(pool, f'https://example.com/{i}'), range(20)))
+    assert len(results) == 20
+    assert 1 <= len(created) <= 2
+    pool.close()
+    assert all(browser.quit_called for browser in created)
+
+def test_closed_pool_refuses_new_callers():
+    create_browser, _ = make_factory()
+    pool = BrowserPool('unused', size=1, create_browser=create_browser)
+    pool.close()
+    with pytest.raises(RuntimeError):
+        fetch(pool, 'https://example.com')
+
+def test_host_rate_limiter_caps_concurrency_per_host():
+    limiter = HostRateLimiter(max_concurrent=2, min_interval_secs=0)
+    in_flight = {'a.test': 0, 'b.test': 0}
+    peak = {'a.test': 0, 'b.test': 0}
+    lock = threading.Lock()
+
+    def request(host: str) -> None:
+        with limiter.slot(f'https://{host}/x'):
+            with lock:
+                in_flight[host] += 1
+                peak[host] = max(peak[host], in_flight[host])
+            threading.Event().wait(0.02)
+            with lock:
+                in_flight[host] -= 1
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(request, ['a.test'] * 8 + ['b.test'] * 8))
+    assert peak == {'a.test': 2, 'b.test': 2}
@@ -0,0 +1,24 @@
+# Standard
+from datetime import datetime
+# External
+import pytest
+# Internal
+from utils import time_utils
+
+@pytest.mark.parametrize('today, season', [
+    (datetime(2023, 8, 31), 2022),
+    (datetime(2023, 9, 1), 2023),
+    (datetime(2023, 12, 31), 2023),
+    (datetime(2024, 1, 1), 2023),
+    # The Super Bowl belongs to the season that kicked off the previous September
+    (datetime(2024, 2, 11), 2023),
+    (datetime(2024, 6, 1), 2023),
+])
+def test_season_rolls_over_in_september(monkeypatch, today, season):
+    class FixedClock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return today
+
+    monkeypatch.setattr(time_utils, 'datetime', FixedClock)
+    assert time_utils.get_current_nfl_season() == season